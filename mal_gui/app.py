@@ -4,8 +4,6 @@ import configparser
 import os
 import sys
 
-from appdirs import user_config_dir
-
 if __name__ == "__main__" and __package__ is None:
     print(
         "Warning: You are running 'app.py' directly.\n"
@@ -14,6 +12,7 @@ if __name__ == "__main__" and __package__ is None:
     )
     sys.exit(1)  # Exit to prevent accidental misuse
 
+from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import (
     QApplication,
     QDialog,
@@ -25,10 +24,33 @@ from PySide6.QtWidgets import (
     QDialogButtonBox,
     QFileDialog,
     QMessageBox,
+    QProgressBar,
 )
+from .file_utils import CONFIG_FILE_PATH
+from .language_cache import load_language_graph
 from .main_window import MainWindow
 
 
+class LanguageLoader(QThread):
+    """Loads a language in the background so the GUI stays responsive"""
+
+    loaded = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, lang_file_path, parent=None):
+        super().__init__(parent)
+        self.lang_file_path = lang_file_path
+
+    def run(self):
+        """Overrides base method"""
+        try:
+            lang_graph = load_language_graph(self.lang_file_path)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.loaded.emit(lang_graph)
+
+
 class FileSelectionDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -46,8 +68,7 @@ class FileSelectionDialog(QDialog):
         self.lang_file_path_text = QLineEdit(self)
 
         # Load the config file containing latest lang file path
-        config_file_dir = user_config_dir("mal-gui", "mal-lang")
-        self.config_file_path = config_file_dir + "/config.ini"
+        self.config_file_path = CONFIG_FILE_PATH
 
         # Make sure config file exists
         os.makedirs(os.path.dirname(self.config_file_path), exist_ok=True)
@@ -62,24 +83,36 @@ class FileSelectionDialog(QDialog):
         self.lang_file_path_text.setText(self.selected_lang_file)
         horizontal_layout.addWidget(self.lang_file_path_text)
 
-        browse_button = QPushButton("Browse")
-        horizontal_layout.addWidget(browse_button)
+        self.browse_button = QPushButton("Browse")
+        horizontal_layout.addWidget(self.browse_button)
 
         vertical_layout.addLayout(horizontal_layout)
 
+        # Busy indicator shown while the language is loading
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+        vertical_layout.addWidget(self.progress_bar)
+
         # Create custom buttons for "Load" and "Quit"
         self.button_box = QDialogButtonBox()
-        load_button = QPushButton("Load")
-        quit_button = QPushButton("Quit")
-        self.button_box.addButton(load_button, QDialogButtonBox.AcceptRole)
-        self.button_box.addButton(quit_button, QDialogButtonBox.RejectRole)
+        self.load_button = QPushButton("Load")
+        self.quit_button = QPushButton("Quit")
+        self.button_box.addButton(self.load_button, QDialogButtonBox.AcceptRole)
+        self.button_box.addButton(self.quit_button, QDialogButtonBox.RejectRole)
         vertical_layout.addWidget(self.button_box)
 
         self.setLayout(vertical_layout)
 
-        browse_button.clicked.connect(self.open_file_dialog)
-        load_button.clicked.connect(self.save_lang_file_path)
-        quit_button.clicked.connect(self.reject)
+        # The language graph loaded in the background
+        self.lang_graph = None
+        self.language_loader = None
+        # Cancelled loaders we still have to wait for before exiting
+        self.cancelled_loaders: list[LanguageLoader] = []
+
+        self.browse_button.clicked.connect(self.open_file_dialog)
+        self.load_button.clicked.connect(self.save_lang_file_path)
+        self.quit_button.clicked.connect(self.quit_or_cancel_loading)
 
     def open_file_dialog(self):
         """Ask user for MAL or MAR file in dialog"""
@@ -114,15 +147,81 @@ class FileSelectionDialog(QDialog):
             with open(self.config_file_path, "w", encoding="utf-8") as conf_file:
                 self.config.write(conf_file)
 
-            self.accept()  # Close the dialog and return accepted
+            self.start_loading_language()
         else:
             QMessageBox.warning(
                 self, "Invalid File", "Please select a valid .mal or .mar file."
             )
 
+    def start_loading_language(self):
+        """Load the selected language in the background"""
+        self.language_loader = LanguageLoader(self.selected_lang_file)
+        self.language_loader.loaded.connect(self.on_language_loaded)
+        self.language_loader.failed.connect(self.on_language_failed)
+        self.set_loading_state(True)
+        self.language_loader.start()
+
+    def set_loading_state(self, loading):
+        """Show progress and let the user cancel while loading"""
+        self.progress_bar.setVisible(loading)
+        self.label.setText(
+            f"Loading {os.path.basename(self.selected_lang_file)}..."
+            if loading
+            else "Select MAL Language .mal/.mar file to load:"
+        )
+        self.lang_file_path_text.setEnabled(not loading)
+        self.browse_button.setEnabled(not loading)
+        self.load_button.setEnabled(not loading)
+        self.quit_button.setText("Cancel" if loading else "Quit")
+
+    def release_language_loader(self):
+        """
+        Drop the loader that reported its result. It emits the result
+        right before run() returns, the thread has to end before the
+        loader is destroyed.
+        """
+        self.language_loader.wait()
+        self.language_loader = None
+
+    def on_language_loaded(self, lang_graph):
+        self.release_language_loader()
+        self.set_loading_state(False)
+        self.lang_graph = lang_graph
+        self.accept()  # Close the dialog and return accepted
+
+    def on_language_failed(self, message):
+        self.release_language_loader()
+        self.set_loading_state(False)
+        QMessageBox.warning(self, "Could not load language", message)
+
+    def quit_or_cancel_loading(self):
+        """Cancel an ongoing load, otherwise quit"""
+        if self.language_loader is None:
+            self.reject()
+            return
+
+        # A compilation can not be interrupted, ignore its result instead
+        self.language_loader.loaded.disconnect(self.on_language_loaded)
+        self.language_loader.failed.disconnect(self.on_language_failed)
+        self.cancelled_loaders.append(self.language_loader)
+        self.language_loader = None
+        self.set_loading_state(False)
+
+    def done(self, result):
+        """Overrides base method"""
+        if self.language_loader is not None:
+            self.quit_or_cancel_loading()
+        # Threads must be finished before they are destroyed
+        for loader in self.cancelled_loaders:
+            loader.wait()
+        super().done(result)
+
     def get_selected_file(self):
         return self.selected_lang_file
 
+    def get_lang_graph(self):
+        return self.lang_graph
+
 
 def main():
     """Entrypoint of MAL GUI"""
@@ -131,7 +230,7 @@ def main():
     dialog = FileSelectionDialog()
     if dialog.exec() == QDialog.Accepted:
         selected_lang_path = dialog.get_selected_file()
-        window = MainWindow(app, selected_lang_path)
+        window = MainWindow(app, selected_lang_path, dialog.get_lang_graph())
         window.show()
         print(f"Selected MAL/MAR file Path: {selected_lang_path}")
         app.exec()
@@ -1,18 +1,19 @@
-from PySide6.QtCore import QRectF, Qt, QPointF, QSize, QSizeF, QTimer
-from PySide6.QtGui import (
-    QPixmap,
-    QFont,
-    QColor,
-    QBrush,
-    QPen,
-    QPainterPath,
-    QFontMetrics,
-    QLinearGradient,
-    QImage,
-)
+from typing import Optional
+
+from PySide6.QtCore import QRectF, Qt, QPointF, QSizeF
+from PySide6.QtGui import QPixmap, QColor
 from PySide6.QtWidgets import QGraphicsItem
 
-from ..object_explorer.editable_text_item import EditableTextItem
+from ..object_explorer.editable_text_item import (
+    NAME_FONT,
+    TEXT_MARGIN,
+    EditableTextItem,
+    name_position,
+    name_static_text,
+)
+from ..object_explorer.icon_cache import ICON_SIZE, SYMBOL_SIZE, icon_pixmap
+from ..object_explorer.item_style import ItemStyle, item_style
+from ..render_settings import RENDER_SETTINGS, DetailLevel
 from .assets_container_rectangle_box import AssetsContainerRectangleBox
 
 
@@ -32,6 +33,7 @@ class AssetsContainer(QGraphicsItem):
         super().__init__(parent)
         self.setZValue(1)  # rect items are on top
         self.container_type = container_type
+        self.title_text = container_type
         self.container_name = container_name
         self.container_sequence_id = AssetsContainer.generate_next_sequence_id()
         self.image_path = image_path
@@ -42,13 +44,10 @@ class AssetsContainer(QGraphicsItem):
         self.container_box = None
         print("image path = " + self.image_path)
 
-        self.image = self.load_image_with_quality(self.image_path, QSize(512, 512))
-        self.plus_symbol_image = self.load_image_with_quality(
-            self.plus_symbol_image_path, QSize(512, 512)
-        )
-        self.minus_symbol_image = self.load_image_with_quality(
-            self.minus_symbol_image_path, QSize(512, 512)
-        )
+        # Shared pixmaps, already scaled to the size they are drawn at
+        self.image = icon_pixmap(self.image_path)
+        self.plus_symbol_image = icon_pixmap(self.plus_symbol_image_path, SYMBOL_SIZE)
+        self.minus_symbol_image = icon_pixmap(self.minus_symbol_image_path, SYMBOL_SIZE)
 
         self.setFlags(
             QGraphicsItem.ItemIsSelectable
@@ -56,9 +55,10 @@ class AssetsContainer(QGraphicsItem):
             | QGraphicsItem.ItemSendsGeometryChanges
         )
 
-        # Create the editable text item for block type
-        self.type_text_item = EditableTextItem(self.container_name, self)
-        self.type_text_item.lostFocus.connect(self.update_container_name)
+        # Name painted in the lower half, edited with an editor on demand
+        self.name_static_text = name_static_text(self.container_name)
+        self.name_pos = QPointF()
+        self.name_editor: Optional[EditableTextItem] = None
 
         self.containerized_assets_list = []
         self.initial_position = QPointF()
@@ -71,23 +71,16 @@ class AssetsContainer(QGraphicsItem):
         self.container_type_bg_color = QColor(0, 200, 255)  # Blue
         self.container_name_bg_color = QColor(20, 20, 20, 200)  # Gray
 
+        # Paths, brushes and pens shared with containers of the same type
+        self.style: ItemStyle = None
+
         self.icon_path = None
-        self.icon_visible = True
         self.icon_pixmap = QPixmap()
 
-        self.title_path = QPainterPath()  # The path for the title
-        self.type_path = QPainterPath()  # The path for the type
-        self.status_path = QPainterPath()  # A path showing the status of the node
-
         self.horizontal_margin = 15  # Horizontal margin
         self.vertical_margin = 15  # Vertical margin
 
-        self.timer = QTimer()
         self.status_color = QColor(0, 255, 0)
-        self.attacker_toggle_state = False
-        self.timer.timeout.connect(self.update_status_color)
-        # timer to trigger every 500ms (0.5 seconds)
-        self.timer.start(500)
 
         self.build()
 
@@ -98,19 +91,14 @@ class AssetsContainer(QGraphicsItem):
     def mouseDoubleClickEvent(self, event):
         """Overrides base method"""
         if event.button() == Qt.LeftButton:
-            self.type_text_item.setTextInteractionFlags(Qt.TextEditorInteraction)
-            self.type_text_item.setFocus()
-            # Select all text when activated
-            self.type_text_item.select_all_text()
+            self.name_editor = EditableTextItem.edit(
+                self, self.container_name, self.name_pos, self.update_container_name
+            )
+            self.update()
             event.accept()
         else:
             event.ignore()
 
-    def focusOutEvent(self, event):
-        """Overrides base method"""
-        self.type_text_item.clearFocus()
-        super().focusOutEvent(event)
-
     def mousePressEvent(self, event):
         """Overrides base method"""
         self.initial_position = self.pos()
@@ -121,14 +109,9 @@ class AssetsContainer(QGraphicsItem):
             # self.is_plus_symbol_visible = not self.is_plus_symbol_visible
             # self.update()
             self.toggle_container_expansion()
-        elif self.type_text_item.hasFocus() and not self.type_text_item.contains(
-            event.pos()
-        ):
-            self.type_text_item.clearFocus()
-        elif not self.type_text_item.contains(event.pos()):
-            self.type_text_item.deselect_text()
-        else:
-            super().mousePressEvent(event)
+        elif self.name_editor is not None:
+            # Clicked next to the name that is edited
+            self.name_editor.finish()
 
     def setIcon(self, icon_path=None):
         """Overrides base method"""
@@ -147,38 +130,52 @@ class AssetsContainer(QGraphicsItem):
 
     def paint(self, painter, option, widget=None):
         """Overrides base method"""
-        painter.setPen(self.container_name_bg_color.lighter())
-        painter.setBrush(self.container_name_bg_color)
-        painter.drawPath(self.path)
-
-        gradient = QLinearGradient()
-        gradient.setStart(0, -90)
-        gradient.setFinalStop(0, 0)
-        gradient.setColorAt(0, self.container_type_bg_color)  # Start color
-        gradient.setColorAt(1, self.container_type_bg_color.darker())  # End color
+        detail = RENDER_SETTINGS.detail_level(
+            option.levelOfDetailFromTransform(painter.worldTransform())
+        )
 
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(self.container_type_bg_color)
-        painter.drawPath(self.title_bg_path.simplified())
+        style = self.style
+
+        if detail == DetailLevel.OUTLINE:
+            # Too small to read anything, a filled rect is enough
+            if self.isSelected():
+                painter.setPen(style.highlight_pen)
+            else:
+                painter.setPen(Qt.NoPen)
+            painter.setBrush(style.type_brush)
+            painter.drawRect(self.size)
+            return
+
+        painter.setPen(style.name_pen)
+        painter.setBrush(style.name_brush)
+        painter.drawPath(style.path)
+
+        if detail == DetailLevel.FULL:
+            painter.setBrush(style.title_bg_gradient)
+            painter.setPen(style.type_pen)
+            painter.drawPath(style.title_bg_path_simplified)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(style.type_brush)
+            painter.drawPath(style.title_bg_path)
 
         painter.setPen(Qt.NoPen)
         painter.setBrush(Qt.white)
-        painter.drawPath(self.title_path)
-        painter.drawPath(self.type_path)
+        painter.drawPath(style.title_path)
 
-        # Draw the status path
-        painter.setBrush(self.status_color)
-        painter.setPen(self.status_color.darker())
-        painter.drawPath(self.status_path.simplified())
+        if detail == DetailLevel.FULL:
+            # Draw the status path
+            painter.setBrush(self.status_color)
+            painter.setPen(self.status_color.darker())
+            painter.drawPath(style.status_path)
 
         # Draw the icon if it's visible
-        if self.icon_visible and not self.image.isNull():
-            target_icon_size = QSize(24, 24)  # Desired size for the icon
-
-            # Resize the icon using smooth transformation
-            # resized_image_icon = self.image.scaled(target_icon_size,
-            # Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            resized_image_icon = self.image
+        if (
+            detail == DetailLevel.FULL
+            and self.icons_shown()
+            and not self.image.isNull()
+        ):
+            target_icon_size = ICON_SIZE  # Size the cached icon is scaled to
 
             # Calculate the position and size for the icon background
             icon_rect = QRectF(
@@ -203,8 +200,13 @@ class AssetsContainer(QGraphicsItem):
             # Convert QRectF to QRect and draw the white background rectangle
             painter.drawRect(background_rect.toRect())
 
-            # Convert QRectF to QRect and draw the resized icon
-            painter.drawPixmap(icon_rect.toRect(), resized_image_icon)
+            # Draw the pre-scaled icon
+            icon_size = self.image.deviceIndependentSize()
+            painter.drawPixmap(
+                icon_rect.center()
+                - QPointF(icon_size.width() / 2, icon_size.height() / 2),
+                self.image,
+            )
 
         # Determine which symbol to draw based on the current state
         current_symbol_image = (
@@ -212,134 +214,85 @@ class AssetsContainer(QGraphicsItem):
             if self.is_plus_symbol_visible
             else self.minus_symbol_image
         )
-        if not current_symbol_image.isNull():
-            # Desired size for the second icon
-            target_symbol_image_size = QSize(12, 12)
-
-            # Get the bounding rect of the title_bg_path
-            title_bg_rect = self.title_bg_path.boundingRect()
-
-            # Calculate the position for the symbol at the
-            # bottom-right corner of title_bg_path
-            self.plus_or_minus_image_rect = QRectF(
-                title_bg_rect.right() - target_symbol_image_size.width() - 10,
-                title_bg_rect.bottom() - target_symbol_image_size.height() - 5,
-                target_symbol_image_size.width(),
-                target_symbol_image_size.height(),
-            )
-
+        if detail == DetailLevel.FULL and not current_symbol_image.isNull():
             painter.setBrush(Qt.white)
             painter.drawRect(self.plus_or_minus_image_rect)
 
-            resized_symbol_image = current_symbol_image.scaled(
-                target_symbol_image_size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-
             # Draw the plus or minus symbol with a white background
+            symbol_size = current_symbol_image.deviceIndependentSize()
             painter.drawPixmap(
-                self.plus_or_minus_image_rect.toRect(), resized_symbol_image
+                self.plus_or_minus_image_rect.center()
+                - QPointF(symbol_size.width() / 2, symbol_size.height() / 2),
+                current_symbol_image,
+            )
+
+        # Names are unreadable when zoomed out, the editor paints it when edited
+        if detail == DetailLevel.FULL and self.name_editor is None:
+            painter.setPen(Qt.white)
+            painter.setFont(NAME_FONT)
+            painter.drawStaticText(
+                self.name_pos + QPointF(TEXT_MARGIN, TEXT_MARGIN),
+                self.name_static_text,
             )
 
         # Draw the highlight if selected
         if self.isSelected():
-            painter.setPen(QPen(self.container_type_bg_color.lighter(), 2))
+            painter.setPen(style.highlight_pen)
             painter.setBrush(Qt.NoBrush)
-            painter.drawPath(self.path)
+            painter.drawPath(style.path)
 
     @classmethod
     def generate_next_sequence_id(cls):
         cls.container_sequence_id += 1
         return cls.container_sequence_id
 
-    def build(self):
-        self.title_text = self.container_type
-        self.title_path = QPainterPath()
-        self.type_path = QPainterPath()
-        self.status_path = QPainterPath()
-
-        # Set the font for title and category
-        title_font = QFont("Arial", pointSize=12)
-        type_font = QFont("Arial", pointSize=12)
-
-        # Use fixed width and height
-        fixed_width = self.width
-        fixed_height = self.height
-
-        # Draw the background of the node
-        self.path = QPainterPath()
-        self.path.addRoundedRect(
-            -fixed_width / 2, -fixed_height / 2, fixed_width, fixed_height, 6, 6
-        )
-
-        self.title_bg_path = QPainterPath()
-        self.title_bg_path.addRoundedRect(
-            -fixed_width / 2,
-            -fixed_height / 2,
-            fixed_width,
-            title_font.pointSize() + 2 * self.vertical_margin,
-            6,
-            6,
-        )
-
-        # Draw status path
-        self.status_path.setFillRule(Qt.WindingFill)
-        self.status_path.addRoundedRect(
-            fixed_width / 2 - 12, -fixed_height / 2 + 2, 10, 10, 2, 2
-        )
-
-        # Center title in the upper half
-        title_font_metrics = QFontMetrics(title_font)
-        self.title_path.addText(
-            # Center horizontally
-            -title_font_metrics.horizontalAdvance(self.title_text) / 2,
-            # Center vertically within its section
-            -fixed_height / 2 + self.vertical_margin + title_font_metrics.ascent(),
-            title_font,
+    def update_style(self):
+        """Look up the shared style for the current title, colours and size"""
+        self.style = item_style(
             self.title_text,
+            self.container_type_bg_color,
+            self.container_name_bg_color,
+            self.width,
+            self.height,
         )
+        self.update()
 
-        # Set the font and default color for type_text_item
-        self.type_text_item.setFont(type_font)
-        self.type_text_item.setDefaultTextColor(Qt.white)
+    def build(self):
+        self.title_text = self.container_type
 
-        # Initial position of type_text_item
-        self.update_type_text_item_position()
+        # Paths for background, title and status are shared per type
+        self.update_style()
+
+        # Position of the plus/minus symbol at the
+        # bottom-right corner of title_bg_path
+        title_bg_rect = self.style.title_bg_path.boundingRect()
+        self.plus_or_minus_image_rect = QRectF(
+            title_bg_rect.right() - SYMBOL_SIZE.width() - 10,
+            title_bg_rect.bottom() - SYMBOL_SIZE.height() - 5,
+            SYMBOL_SIZE.width(),
+            SYMBOL_SIZE.height(),
+        )
 
-        # Connect lostFocus signal to update position when text loses focus
-        self.type_text_item.lostFocus.connect(self.update_type_text_item_position)
+        # Initial position of the name
+        self.update_name_position()
 
         # self.widget.move(-self.widget.size().width() / 2,
         # fixed_height / 2 - self.widget.size().height() + 5)
 
-    def update_type_text_item_position(self):
-        # to update the position of the type_text_item so that it
-        # remains centered within the lower half of the node
-        # whenever the text changes.
-
-        type_font_metrics = QFontMetrics(self.type_text_item.font())
-        fixed_height = self.height
-        title_font_metrics = QFontMetrics(QFont("Arial", pointSize=12))
-
-        # Calculate the new position for type_text_item
-        type_text_item_pos_x = (
-            -type_font_metrics.horizontalAdvance(self.type_text_item.toPlainText()) / 2
-        )
-        type_text_item_pos_y = (
-            -fixed_height / 2 + title_font_metrics.height() + 2 * self.vertical_margin
+    def update_name_position(self):
+        # Keep the name centered within the lower half of the node
+        self.name_pos = name_position(
+            self.container_name, self.height, self.vertical_margin
         )
 
-        # Update position
-        self.type_text_item.setPos(type_text_item_pos_x, type_text_item_pos_y)
-
-    def update_container_name(self):
-        self.container_name = self.type_text_item.toPlainText()
-        self.type_text_item.setTextInteractionFlags(Qt.NoTextInteraction)
-        self.type_text_item.deselect_text()
-        self.update_type_text_item_position()
-
-        associated_scene = self.type_text_item.scene()
-        if associated_scene:
+    def update_container_name(self, text: str):
+        self.name_editor = None
+        if text != self.container_name:
+            self.container_name = text
+            self.name_static_text = name_static_text(text)
             print("Container Name Changed by user")
+        self.update_name_position()
+        self.update()
 
     def get_item_attribute_vakues(self):
         return {
@@ -348,21 +301,10 @@ class AssetsContainer(QGraphicsItem):
             "Container Type": self.container_type,
         }
 
-    def toggle_icon_visibility(self):
-        self.icon_visible = not self.icon_visible
-        self.update()
-
-    def update_status_color(self):
-        self.status_color = QColor(0, 255, 0)
-        self.update()
-
-    def load_image_with_quality(self, path, size):
-        image = QImage(path)
-        if not image.isNull():
-            return QPixmap.fromImage(
-                image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
-        return QPixmap()
+    def icons_shown(self) -> bool:
+        """Icons are shown or hidden for the whole scene"""
+        scene = self.scene()
+        return scene is None or scene.show_icons
 
     def toggle_container_expansion(self):
         if self.is_plus_symbol_visible:
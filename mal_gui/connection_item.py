@@ -1,38 +1,114 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import Qt, QPointF, QLineF
-from PySide6.QtGui import QBrush, QColor, QPen
-from PySide6.QtWidgets import (
-    QGraphicsLineItem,
-    QGraphicsTextItem,
-    QGraphicsRectItem,
-    QGraphicsItemGroup,
-)
+from PySide6.QtCore import Qt, QPointF, QLineF, QRectF
+from PySide6.QtGui import QBrush, QColor, QFont, QPainterPath, QPen, QStaticText
+from PySide6.QtWidgets import QGraphicsLineItem
+
+from .render_settings import RENDER_SETTINGS, DetailLevel
 
 if TYPE_CHECKING:
     from maltoolbox.language import LanguageGraphAssociation
     from .model_scene import ModelScene
     from .object_explorer import AssetItem, AttackerItem
 
+LABEL_FONT = QFont()
+LABEL_MARGIN = 4  # Space between label text and its background
+LABEL_BACKGROUND = QBrush(QColor(255, 255, 255, 200))  # Semi-transparent white
+
+_label_texts: dict[str, QStaticText] = {}
+
+
+def label_static_text(text: str) -> QStaticText:
+    """Laid out label text, shared by all connections with the same label"""
+    if text not in _label_texts:
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.prepare(font=LABEL_FONT)
+        _label_texts[text] = static_text
+    return _label_texts[text]
+
 
 class IConnectionItem(QGraphicsLineItem):
-    """'interface' for Connection Item"""
+    """
+    'interface' for Connection Item. Connections paint their
+    labels themselves, so each connection is a single scene item.
+    """
 
     start_item: AssetItem
     end_item: AssetItem
     association_details: list[str]
 
-    def create_label(self, text):
-        pass
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
-    def update_path(self):
-        pass
+        # Label texts and where on the line (0.0 - 1.0) they are centered
+        self.labels: list[tuple[QStaticText, float]] = []
+        self.label_rects: list[QRectF] = []
 
-    def remove_labels(self):
-        pass
+    def create_label(self, text, line_fraction=0.5) -> QStaticText:
+        """Add a label centered at `line_fraction` of the line"""
+        label = label_static_text(text)
+        self.labels.append((label, line_fraction))
+        return label
+
+    def is_label_visible(self, index) -> bool:
+        """Whether label number `index` is painted"""
+        return True
+
+    def set_line_and_labels(self, start_pos: QPointF, end_pos: QPointF):
+        """Move the line and its labels"""
+        self.prepareGeometryChange()
+        self.setLine(QLineF(start_pos, end_pos))
 
-    def restore_labels(self):
+        self.label_rects = []
+        for label, line_fraction in self.labels:
+            size = label.size()
+            width = size.width() + 2 * LABEL_MARGIN
+            height = size.height() + 2 * LABEL_MARGIN
+            center = self.line().pointAt(line_fraction)
+            self.label_rects.append(
+                QRectF(center.x() - width / 2, center.y() - height / 2, width, height)
+            )
+
+    def boundingRect(self):
+        """Overrides base method"""
+        rect = super().boundingRect()
+        for label_rect in self.label_rects:
+            rect = rect.united(label_rect)
+        return rect
+
+    def shape(self):
+        """Overrides base method, labels can be clicked as well"""
+        path = QPainterPath(super().shape())
+        for index, label_rect in enumerate(self.label_rects):
+            if self.is_label_visible(index):
+                path.addRect(label_rect)
+        return path
+
+    def paint(self, painter, option, widget=None):
+        """Overrides base method"""
+        super().paint(painter, option, widget)
+
+        detail = RENDER_SETTINGS.detail_level(
+            option.levelOfDetailFromTransform(painter.worldTransform())
+        )
+        if detail == DetailLevel.OUTLINE:
+            # Labels can not be read at this size
+            return
+
+        painter.setFont(LABEL_FONT)
+        painter.setPen(Qt.black)
+        for index, ((label, _), label_rect) in enumerate(
+            zip(self.labels, self.label_rects)
+        ):
+            if self.is_label_visible(index):
+                painter.fillRect(label_rect, LABEL_BACKGROUND)
+                painter.drawStaticText(
+                    label_rect.topLeft() + QPointF(LABEL_MARGIN, LABEL_MARGIN), label
+                )
+
+    def update_path(self):
         pass
 
     def delete(self):
@@ -54,7 +130,6 @@ class AssociationConnectionItem(IConnectionItem):
         self.setPen(pen)
         self.setZValue(0)  # Ensure connection items are behind rect items
 
-        self.show_assoc_flag = False
         self.start_item = start_item
         self.end_item = end_item
         self._scene = scene
@@ -75,33 +150,27 @@ class AssociationConnectionItem(IConnectionItem):
         # Get right field name
         self.right_fieldname = fieldname
 
-        # Create labels with background color
-        self.label_assoc_left_field = self.create_label(self.left_fieldname)
-
-        self.label_assoc_middle_name = self.create_label(self.assoc_name)
-
-        self.label_assoc_right_field = self.create_label(self.right_fieldname)
+        # Association name in the middle, the labels for field names
+        # near the ends are only created once field names are shown
+        self.create_label(self.assoc_name, 0.5)
+        self.has_field_labels = False
+        if scene.get_show_assoc_checkbox_status():
+            self.create_field_labels()
+        else:
+            scene.unlabeled_associations.add(self)
 
         self.update_path()
 
-    def create_label(self, text) -> QGraphicsItemGroup:
-        """Create the connection label"""
-        label = QGraphicsTextItem(text)
-        label.setDefaultTextColor(Qt.black)
-
-        # Create a white background for the label
-        rect = label.boundingRect()
-        # Semi-transparent white background
-        label_background = QGraphicsRectItem(rect)
-        label_background.setBrush(QBrush(QColor(255, 255, 255, 200)))
-        label_background.setPen(Qt.NoPen)
+    def create_field_labels(self):
+        """Add the field name labels, lay them out with update_path"""
+        if not self.has_field_labels:
+            self.has_field_labels = True
+            self.create_label(self.left_fieldname, 0.2)
+            self.create_label(self.right_fieldname, 0.8)
 
-        # Create a group to hold the label and its background
-        label_group = self._scene.createItemGroup([label_background, label])
-        label_group.setParentItem(self)
-        label_group.setZValue(1)  # Ensure labels are above the line
-
-        return label_group
+    def is_label_visible(self, index) -> bool:
+        """Field names are only shown if enabled in the scene"""
+        return index == 0 or self._scene.get_show_assoc_checkbox_status()
 
     def update_path(self):
         """
@@ -110,41 +179,7 @@ class AssociationConnectionItem(IConnectionItem):
         """
         start_pos = self.start_item.sceneBoundingRect().center()
         end_pos = self.end_item.sceneBoundingRect().center()
-        self.setLine(QLineF(start_pos, end_pos))
-
-        label_assoc_left_field_pos = self.line().pointAt(0.2)
-        self.label_assoc_left_field.setPos(
-            label_assoc_left_field_pos
-            - QPointF(
-                self.label_assoc_left_field.boundingRect().width() / 2,
-                self.label_assoc_left_field.boundingRect().height() / 2,
-            )
-        )
-
-        label_assoc_middle_name_pos = self.line().pointAt(0.5)
-        self.label_assoc_middle_name.setPos(
-            label_assoc_middle_name_pos
-            - QPointF(
-                self.label_assoc_middle_name.boundingRect().width() / 2,
-                self.label_assoc_middle_name.boundingRect().height() / 2,
-            )
-        )
-
-        labelassoc_right_field_pos = self.line().pointAt(0.8)
-        self.label_assoc_right_field.setPos(
-            labelassoc_right_field_pos
-            - QPointF(
-                self.label_assoc_right_field.boundingRect().width() / 2,
-                self.label_assoc_right_field.boundingRect().height() / 2,
-            )
-        )
-
-        self.label_assoc_left_field.setVisible(
-            self._scene.get_show_assoc_checkbox_status()
-        )
-        self.label_assoc_right_field.setVisible(
-            self._scene.get_show_assoc_checkbox_status()
-        )
+        self.set_line_and_labels(start_pos, end_pos)
 
     def calculate_offset(self, rect, label_pos, angle):
         """Calculate the offset to position the label
@@ -166,21 +201,8 @@ class AssociationConnectionItem(IConnectionItem):
 
         return offset
 
-    def remove_labels(self):
-        """Remove the labels from a connection item"""
-        self._scene.removeItem(self.label_assoc_left_field)
-        self._scene.removeItem(self.label_assoc_middle_name)
-        self._scene.removeItem(self.label_assoc_right_field)
-
-    def restore_labels(self):
-        """Undo delete of connection item"""
-        self._scene.addItem(self.label_assoc_left_field)
-        self._scene.addItem(self.label_assoc_middle_name)
-        self._scene.addItem(self.label_assoc_right_field)
-
     def delete(self):
         """Delete connection item"""
-        self.remove_labels()
         self._scene.removeItem(self)
 
 
@@ -214,54 +236,17 @@ class AttackerConnectionBase(IConnectionItem):
         self.attacker_item.add_connection(self)
         self.asset_item.add_connection(self)
 
-        self.label = self.create_label(attack_step_name)
+        # label in the middle
+        self.create_label(self.ICON_TEXT + " " + attack_step_name)
 
         self.update_path()
 
-    def create_label(self, text) -> QGraphicsItemGroup:
-        label = QGraphicsTextItem(self.ICON_TEXT + " " + text)
-        label.setDefaultTextColor(Qt.black)
-
-        rect = label.boundingRect()
-        bg = QGraphicsRectItem(rect)
-        bg.setBrush(QBrush(QColor(255, 255, 255, 200)))
-        bg.setPen(Qt.NoPen)
-
-        group = self._scene.createItemGroup([bg, label])
-        group.setParentItem(self)
-        group.setZValue(1)
-        return group
-
-    def create_icon(self, text) -> QGraphicsTextItem:
-        icon = QGraphicsTextItem(text)
-        icon.setDefaultTextColor(self.COLOR)
-        icon.setParentItem(self)
-        icon.setZValue(1)
-        return icon
-
     def update_path(self):
         start_pos = self.attacker_item.sceneBoundingRect().center()
         end_pos = self.asset_item.sceneBoundingRect().center()
-        self.setLine(QLineF(start_pos, end_pos))
-
-        # label in the middle
-        mid = self.line().pointAt(0.5)
-        self.label.setPos(
-            mid
-            - QPointF(
-                self.label.boundingRect().width() / 2,
-                self.label.boundingRect().height() / 2,
-            )
-        )
-
-    def remove_labels(self):
-        self._scene.removeItem(self.label)
-
-    def restore_labels(self):
-        self._scene.addItem(self.label)
+        self.set_line_and_labels(start_pos, end_pos)
 
     def delete(self):
-        self.remove_labels()
         self._scene.removeItem(self)
 
 
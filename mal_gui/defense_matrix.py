@@ -0,0 +1,161 @@
+"""
+Defense values of many assets as a CSV matrix, one row per asset and
+one column per defense. Empty cells are defenses not set in the model,
+the default value of the defense applies to them.
+"""
+
+from __future__ import annotations
+
+import csv
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .defenses import defense_table
+
+if TYPE_CHECKING:
+    from maltoolbox.model import Model
+
+DEFENSE_MATRIX_SUFFIX = "csv"
+# Header of the column holding the asset names
+ASSET_COLUMN = "asset"
+# Most invalid cells listed in an error message
+MAX_REPORTED_CELLS = 5
+
+
+def model_defense_names(model: Model) -> list[str]:
+    """Defenses of the asset types in `model`, in language order"""
+    defense_names: dict[str, None] = {}
+    for lg_asset in {asset.lg_asset for asset in model.assets.values()}:
+        for defense_name, _ in defense_table(lg_asset):
+            defense_names[defense_name] = None
+    # Defenses set in the model are kept even if the language lacks them
+    for asset in model.assets.values():
+        defense_names.update(dict.fromkeys(asset.defenses))
+    return list(defense_names)
+
+
+def write_defense_matrix(file_path: str, model: Model):
+    """Write the defenses of all assets in `model` to a CSV file"""
+    defense_names = model_defense_names(model)
+    with open(file_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow([ASSET_COLUMN, *defense_names])
+        for asset in model.assets.values():
+            writer.writerow(
+                [
+                    asset.name,
+                    *(
+                        "" if name not in asset.defenses else asset.defenses[name]
+                        for name in defense_names
+                    ),
+                ]
+            )
+
+
+def _cell_names(
+    asset_names: list[str], defense_names: list[str], invalid: np.ndarray
+) -> str:
+    """Readable list of the cells marked in `invalid`"""
+    rows, columns = np.nonzero(invalid)
+    cells = [
+        f"{asset_names[row]}.{defense_names[column]}"
+        for row, column in zip(rows[:MAX_REPORTED_CELLS], columns)
+    ]
+    if len(rows) > MAX_REPORTED_CELLS:
+        cells.append(f"and {len(rows) - MAX_REPORTED_CELLS} more")
+    return ", ".join(cells)
+
+
+def read_defense_matrix(
+    file_path: str,
+) -> tuple[list[str], list[str], np.ndarray]:
+    """
+    Read a defense matrix written by `write_defense_matrix`.
+    Returns the asset names, the defense names and the values,
+    NaN for empty cells. Raises ValueError if the file is invalid
+    or a value is not a number in [0, 1].
+    """
+    with open(file_path, newline="", encoding="utf-8") as file:
+        rows = [row for row in csv.reader(file) if row]
+
+    if not rows or rows[0][0] != ASSET_COLUMN:
+        raise ValueError(f"First column must be '{ASSET_COLUMN}'")
+    defense_names = rows[0][1:]
+    for line, row in enumerate(rows[1:], start=2):
+        if len(row) != len(defense_names) + 1:
+            raise ValueError(
+                f"Line {line} has {len(row)} cells, expected {len(defense_names) + 1}"
+            )
+
+    asset_names = [row[0] for row in rows[1:]]
+    cells = np.array([row[1:] for row in rows[1:]], dtype=str).reshape(
+        len(asset_names), len(defense_names)
+    )
+    cells = np.char.strip(cells)
+    empty = cells == ""
+
+    # Converted in one go, cell by cell only to report what failed
+    try:
+        values = np.where(empty, "nan", cells).astype(np.float64)
+    except ValueError:
+        not_numbers = np.vectorize(_is_not_number)(cells) & ~empty
+        raise ValueError(
+            "Values are not numbers: "
+            + _cell_names(asset_names, defense_names, not_numbers)
+        ) from None
+
+    with np.errstate(invalid="ignore"):
+        invalid = ~empty & ~((values >= 0.0) & (values <= 1.0))
+    if invalid.any():
+        raise ValueError(
+            "Values must be between 0.0 and 1.0: "
+            + _cell_names(asset_names, defense_names, invalid)
+        )
+    return asset_names, defense_names, values
+
+
+def _is_not_number(cell: str) -> bool:
+    try:
+        float(cell)
+    except ValueError:
+        return True
+    return False
+
+
+def defense_matrix_changes(
+    model: Model,
+    asset_names: list[str],
+    defense_names: list[str],
+    values: np.ndarray,
+) -> dict[int, dict[str, Optional[float]]]:
+    """
+    New defense values per asset id for a matrix read by
+    `read_defense_matrix`, None for defenses that are no longer set.
+    Raises ValueError if an asset is missing, has more than one row
+    or lacks a defense.
+    """
+    changes: dict[int, dict[str, Optional[float]]] = {}
+    is_set = ~np.isnan(values)
+    for row, asset_name in enumerate(asset_names):
+        asset = model.get_asset_by_name(asset_name)
+        if asset is None:
+            raise ValueError(f"No asset named '{asset_name}' in the model")
+        if asset.id in changes:
+            raise ValueError(f"Asset '{asset_name}' has more than one row")
+
+        asset_defenses = {name for name, _ in defense_table(asset.lg_asset)}
+        asset_defenses.update(asset.defenses)
+        defenses: dict[str, Optional[float]] = {}
+        for column, defense_name in enumerate(defense_names):
+            if defense_name in asset_defenses:
+                defenses[defense_name] = (
+                    float(values[row, column]) if is_set[row, column] else None
+                )
+            elif is_set[row, column]:
+                raise ValueError(
+                    f"Asset '{asset_name}' of type {asset.type} "
+                    f"has no defense '{defense_name}'"
+                )
+        changes[asset.id] = defenses
+    return changes
@@ -0,0 +1,41 @@
+"""
+Defenses of asset types, read from the language graph once per type.
+Shared by the properties panel and the defense matrix import/export.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from maltoolbox.language import LanguageGraphAsset
+
+# Dropped with the language graph the asset types belong to
+_defense_tables: WeakKeyDictionary[LanguageGraphAsset, list[tuple[str, float]]] = (
+    WeakKeyDictionary()
+)
+
+
+def defense_table(lg_asset: LanguageGraphAsset) -> list[tuple[str, float]]:
+    """
+    Names and default values of the defenses of an asset type.
+    The same list is returned for every call with the same type.
+    """
+    defenses = _defense_tables.get(lg_asset)
+    if defenses is None:
+        defenses = _defense_tables[lg_asset] = _read_defense_table(lg_asset)
+    return defenses
+
+
+def _read_defense_table(lg_asset: LanguageGraphAsset) -> list[tuple[str, float]]:
+    defenses = []
+    for attack_step in lg_asset.attack_steps.values():
+        if attack_step.type != "defense":
+            continue
+        if attack_step.ttc and len(attack_step.ttc["arguments"]) > 0:
+            default_value = attack_step.ttc["arguments"][0]
+        else:
+            default_value = 0.0
+        defenses.append((attack_step.name, default_value))
+    return defenses
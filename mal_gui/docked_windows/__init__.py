@@ -2,7 +2,12 @@ from .asset_relations_window import AssetRelationsWindow
 from .attack_steps_window import AttackStepsWindow
 from .draggable_tree_view import DraggableTreeView
 from .item_details_window import ItemDetailsWindow
-from .properties_window import PropertiesWindow, EditableDelegate
+from .object_explorer_model import ObjectExplorerModel
+from .properties_window import (
+    EditableDelegate,
+    PropertiesTableModel,
+    PropertiesWindow,
+)
 from .style_configuration import CustomDialog, CustomDialogGlobal, Visibility
 
 __all__ = [
@@ -10,8 +15,10 @@ __all__ = [
     "AttackStepsWindow",
     "DraggableTreeView",
     "ItemDetailsWindow",
+    "ObjectExplorerModel",
     "PropertiesWindow",
     "EditableDelegate",
+    "PropertiesTableModel",
     "CustomDialog",
     "CustomDialogGlobal",
     "Visibility",
@@ -1,32 +1,113 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-
-from PySide6.QtWidgets import QPushButton, QTreeWidget, QTreeWidgetItem
-from PySide6.QtCore import QMimeData, QEvent
+from typing import TYPE_CHECKING, Optional
+
+from PySide6.QtWidgets import (
+    QApplication,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QTreeView,
+)
+from PySide6.QtCore import QMimeData, QEvent, QModelIndex, QSize, Qt, Signal
 from PySide6.QtGui import QDrag, QIcon, QResizeEvent
 
+from .object_explorer_model import (
+    ObjectExplorerModel,
+    STYLE_COLUMN,
+    VISIBILITY_COLUMN,
+    VISIBLE_ROLE,
+)
 from .style_configuration import (
-    Visibility,
     CustomDialog,
     CustomDialogGlobal,
 )
 
 if TYPE_CHECKING:
-    from ..object_explorer.asset_item import AssetItem
-
+    from maltoolbox.model import ModelAsset
+    from ..model_scene import ModelScene
+
+
+class ExplorerButtonDelegate(QStyledItemDelegate):
+    """
+    Paints the visibility and style buttons of the object explorer,
+    embedded button widgets are too slow with many assets
+    """
+
+    # Emitted with the index of a button that was clicked
+    clicked = Signal(QModelIndex)
+
+    def __init__(self, eye_unhide_icon, eve_hide_icon, rgb_color_icon, parent=None):
+        super().__init__(parent)
+        # Loaded once, shared by all rows
+        self.eye_unhide_icon = QIcon(eye_unhide_icon)
+        self.eve_hide_icon = QIcon(eve_hide_icon)
+        self.rgb_color_icon = QIcon(rgb_color_icon)
+
+    def button_icon(self, index: QModelIndex) -> Optional[QIcon]:
+        """Icon of the button in `index`, None if it has no button"""
+        if index.column() == STYLE_COLUMN:
+            return self.rgb_color_icon
+        if index.column() == VISIBILITY_COLUMN and index.parent().isValid():
+            if index.data(VISIBLE_ROLE):
+                return self.eye_unhide_icon
+            return self.eve_hide_icon
+        return None
+
+    def paint(self, painter, option, index):
+        """Overrides base method"""
+        icon = self.button_icon(index)
+        if icon is None:
+            super().paint(painter, option, index)
+            return
+
+        button_option = QStyleOptionButton()
+        button_option.rect = option.rect
+        button_option.state = option.state | QStyle.State_Raised
+        button_option.icon = icon
+        icon_size = option.rect.height() - 6
+        button_option.iconSize = QSize(icon_size, icon_size)
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button_option, painter)
+
+    def editorEvent(self, event, model, option, index):
+        """Overrides base method"""
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and option.rect.contains(event.position().toPoint())
+            and self.button_icon(index) is not None
+        ):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class DraggableTreeView(QTreeView):
+    """
+    Object explorer, asset types with their assets below them.
+    Follows the assets of its scene through the scene signals.
+    """
 
-class DraggableTreeView(QTreeWidget):
     def __init__(self, scene, eye_unhide_icon, eve_hide_icon, rgb_color_icon):
 
         super().__init__()
-        self.scene = scene
-        self.eye_visibility = Visibility.UNHIDE
-        self.eye_unhide_icon = eye_unhide_icon
-        self.eve_hide_icon = eve_hide_icon
-        self.rgb_color_icon = rgb_color_icon
+        self.scene: Optional[ModelScene] = None
+
+        self.explorer_model = ObjectExplorerModel(self)
+        self.setModel(self.explorer_model)
+        self.explorer_model.asset_visibility_changed.connect(
+            self.set_asset_item_visible
+        )
+
+        self.button_delegate = ExplorerButtonDelegate(
+            eye_unhide_icon, eve_hide_icon, rgb_color_icon, self
+        )
+        self.button_delegate.clicked.connect(self.button_clicked)
+        self.setItemDelegateForColumn(VISIBILITY_COLUMN, self.button_delegate)
+        self.setItemDelegateForColumn(STYLE_COLUMN, self.button_delegate)
 
         self.setHeaderHidden(True)  # Hide the header
-        self.setColumnCount(3)  # Two columns: one for text and one for button
+        self.setUniformRowHeights(True)
         self.setDragEnabled(True)
         self.setAcceptDrops(True)
         self.setDropIndicatorShown(True)
@@ -40,15 +121,43 @@ class DraggableTreeView(QTreeWidget):
         # when the tree widget is resized
         self.viewport().installEventFilter(self)
 
+        self.set_scene(scene)
+
+    def set_scene(self, scene: Optional[ModelScene]):
+        """Follow the assets of `scene` instead of the current scene"""
+        if self.scene is not None:
+            self.scene.asset_added.disconnect(self.explorer_model.add_asset)
+            self.scene.asset_removed.disconnect(self.explorer_model.remove_asset)
+            self.scene.asset_renamed.disconnect(self.explorer_model.rename_asset)
+
+        self.scene = scene
+        if scene is not None:
+            scene.asset_added.connect(self.explorer_model.add_asset)
+            scene.asset_removed.connect(self.explorer_model.remove_asset)
+            scene.asset_renamed.connect(self.explorer_model.rename_asset)
+
+    def set_asset_types(self, asset_types: list[tuple[str, QIcon]]):
+        self.explorer_model.set_asset_types(asset_types)
+
+    def show_scene_assets(self):
+        """Show all assets of the scene model, used after loading a model"""
+        if self.scene is None:
+            self.explorer_model.set_model(None)
+            return
+        self.explorer_model.set_model(self.scene.model, self.scene.hidden_asset_ids)
+
+    def clear_all_object_explorer_child_items(self):
+        self.explorer_model.set_model(None)
+
     def startDrag(self, supported_actions):
         """Overrides base method"""
-        item = self.currentItem()
+        index = self.currentIndex()
         if (
-            item and item.parent() is None
+            index.isValid() and not index.parent().isValid()
         ):  # Only start drag if the item is a top-level item (parent)
             drag = QDrag(self)
             mime_data = QMimeData()
-            mime_data.setText(item.text(0))
+            mime_data.setText(self.explorer_model.asset_type(index))
             drag.setMimeData(mime_data)
             drag.exec(supported_actions)
 
@@ -63,12 +172,6 @@ class DraggableTreeView(QTreeWidget):
         # Remaining width for text column
         text_width = tree_width - button_width
 
-        # self.setColumnWidth(0, text_width)  # Set width for text column
-        # self.setColumnWidth(1, button_width)  # Set width for button column
-
-        # Adjust the width of all buttons in the tree
-        # self.adjust_button_width()
-
         left_eye_button_width = 0.50 * button_width
         right_color_button_width = 0.50 * button_width
 
@@ -83,114 +186,20 @@ class DraggableTreeView(QTreeWidget):
             self.resizeEvent(event)
         return super().eventFilter(source, event)
 
-    def set_parent_item_text(self, text, icon=None):
-        # Create item with placeholder for button
-        parent_item = QTreeWidgetItem([text, ""])
-        if icon:
-            parent_item.setIcon(0, QIcon(icon))
-        self.addTopLevelItem(parent_item)
-        self.add_button_to_item(parent_item, "", is_parent=True)
-        return parent_item
-
-    def add_child_item(self, parent_item, child_item_asset, text):
-        # Create item with placeholder for button
-        child_item = QTreeWidgetItem([text, ""])
-        child_item.assetItemReference = child_item_asset
-        parent_item.addChild(child_item)
-        self.add_button_to_item(child_item, "", is_parent=False)
-        return child_item
-
-    def add_button_to_item(self, item, text, is_parent, icon_path=None):
-        # button = QPushButton(text)
-        # if icon_path:
-        #     button.setIcon(QIcon(icon_path))
-        if is_parent:
-            button = QPushButton(text)
-            button.setIcon(QIcon(self.rgb_color_icon))
-            button.clicked.connect(lambda: self.show_global_asset_edit_form(item))
-            # Place the button in the second column
-            self.setItemWidget(item, 2, button)
-            # self.adjust_button_width()
-        else:
-            left_eye_button = QPushButton(text)
-            left_eye_button.setIcon(QIcon(self.eye_unhide_icon))
-            left_eye_button.clicked.connect(
-                lambda: self.hide_unhide_asset_item(left_eye_button, item)
+    def button_clicked(self, index: QModelIndex):
+        asset = self.explorer_model.asset(index)
+        if index.column() == STYLE_COLUMN:
+            if asset is None:
+                self.show_global_asset_edit_form(self.explorer_model.asset_type(index))
+            else:
+                self.show_local_asset_edit_form(asset)
+        elif index.column() == VISIBILITY_COLUMN and asset is not None:
+            self.explorer_model.setData(
+                index, not index.data(VISIBLE_ROLE), VISIBLE_ROLE
             )
-            # Place the left button in the second column
-            self.setItemWidget(item, 1, left_eye_button)
 
-            right_color_button = QPushButton(text)
-            right_color_button.setIcon(QIcon(self.rgb_color_icon))
-            right_color_button.clicked.connect(
-                lambda: self.show_local_asset_edit_form(item)
-            )
-            # Place the right button in the third column
-            self.setItemWidget(item, 2, right_color_button)
-
-    def hide_unhide_asset_item(self, eye_button, item):
-        if self.eye_visibility == Visibility.UNHIDE:
-            self.eye_visibility = Visibility.HIDE
-
-            # First Hide the connections associtaed with the asset item
-            asset_item: AssetItem = item.assetItemReference
-
-            if hasattr(asset_item, "connections"):
-                connections = asset_item.connections
-                for connection in connections:
-                    connection.remove_labels()
-                    connection.setVisible(False)
-
-            # Then hide the asset item itself
-            asset_item.setVisible(False)
-
-            eye_button.setIcon(QIcon(self.eve_hide_icon))
-        else:
-            self.eye_visibility = Visibility.UNHIDE
-
-            # First unhide the connections associtaed with the asset item
-            asset_item = item.assetItemReference
-
-            if hasattr(asset_item, "connections"):
-                connections = asset_item.connections
-                for connection in connections:
-                    connection.restore_labels()
-                    connection.setVisible(True)
-
-            # Then unhide the asset item itself
-            asset_item.setVisible(True)
-
-            eye_button.setIcon(QIcon(self.eye_unhide_icon))
-
-    def adjust_button_width(self):
-        """Adjust the width of all buttons in the tree"""
-        for i in range(self.topLevelItemCount()):
-            top_item = self.topLevelItem(i)
-            button = self.itemWidget(top_item, 1)
-            if button:
-                # Set button width to match the column width
-                button.setFixedWidth(self.columnWidth(1))
-            for j in range(top_item.childCount()):
-                child_item = top_item.child(j)
-                button = self.itemWidget(child_item, 1)
-                if button:
-                    # Set button width to match the column width
-                    button.setFixedWidth(self.columnWidth(1))
-
-    # def showEditForm(self, item):
-    #     dialog = CustomDialog(item, self)
-    #     if dialog.exec() == QDialog.Accepted:
-    #         item.setText(0, dialog.get_name())
-    #         if dialog.get_color_1():
-    #             item.setBackground(0, dialog.get_color_1())
-    #         if dialog.get_color_2():
-    #             item.setBackground(1, dialog.get_color_2())
-    #         font1 = dialog.getFont1()
-    #         if font1:
-    #             item.setFont(0, QFont(font1))
-    #         font2 = dialog.getFont2()
-    #         if font2:
-    #             item.setFont(1, QFont(font2))
+    def set_asset_item_visible(self, asset: ModelAsset, visible: bool):
+        self.scene.set_asset_visible(asset, visible)
 
     def update_color_callback(self, color1, color2):
         item = self.selected_item
@@ -199,31 +208,11 @@ class DraggableTreeView(QTreeWidget):
         print(f"RGB Color1: {color1.red()}, {color1.green()}, {color1.blue()}")
         print(f"RGB Color2: {color2.red()}, {color2.green()}, {color2.blue()}")
 
-    def show_local_asset_edit_form(self, item):
-        self.selected_item = item
-        self.dialog = CustomDialog(item, self.update_color_callback)
+    def show_local_asset_edit_form(self, asset: ModelAsset):
+        self.selected_item = self.scene.asset_item(asset)
+        self.dialog = CustomDialog(self.selected_item, self.update_color_callback)
         self.dialog.exec()
 
-    def show_global_asset_edit_form(self, item):
-        # self.globalAssetStyleHandlerDialog(self.scene)
-        # print("globalAssetStyleHandlerDialog executing")
-        # self.globalAssetStyleHandlerDialog.exec()
-        self.dialog = CustomDialogGlobal(self.scene, item)
+    def show_global_asset_edit_form(self, asset_type: str):
+        self.dialog = CustomDialogGlobal(self.scene, asset_type)
         self.dialog.exec()
-
-    def check_and_get_if_parent_asset_type_exists(self, child_asset_type):
-        for i in range(self.topLevelItemCount()):
-            parent_item = self.topLevelItem(i)
-            if parent_item.text(0) == child_asset_type:
-                return parent_item, child_asset_type
-        return None, None
-
-    def remove_children(self, parent_item):
-        while parent_item.childCount() > 0:
-            parent_item.takeChild(0)
-
-    def clear_all_object_explorer_child_items(self):
-        for i in range(self.topLevelItemCount()):
-            parent_item = self.topLevelItem(i)
-            self.remove_children(parent_item)
-            # parent_item.removeChild()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Optional
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QIcon
+
+if TYPE_CHECKING:
+    from maltoolbox.model import Model, ModelAsset
+
+# Role holding the asset id of an asset row
+ASSET_ID_ROLE = Qt.UserRole
+# Role holding whether the asset of an asset row is shown in the scene
+VISIBLE_ROLE = Qt.UserRole + 1
+
+# Name, visibility button and style button
+COLUMN_COUNT = 3
+VISIBILITY_COLUMN = 1
+STYLE_COLUMN = 2
+
+
+class ObjectExplorerModel(QAbstractItemModel):
+    """
+    Asset types as top level rows with the assets of each type as their
+    children, ordered by asset id. After `set_model` it is kept up to date
+    by `add_asset`, `remove_asset` and `rename_asset`, which find the
+    affected row by bisecting the ids and only touch that row.
+    """
+
+    # Emitted with the ModelAsset and its new visibility when
+    # the visibility of an asset row is set
+    asset_visibility_changed = Signal(object, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.asset_types: list[str] = []
+        self.type_icons: list[QIcon] = []
+        self.type_rows: dict[str, int] = {}
+        # Assets shown below each type row and their ids, sorted by id
+        self.assets: list[list[ModelAsset]] = []
+        self.asset_ids: list[list[int]] = []
+        self.hidden_asset_ids: set[int] = set()
+
+    def set_asset_types(self, asset_types: list[tuple[str, QIcon]]):
+        """Set the top level rows, removes all assets"""
+        self.beginResetModel()
+        self.asset_types = [asset_type for asset_type, _ in asset_types]
+        self.type_icons = [icon for _, icon in asset_types]
+        self.type_rows = {
+            asset_type: row for row, asset_type in enumerate(self.asset_types)
+        }
+        self.assets = [[] for _ in self.asset_types]
+        self.asset_ids = [[] for _ in self.asset_types]
+        self.endResetModel()
+
+    def set_model(self, model: Optional[Model], hidden_asset_ids=()):
+        """Show the assets of `model`, `hidden_asset_ids` are not in the scene"""
+        self.beginResetModel()
+        self.hidden_asset_ids = set(hidden_asset_ids)
+        self.assets = [[] for _ in self.asset_types]
+        for asset in model.assets.values() if model else []:
+            type_row = self.type_rows.get(asset.type)
+            if type_row is not None:
+                self.assets[type_row].append(asset)
+        for type_assets in self.assets:
+            type_assets.sort(key=lambda asset: asset.id)
+        self.asset_ids = [
+            [asset.id for asset in type_assets] for type_assets in self.assets
+        ]
+        self.endResetModel()
+
+    def add_asset(self, asset: ModelAsset):
+        type_row = self.type_rows.get(asset.type)
+        if type_row is None:
+            return
+        row = bisect_left(self.asset_ids[type_row], asset.id)
+        self.beginInsertRows(self.index(type_row, 0), row, row)
+        self.assets[type_row].insert(row, asset)
+        self.asset_ids[type_row].insert(row, asset.id)
+        self.endInsertRows()
+
+    def remove_asset(self, asset: ModelAsset):
+        index = self.asset_index(asset)
+        if not index.isValid():
+            return
+        type_row = index.parent().row()
+        self.beginRemoveRows(index.parent(), index.row(), index.row())
+        del self.assets[type_row][index.row()]
+        del self.asset_ids[type_row][index.row()]
+        self.endRemoveRows()
+
+    def rename_asset(self, asset: ModelAsset):
+        index = self.asset_index(asset)
+        if index.isValid():
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def asset_index(self, asset: ModelAsset) -> QModelIndex:
+        """Index of the row showing `asset`, invalid if there is none"""
+        type_row = self.type_rows.get(asset.type)
+        if type_row is None:
+            return QModelIndex()
+        # Found by id, undo recreates assets as new objects
+        type_asset_ids = self.asset_ids[type_row]
+        row = bisect_left(type_asset_ids, asset.id)
+        if row == len(type_asset_ids) or type_asset_ids[row] != asset.id:
+            return QModelIndex()
+        return self.index(row, 0, self.index(type_row, 0))
+
+    def asset(self, index: QModelIndex) -> Optional[ModelAsset]:
+        """Asset of an asset row, None for type rows"""
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        return self.assets[index.internalId() - 1][index.row()]
+
+    def asset_type(self, index: QModelIndex) -> str:
+        """Name of the asset type of a type or asset row"""
+        type_row = index.row() if index.internalId() == 0 else index.internalId() - 1
+        return self.asset_types[type_row]
+
+    def index(self, row, column, parent=QModelIndex()):
+        """Overrides base method"""
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if parent.isValid():
+            # Asset rows know the row of their type
+            return self.createIndex(row, column, parent.row() + 1)
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index=QModelIndex()):
+        """Overrides base method"""
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        """Overrides base method"""
+        if not parent.isValid():
+            return len(self.asset_types)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return len(self.assets[parent.row()])
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        """Overrides base method"""
+        return COLUMN_COUNT
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Overrides base method"""
+        if not index.isValid():
+            return None
+
+        if index.column() == VISIBILITY_COLUMN and role == VISIBLE_ROLE:
+            asset = self.asset(index)
+            return asset is not None and asset.id not in self.hidden_asset_ids
+        if index.column() != 0:
+            return None
+
+        if index.internalId() == 0:
+            if role == Qt.DisplayRole:
+                return self.asset_types[index.row()]
+            if role == Qt.DecorationRole:
+                return self.type_icons[index.row()]
+            return None
+
+        asset = self.assets[index.internalId() - 1][index.row()]
+        if role == Qt.DisplayRole:
+            return asset.name
+        if role == ASSET_ID_ROLE:
+            return asset.id
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Overrides base method, only the visibility of asset rows is set"""
+        asset = self.asset(index)
+        if asset is None or index.column() != VISIBILITY_COLUMN or role != VISIBLE_ROLE:
+            return False
+
+        if value:
+            self.hidden_asset_ids.discard(asset.id)
+        else:
+            self.hidden_asset_ids.add(asset.id)
+        self.dataChanged.emit(index, index, [VISIBLE_ROLE])
+        self.asset_visibility_changed.emit(asset, bool(value))
+        return True
+
+    def flags(self, index):
+        """Overrides base method"""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.internalId() == 0:
+            # Asset types are dragged into the scene to create assets
+            flags |= Qt.ItemIsDragEnabled
+        return flags
@@ -1,13 +1,27 @@
-from PySide6.QtCore import Qt, QLocale, QObject
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QLocale, QModelIndex, QObject, Qt
 from PySide6.QtGui import QDoubleValidator
 from PySide6.QtWidgets import (
     QLineEdit,
     QStyledItemDelegate,
     QMessageBox,
-    QTableWidget,
+    QTableView,
     QHeaderView,
 )
 
+from ..defenses import defense_table
+
+if TYPE_CHECKING:
+    from maltoolbox.language import LanguageGraphAsset
+    from ..object_explorer import AssetItem
+
+# Defense name, value set in the model and default value
+NAME_COLUMN = 0
+VALUE_COLUMN = 1
+DEFAULT_COLUMN = 2
+
 
 class FloatValidator(QDoubleValidator):
     def __init__(self, parent=None):
@@ -24,9 +38,8 @@ class FloatValidator(QDoubleValidator):
 
 
 class EditableDelegate(QStyledItemDelegate):
-    def __init__(self, asset_item, parent=None):
+    def __init__(self, parent=None):
         super(EditableDelegate, self).__init__(parent)
-        self.asset_item = asset_item
 
     def createEditor(self, parent, option, index):
         """Overrides base"""
@@ -45,7 +58,6 @@ class EditableDelegate(QStyledItemDelegate):
         """Overrides base"""
         value = editor.text()
         print("Value Entered: " + value)
-        # setattr(selected_item.asset, row[0],value)
         state = editor.validator().validate(value, 0)
         if state[0] != QDoubleValidator.Acceptable:
             QMessageBox.warning(
@@ -54,14 +66,8 @@ class EditableDelegate(QStyledItemDelegate):
             # Revert to previous valid value (optional)
             # editor.setText(index.model().data(index, Qt.EditRole))
         else:
+            # The model sets the defense of the shown asset
             model.setData(index, value, Qt.EditRole)
-            # Update the attribute in asset_item
-            row = index.row()
-            # property_key = model.item(row, 0).text()
-            property_key = index.sibling(row, 0).data()
-
-            # Set the attribute - Probably this is Andrei's expectation
-            self.asset_item.asset.defenses[property_key] = float(value)
 
     def validate_editor(self):
         editor = self.sender()
@@ -75,17 +81,144 @@ class EditableDelegate(QStyledItemDelegate):
                 # editor.setText(self.oldValue)
 
 
+def common_asset_type(
+    lg_assets: set[LanguageGraphAsset],
+) -> Optional[LanguageGraphAsset]:
+    """Most specific asset type that all `lg_assets` extend, if any"""
+    if not lg_assets:
+        return None
+    first_lg_asset, *other_lg_assets = lg_assets
+    for super_asset in first_lg_asset.super_assets:
+        if all(lg_asset.is_subasset_of(super_asset) for lg_asset in other_lg_assets):
+            return super_asset
+    return None
+
+
+class PropertiesTableModel(QAbstractTableModel):
+    """
+    Defenses of the shown assets, those of their common asset type when
+    they are of different types. The defenses of each asset type are
+    looked up once, showing other assets only swaps the assets.
+    An edit sets the defense of all shown assets in one undo command.
+    """
+
+    HEADERS = ["Defense Property", "Value", "Default Value"]
+    # Shown as value of a defense that differs between the assets
+    MIXED_VALUE = "<mixed>"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.asset_items: list[AssetItem] = []
+        self.defenses: list[tuple[str, float]] = []
+
+    def set_asset_items(self, asset_items: list[AssetItem]):
+        """Show the defenses of `asset_items`, none if the list is empty"""
+        lg_asset = common_asset_type(
+            {asset_item.asset.lg_asset for asset_item in asset_items}
+        )
+        defenses = [] if lg_asset is None else defense_table(lg_asset)
+
+        if defenses is self.defenses:
+            # Same asset type, only the values change
+            self.asset_items = asset_items
+            self.values_changed()
+            return
+
+        self.beginResetModel()
+        self.asset_items = asset_items
+        self.defenses = defenses
+        self.endResetModel()
+
+    def values_changed(self):
+        """Repaint all values at once"""
+        if self.defenses:
+            self.dataChanged.emit(
+                self.index(0, VALUE_COLUMN),
+                self.index(len(self.defenses) - 1, VALUE_COLUMN),
+                [Qt.DisplayRole, Qt.EditRole],
+            )
+
+    def defense_value(self, defense_name: str) -> tuple[Optional[float], bool]:
+        """
+        Value of a defense of the shown assets, None if it is not set,
+        and whether the assets have different values
+        """
+        values = set()
+        for asset_item in self.asset_items:
+            values.add(asset_item.asset.defenses.get(defense_name))
+            if len(values) > 1:
+                return None, True
+        return next(iter(values), None), False
+
+    def rowCount(self, parent=QModelIndex()):
+        """Overrides base method"""
+        return 0 if parent.isValid() else len(self.defenses)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Overrides base method"""
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Overrides base method"""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Overrides base method"""
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+
+        defense_name, default_value = self.defenses[index.row()]
+        if index.column() == NAME_COLUMN:
+            return defense_name
+        if index.column() == VALUE_COLUMN:
+            value, mixed = self.defense_value(defense_name)
+            if mixed:
+                # The editor starts empty for mixed values
+                return self.MIXED_VALUE if role == Qt.DisplayRole else ""
+            return "" if value is None else str(value)
+        if index.column() == DEFAULT_COLUMN:
+            return str(default_value)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Overrides base method, sets the defense of all shown assets"""
+        if (
+            not index.isValid()
+            or index.column() != VALUE_COLUMN
+            or role != Qt.EditRole
+            or not self.asset_items
+        ):
+            return False
+
+        defense_name, _ = self.defenses[index.row()]
+        self.asset_items[0].scene().set_defenses(
+            {
+                asset_item.asset.id: {defense_name: float(value)}
+                for asset_item in self.asset_items
+            }
+        )
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        """Overrides base method"""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == VALUE_COLUMN:
+            return Qt.ItemIsEditable | Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled
+
+
 class PropertiesWindow(QObject):
     def __init__(self):
         super().__init__()
 
         # Create the table
-        self.properties_table = QTableWidget()
-        self.properties_table.setColumnCount(3)
-        self.properties_table.setHorizontalHeaderLabels(
-            ["Defense Property", "Value", "Default Value"]
-        )
-        # self.properties_table.setRowCount(10)  # Example: setting 10 rows
+        self.properties_model = PropertiesTableModel(self)
+        self.properties_table = QTableView()
+        self.properties_table.setModel(self.properties_model)
 
         self.properties_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
@@ -103,6 +236,10 @@ class PropertiesWindow(QObject):
         # Hide the vertical header (row numbers)
         self.properties_table.verticalHeader().setVisible(False)
 
+        # Installed once, edits go through the model
         self.properties_table.setItemDelegateForColumn(
-            1, EditableDelegate(self.properties_table)
+            VALUE_COLUMN, EditableDelegate(self.properties_table)
         )
+
+    def set_asset_items(self, asset_items: list[AssetItem]):
+        self.properties_model.set_asset_items(asset_items)
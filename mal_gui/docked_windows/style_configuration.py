@@ -12,7 +12,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 from PySide6.QtGui import QColor
 
-from ..object_explorer.asset_item import AssetItem
+from ..object_explorer.item_style import invalidate_item_styles
 
 
 class Visibility(Enum):
@@ -34,19 +34,15 @@ class CustomDialog(QDialog):
 
         layout = QFormLayout(self)
 
-        self.name_edit = QLineEdit(item.text(0))
+        self.name_edit = QLineEdit(item.asset.name)
         layout.addRow("Name:", self.name_edit)
 
         self.color_button_1 = QPushButton("Select AssetType background color")
-        print(
-            "type(self.selected_item.childItemObj) = "
-            + str(type(self.selected_item.asset_item_reference))
-        )
         self.color_button_1.setStyleSheet(
-            f"background-color: {self.selected_item.asset_item_reference.asset_type_background_color.name()}"
+            f"background-color: {self.selected_item.asset_type_background_color.name()}"
         )
         self.color_button_1.clicked.connect(
-            lambda: self.open_color_dialog(1, self.selected_item.asset_item_reference)
+            lambda: self.open_color_dialog(1, self.selected_item)
         )
         layout.addRow("Color 1:", self.color_button_1)
 
@@ -55,10 +51,10 @@ class CustomDialog(QDialog):
 
         self.color_button_2 = QPushButton("Select AssetName background color")
         self.color_button_2.setStyleSheet(
-            f"background-color: {self.selected_item.asset_item_reference.asset_name_background_color.name()}"
+            f"background-color: {self.selected_item.asset_name_background_color.name()}"
         )
         self.color_button_2.clicked.connect(
-            lambda: self.open_color_dialog(2, self.selected_item.asset_item_reference)
+            lambda: self.open_color_dialog(2, self.selected_item)
         )
         layout.addRow("Color 2:", self.color_button_2)
 
@@ -128,17 +124,17 @@ class CustomDialogGlobal(QDialog):
     color_changed_1 = Signal(QColor)
     color_changed_2 = Signal(QColor)
 
-    def __init__(self, scene, item, parent=None):
+    def __init__(self, scene, asset_type_name, parent=None):
         super().__init__(parent)
 
         self.scene = scene
-        self.selectedAssetType = item
+        self.selectedAssetType = asset_type_name
 
         self.setWindowTitle("Style Configuration")
 
         layout = QFormLayout(self)
 
-        self.name_edit = QLabel(str(item.text(0)))
+        self.name_edit = QLabel(asset_type_name)
         layout.addRow("Name:", self.name_edit)
 
         self.color_button_1 = QPushButton("Select AssetType background color")
@@ -212,9 +208,13 @@ class CustomDialogGlobal(QDialog):
     def accept(self):
         super().accept()
         # self.update_color_callback(self.get_color_1(), self.get_color_2())
-        for item in self.scene.items():
-            if isinstance(item, (AssetItem)):
-                if item.asset_type == self.selectedAssetType.text(0):
-                    item.asset_type_background_color = self.get_color_1()
-                    item.asset_name_background_color = self.get_color_2()
-                    item.update()
+        asset_type_name = self.selectedAssetType
+
+        # Styles of the old colours are no longer used by this type
+        invalidate_item_styles(asset_type_name)
+
+        for item in self.scene.asset_items:
+            if item.asset_type.name == asset_type_name:
+                item.asset_type_background_color = self.get_color_1()
+                item.asset_name_background_color = self.get_color_2()
+                item.update()
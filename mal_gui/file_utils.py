@@ -2,8 +2,13 @@
 
 from pathlib import Path
 
+from appdirs import user_config_dir
+
 PACKAGE_DIR = Path(__file__).resolve().parent
 
+# User settings, e.g. latest language file and rendering options
+CONFIG_FILE_PATH = str(Path(user_config_dir("mal-gui", "mal-lang")) / "config.ini")
+
 
 def image_path(filename):
     """From a filename, return the absolute path of the image"""
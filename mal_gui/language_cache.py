@@ -0,0 +1,229 @@
+"""On-disk cache of compiled MAL languages"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from appdirs import user_cache_dir
+
+from maltoolbox import __version__ as maltoolbox_version
+from maltoolbox.language import LanguageGraph
+
+# Compiled languages are stored here, one pickle per language/toolbox version
+CACHE_DIR = Path(user_cache_dir("mal-gui", "mal-lang")) / "languages"
+
+# Number of compiled languages kept before the least recently used is evicted
+MAX_CACHED_LANGUAGES = 5
+
+CACHE_FILE_SUFFIX = ".langgraph.pickle"
+
+# `include "other.mal"`, the path is relative to the including file
+_INCLUDE_PATTERN = re.compile(rb'^\s*include\s+"([^"]+)"', re.MULTILINE)
+
+
+def _mal_source_files(lang_file: Path) -> list[Path]:
+    """A .mal spec and the specs it includes, transitively"""
+    source_files = []
+    seen = set()
+    pending = [lang_file]
+    while pending:
+        source_file = pending.pop()
+        resolved = source_file.resolve()
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+        try:
+            content = source_file.read_bytes()
+        except OSError:
+            if source_file is lang_file:
+                raise
+            # Missing includes are reported when the spec is compiled
+            continue
+        source_files.append(source_file)
+        includes = _INCLUDE_PATTERN.findall(content)
+        pending.extend(
+            source_file.parent / include.decode() for include in reversed(includes)
+        )
+    return source_files
+
+
+def language_source_files(lang_file_path: str) -> list[Path]:
+    """Files a language is compiled from, includes of a .mal spec too"""
+    lang_file = Path(lang_file_path)
+    if lang_file.suffix == ".mal":
+        return _mal_source_files(lang_file)
+    return [lang_file]
+
+
+def language_cache_key(
+    lang_file_path: str, source_files: Optional[list[Path]] = None
+) -> str:
+    """Key for a language file from its content and the maltoolbox version"""
+    lang_file = Path(lang_file_path)
+    if source_files is None:
+        source_files = language_source_files(lang_file_path)
+
+    digest = hashlib.sha256()
+    for source_file in source_files:
+        # Framed by name and length, so content can't move between files.
+        # The spec itself is unnamed, its key does not depend on its name.
+        name = (
+            ""
+            if source_file == lang_file
+            else os.path.relpath(source_file, lang_file.parent)
+        )
+        with open(source_file, "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            digest.update(name.encode() + b"\0" + size.to_bytes(8, "little"))
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                digest.update(chunk)
+    digest.update(maltoolbox_version.encode())
+    return digest.hexdigest()
+
+
+def _file_state(path) -> tuple:
+    """Identifies the state of a file, changes when the file is touched"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (str(path), None)
+    return (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_file_path(cache_key: str, cache_dir: Path) -> Path:
+    return cache_dir / (cache_key + CACHE_FILE_SUFFIX)
+
+
+def _read_cached_graph(cache_file: Path):
+    """Return the cached graph in `cache_file` or None if not usable"""
+    try:
+        with open(cache_file, "rb") as cached:
+            lang_graph = pickle.load(cached)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Partially written or written by an incompatible version
+        print(f"Discarding unreadable language cache {cache_file}: {e}")
+        cache_file.unlink(missing_ok=True)
+        return None
+
+    if not isinstance(lang_graph, LanguageGraph):
+        cache_file.unlink(missing_ok=True)
+        return None
+
+    # Mark as recently used so eviction keeps it
+    os.utime(cache_file)
+    return lang_graph
+
+
+def _write_cached_graph(lang_graph: LanguageGraph, cache_file: Path):
+    """Atomically store `lang_graph` in `cache_file`"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            pickle.dump(lang_graph, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_file)
+    except Exception as e:
+        print(f"Could not write language cache {cache_file}: {e}")
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+def evict_old_languages(
+    cache_dir: Path = CACHE_DIR, max_entries: int = MAX_CACHED_LANGUAGES
+):
+    """Remove the least recently used compiled languages above `max_entries`"""
+    if not cache_dir.is_dir():
+        return
+
+    cache_files = sorted(
+        cache_dir.glob("*" + CACHE_FILE_SUFFIX),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale_file in cache_files[max_entries:]:
+        print(f"Evicting cached language {stale_file.name}")
+        stale_file.unlink(missing_ok=True)
+
+
+def load_language_graph(
+    lang_file_path: str, cache_dir: Path = CACHE_DIR
+) -> LanguageGraph:
+    """
+    Load a LanguageGraph from a .mal/.mar file, reusing the
+    compiled graph from the on-disk cache when the file is unchanged
+    """
+    try:
+        cache_key = language_cache_key(lang_file_path)
+    except OSError:
+        # Let maltoolbox report missing/unreadable files
+        return LanguageGraph.load_from_file(lang_file_path)
+
+    cache_file = _cache_file_path(cache_key, cache_dir)
+    lang_graph = _read_cached_graph(cache_file)
+    if lang_graph is not None:
+        print(f"Loaded language {lang_file_path} from cache")
+        return lang_graph
+
+    lang_graph = LanguageGraph.load_from_file(lang_file_path)
+    _write_cached_graph(lang_graph, cache_file)
+    evict_old_languages(cache_dir)
+    return lang_graph
+
+
+class LanguageRegistry:
+    """
+    Languages loaded by this process, keyed by the content of
+    the language file so each language is only loaded once
+    """
+
+    def __init__(self):
+        self._lang_graphs: dict[str, LanguageGraph] = {}
+        self._file_keys: dict[tuple, str] = {}
+        # Files each language was last compiled from, by real path
+        self._source_files: dict[str, list[Path]] = {}
+
+    def language_key(self, lang_file_path: str) -> Optional[str]:
+        """Content key of a language file, None if it can not be read"""
+        try:
+            os.stat(lang_file_path)
+        except (OSError, TypeError):
+            return None
+
+        # Only hash the files again if one was touched since last time,
+        # a touched spec can include other files so they are looked up again
+        real_path = os.path.realpath(lang_file_path)
+        source_files = self._source_files.get(real_path, [Path(lang_file_path)])
+        file_id = tuple(_file_state(source_file) for source_file in source_files)
+        if file_id not in self._file_keys:
+            source_files = language_source_files(lang_file_path)
+            self._source_files[real_path] = source_files
+            file_id = tuple(_file_state(source_file) for source_file in source_files)
+            self._file_keys[file_id] = language_cache_key(lang_file_path, source_files)
+        return self._file_keys[file_id]
+
+    def same_language(self, lang_file_path: str, other_lang_file_path: str) -> bool:
+        """True if both paths hold the same language"""
+        key = self.language_key(lang_file_path)
+        return key is not None and key == self.language_key(other_lang_file_path)
+
+    def register(self, lang_file_path: str, lang_graph: LanguageGraph):
+        """Remember an already loaded language graph"""
+        key = self.language_key(lang_file_path)
+        if key is not None:
+            self._lang_graphs.setdefault(key, lang_graph)
+
+    def get_language_graph(self, lang_file_path: str) -> LanguageGraph:
+        """Return the loaded graph for a language file, load it if needed"""
+        key = self.language_key(lang_file_path)
+        if key in self._lang_graphs:
+            return self._lang_graphs[key]
+
+        lang_graph = load_language_graph(lang_file_path)
+        if key is not None:
+            self._lang_graphs[key] = lang_graph
+        return lang_graph
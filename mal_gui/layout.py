@@ -0,0 +1,326 @@
+"""
+Automatic placement of assets. The layouts work on a graph given as a
+number of nodes and an (E, 2) array of edges (node indices) and return an
+(N, 2) array of x, y positions, so they do not depend on Qt and can run
+in a worker process.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+
+import numpy as np
+from PySide6.QtCore import QCoreApplication, QThread, Signal
+
+# Distance between neighbouring positions, asset items are 240 x 70
+NODE_SPACING = 300.0
+LAYER_SPACING = 200.0
+
+# Graphs with at least this many nodes are laid out in a worker process
+WORKER_PROCESS_MIN_NODES = 10000
+
+# Up to this many nodes the repulsion between all pairs is computed,
+# larger graphs repel from the centroids of grid cells instead
+EXACT_REPULSION_MAX_NODES = 1500
+# Rows of the pairwise distance matrices computed at once
+CHUNK_ROWS = 512
+# Average number of nodes per grid cell in the approximate repulsion
+NODES_PER_CELL = 32
+# Cells with more nodes than this are not handled in one numpy operation
+MAX_CELL_TABLE_SLOTS = 128
+# Pull towards the center, keeps unconnected parts from drifting apart
+GRAVITY = 3.0
+
+
+class LayoutStrategy(Enum):
+    FORCE_DIRECTED = "Force-Directed"
+    LAYERED = "Layered"
+    GRID = "Grid"
+
+
+def grid_layout(num_nodes: int) -> np.ndarray:
+    """Nodes in rows of a square grid, in the order they are given"""
+    columns = max(1, int(np.ceil(np.sqrt(num_nodes))))
+    indices = np.arange(num_nodes)
+    return np.column_stack(
+        (
+            (indices % columns) * NODE_SPACING,
+            (indices // columns) * LAYER_SPACING,
+        )
+    ).astype(np.float64)
+
+
+def _adjacency(num_nodes: int, edges: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Neighbours of all nodes in compressed sparse row form"""
+    sources = np.concatenate((edges[:, 0], edges[:, 1]))
+    targets = np.concatenate((edges[:, 1], edges[:, 0]))
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+    return indptr, targets[order]
+
+
+def _clean_edges(num_nodes: int, edges) -> np.ndarray:
+    """Edges as an (E, 2) int array without self loops"""
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if len(edges) and (edges.min() < 0 or edges.max() >= num_nodes):
+        raise ValueError("Edge refers to a node that does not exist")
+    return edges[edges[:, 0] != edges[:, 1]]
+
+
+def layered_layout(num_nodes: int, edges) -> np.ndarray:
+    """
+    Each connected component is laid out in layers by breadth first
+    search from its most connected node, nodes of a layer are ordered by
+    the mean x of their neighbours in the layer above. Components are
+    placed side by side and unconnected nodes in a grid below them.
+    """
+    edges = _clean_edges(num_nodes, edges)
+    positions = np.zeros((num_nodes, 2), dtype=np.float64)
+    if num_nodes == 0:
+        return positions
+
+    indptr, neighbours = _adjacency(num_nodes, edges)
+    degree = np.diff(indptr)
+
+    depth = np.full(num_nodes, -1, dtype=np.int64)
+    component = np.full(num_nodes, -1, dtype=np.int64)
+    discovery = np.zeros(num_nodes, dtype=np.int64)
+    num_components = 0
+    num_discovered = 0
+    for root in np.argsort(-degree, kind="stable"):
+        if degree[root] == 0:
+            break
+        if depth[root] >= 0:
+            continue
+        depth[root] = 0
+        component[root] = num_components
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            discovery[node] = num_discovered
+            num_discovered += 1
+            for neighbour in neighbours[indptr[node] : indptr[node + 1]]:
+                if depth[neighbour] < 0:
+                    depth[neighbour] = depth[node] + 1
+                    component[neighbour] = num_components
+                    queue.append(neighbour)
+        num_components += 1
+
+    connected = np.flatnonzero(depth >= 0)
+    unconnected = np.flatnonzero(depth < 0)
+
+    if len(connected):
+        # Slot of each node within its (component, layer), ordered layer by
+        # layer so the barycenters of the layer above are already known
+        slot = np.zeros(num_nodes, dtype=np.float64)
+        layer_sizes = np.zeros((num_components, depth.max() + 1), dtype=np.int64)
+        np.add.at(layer_sizes, (component[connected], depth[connected]), 1)
+        edge_depths = depth[edges]
+        for layer in range(depth.max() + 1):
+            nodes = connected[depth[connected] == layer]
+            if layer == 0:
+                barycenter = np.zeros(num_nodes)
+            else:
+                # Edges from the layer above into this layer, either direction
+                down = edges[
+                    (edge_depths[:, 0] == layer - 1) & (edge_depths[:, 1] == layer)
+                ]
+                up = edges[
+                    (edge_depths[:, 1] == layer - 1) & (edge_depths[:, 0] == layer)
+                ]
+                parents = np.concatenate((down[:, 0], up[:, 1]))
+                children = np.concatenate((down[:, 1], up[:, 0]))
+                totals = np.bincount(children, slot[parents], minlength=num_nodes)
+                counts = np.bincount(children, minlength=num_nodes)
+                barycenter = totals / np.maximum(counts, 1)
+            order = nodes[
+                np.lexsort((discovery[nodes], barycenter[nodes], component[nodes]))
+            ]
+            # Rank within the component, centered below the layer above
+            first_of_component = np.searchsorted(component[order], component[order])
+            rank = np.arange(len(order)) - first_of_component
+            sizes = layer_sizes[component[order], layer]
+            slot[order] = rank - (sizes - 1) / 2
+
+        # Components side by side, each as wide as its widest layer
+        widths = layer_sizes.max(axis=1)
+        offsets = np.cumsum(widths) - widths + (widths - 1) / 2
+        positions[connected, 0] = (
+            offsets[component[connected]] + slot[connected]
+        ) * NODE_SPACING
+        positions[connected, 1] = depth[connected] * LAYER_SPACING
+
+    if len(unconnected):
+        grid = grid_layout(len(unconnected))
+        if len(connected):
+            grid[:, 1] += (depth.max() + 2) * LAYER_SPACING
+        positions[unconnected] = grid
+
+    return positions
+
+
+def _repulsion(positions: np.ndarray, masses: np.ndarray, centers: np.ndarray):
+    """Sum of the repulsive forces k^2 / d from `centers` on `positions`"""
+    k_squared = NODE_SPACING**2
+    forces = np.zeros_like(positions)
+    for start in range(0, len(positions), CHUNK_ROWS):
+        delta = positions[start : start + CHUNK_ROWS, None, :] - centers[None, :, :]
+        distance_squared = np.einsum("ijk,ijk->ij", delta, delta)
+        # Coinciding points (and a point with itself) do not push
+        np.maximum(distance_squared, 1e-2, out=distance_squared)
+        weights = masses * k_squared / distance_squared
+        weights[distance_squared <= 1e-2] = 0
+        forces[start : start + CHUNK_ROWS] = np.einsum("ij,ijk->ik", weights, delta)
+    return forces
+
+
+def _approximate_repulsion(positions: np.ndarray) -> np.ndarray:
+    """
+    Repulsion from the other nodes of the same grid cell plus the
+    centroids of all other cells, a one level Barnes-Hut approximation
+    """
+    num_nodes = len(positions)
+    low = positions.min(axis=0)
+    extent = max(float((positions.max(axis=0) - low).max()), NODE_SPACING)
+    cells_per_side = max(1, int(np.sqrt(num_nodes / NODES_PER_CELL)))
+    cell_xy = np.minimum(
+        ((positions - low) / extent * cells_per_side).astype(np.int64),
+        cells_per_side - 1,
+    )
+    _, cell, cell_sizes = np.unique(
+        cell_xy[:, 0] * cells_per_side + cell_xy[:, 1],
+        return_inverse=True,
+        return_counts=True,
+    )
+    cell = cell.reshape(-1)
+    centroids = (
+        np.column_stack(
+            (
+                np.bincount(cell, positions[:, 0]),
+                np.bincount(cell, positions[:, 1]),
+            )
+        )
+        / cell_sizes[:, None]
+    )
+
+    # All cells as point masses, then swap the own cell for its members
+    forces = _repulsion(positions, cell_sizes.astype(np.float64), centroids)
+    own_delta = positions - centroids[cell]
+    own_distance_squared = np.maximum(np.einsum("ij,ij->i", own_delta, own_delta), 1e-2)
+    forces -= (
+        own_delta * (cell_sizes[cell] * NODE_SPACING**2 / own_distance_squared)[:, None]
+    )
+    # Members of each cell in a padded (cells, slots) table so all cells
+    # are handled at once, cells too big for the table one by one
+    order = np.argsort(cell, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(cell_sizes)))
+    slot = np.arange(num_nodes) - bounds[cell[order]]
+    in_table = cell_sizes[cell[order]] <= MAX_CELL_TABLE_SLOTS
+    table = np.full((len(cell_sizes), min(cell_sizes.max(), MAX_CELL_TABLE_SLOTS)), -1)
+    table[cell[order][in_table], slot[in_table]] = order[in_table]
+    used = table >= 0
+    members = positions[table] * used[:, :, None]
+    delta = members[:, :, None, :] - members[:, None, :, :]
+    distance_squared = np.maximum(np.einsum("cijk,cijk->cij", delta, delta), 1e-2)
+    weights = NODE_SPACING**2 / distance_squared
+    weights *= used[:, :, None] & used[:, None, :]
+    weights[distance_squared <= 1e-2] = 0
+    forces[table[used]] += np.einsum("cij,cijk->cik", weights, delta)[used]
+
+    for i in np.flatnonzero(cell_sizes > MAX_CELL_TABLE_SLOTS):
+        cell_members = order[bounds[i] : bounds[i + 1]]
+        forces[cell_members] += _repulsion(
+            positions[cell_members],
+            np.ones(len(cell_members)),
+            positions[cell_members],
+        )
+    return forces
+
+
+def force_directed_layout(
+    num_nodes: int, edges, iterations: int = 100, seed: int = 0
+) -> np.ndarray:
+    """
+    Fruchterman-Reingold layout, connected nodes attract and all nodes
+    repel each other. Starts from the grid layout so the result only
+    depends on the graph and `seed`.
+    """
+    edges = _clean_edges(num_nodes, edges)
+    if num_nodes == 0:
+        return np.zeros((0, 2), dtype=np.float64)
+
+    rng = np.random.default_rng(seed)
+    positions = grid_layout(num_nodes) + rng.uniform(
+        -NODE_SPACING / 4, NODE_SPACING / 4, (num_nodes, 2)
+    )
+
+    temperature = NODE_SPACING * np.sqrt(num_nodes) / 10
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if num_nodes <= EXACT_REPULSION_MAX_NODES:
+            displacement = _repulsion(positions, np.ones(num_nodes), positions)
+        else:
+            displacement = _approximate_repulsion(positions)
+
+        # Attraction d^2 / k along each edge
+        delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        pull = delta * (np.linalg.norm(delta, axis=1) / NODE_SPACING)[:, None]
+        np.subtract.at(displacement, edges[:, 0], pull)
+        np.add.at(displacement, edges[:, 1], pull)
+
+        displacement -= (positions - positions.mean(axis=0)) * GRAVITY
+
+        # Move at most `temperature` per iteration
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return positions - positions.min(axis=0)
+
+
+def compute_layout(strategy: LayoutStrategy, num_nodes: int, edges) -> np.ndarray:
+    """Positions of `num_nodes` nodes laid out with `strategy`"""
+    if strategy == LayoutStrategy.FORCE_DIRECTED:
+        return force_directed_layout(num_nodes, edges)
+    if strategy == LayoutStrategy.LAYERED:
+        return layered_layout(num_nodes, edges)
+    return grid_layout(num_nodes)
+
+
+class LayoutWorker(QThread):
+    """
+    Computes a layout without blocking the GUI, large graphs are
+    laid out in a separate process to not compete for the GIL
+    """
+
+    computed = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, strategy: LayoutStrategy, num_nodes: int, edges, parent=None):
+        super().__init__(parent)
+        self.strategy = strategy
+        self.num_nodes = num_nodes
+        self.edges = edges
+
+        # A thread destroyed while running aborts the application
+        QCoreApplication.instance().aboutToQuit.connect(self.wait)
+
+    def run(self):
+        """Overrides base method"""
+        try:
+            if self.num_nodes >= WORKER_PROCESS_MIN_NODES:
+                # Spawned, forking a process running Qt threads is unsafe
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    positions = executor.submit(
+                        compute_layout, self.strategy, self.num_nodes, self.edges
+                    ).result()
+            else:
+                positions = compute_layout(self.strategy, self.num_nodes, self.edges)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.computed.emit(positions)
@@ -1,4 +1,7 @@
+import os
+import time
 from collections.abc import Iterable
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
@@ -17,11 +20,11 @@ from PySide6.QtWidgets import (
     QPushButton,
     QFileDialog,
     QMessageBox,
-    QTableWidgetItem,
     QApplication,
+    QProgressBar,
 )
 from PySide6.QtGui import QDrag, QAction, QIcon, QIntValidator
-from PySide6.QtCore import Qt, QMimeData, QByteArray, QSize, Signal, QPointF
+from PySide6.QtCore import Qt, QMimeData, QByteArray, QSize, QPointF
 
 from malsim import DefenderSettings
 from qt_material import apply_stylesheet, list_themes
@@ -29,24 +32,40 @@ from qt_material import apply_stylesheet, list_themes
 from maltoolbox import __version__ as maltoolbox_version
 from maltoolbox.language import LanguageGraph
 from maltoolbox.model import Model, ModelAsset
-from maltoolbox.exceptions import ModelException
 from malsim.config.agent_settings import AttackerSettings, AgentType
 from malsim.scenario import Scenario
 import yaml
 
 from mal_gui.object_explorer.attacker_item import AttackerItem
 
+from .defense_matrix import (
+    DEFENSE_MATRIX_SUFFIX,
+    defense_matrix_changes,
+    read_defense_matrix,
+    write_defense_matrix,
+)
 from .file_utils import image_path
+from .language_cache import LanguageRegistry
+from .layout import WORKER_PROCESS_MIN_NODES, LayoutStrategy
+from .model_loader import (
+    is_scenario_dict,
+    model_from_dict,
+    read_dict_file,
+    scenario_from_dict,
+)
 from .model_scene import ModelScene
 from .model_view import ModelView
+from .render_settings import RENDER_SETTINGS
+from .workspace_snapshot import (
+    WorkspaceSnapshot,
+    read_workspace_snapshot,
+    write_workspace_snapshot,
+)
 from .object_explorer import AssetItem, AssetFactory
-from .assets_container.assets_container import AssetsContainer
-from .connection_item import AssociationConnectionItem
 from .docked_windows import (
     DraggableTreeView,
     ItemDetailsWindow,
     PropertiesWindow,
-    EditableDelegate,
     AttackStepsWindow,
     AssetRelationsWindow,
 )
@@ -71,18 +90,44 @@ class DraggableListWidget(QListWidget):
 
 
 class MainWindow(QMainWindow):
-    update_childs_in_object_explorer_signal = Signal()
-
-    def __init__(self, app: QApplication, lang_file_path: str):
+    def __init__(
+        self,
+        app: QApplication,
+        lang_file_path: str,
+        lang_graph: Optional[LanguageGraph] = None,
+    ):
         super().__init__()
         self.setWindowTitle("MAL GUI")
         self.app = app  # declare an app member
 
         self.scenario_file_name = None
         self.model_file_name = None
+        # Snapshot to restore attackers and containers from once drawn
+        self.pending_snapshot: Optional[WorkspaceSnapshot] = None
+
+        # Level of detail thresholds from user settings
+        RENDER_SETTINGS.read_config()
+
+        # Languages already loaded, reused when models/scenarios are opened
+        self.language_registry = LanguageRegistry()
+        if lang_graph is not None:
+            # Language was already loaded (in the background)
+            self.language_registry.register(lang_file_path, lang_graph)
+
+        # Progress of drawing large models, shown in the status bar
+        self.draw_progress_bar = QProgressBar()
+        self.draw_progress_bar.setMaximumWidth(200)
+        self.draw_progress_bar.hide()
+        self.cancel_draw_button = QPushButton("Cancel")
+        self.cancel_draw_button.clicked.connect(
+            lambda: self.scene.cancel_drawing_model()
+        )
+        self.cancel_draw_button.hide()
+        self.statusBar().addPermanentWidget(self.draw_progress_bar)
+        self.statusBar().addPermanentWidget(self.cancel_draw_button)
 
         self.lang_file_path = lang_file_path
-        lang_graph = LanguageGraph.load_from_file(lang_file_path)
+        lang_graph = self.language_registry.get_language_graph(lang_file_path)
         self.asset_factory = self.create_asset_factory(lang_graph)
         self.scene = self.create_scene(
             lang_graph, self.asset_factory, Model("New Model", lang_graph)
@@ -96,10 +141,19 @@ class MainWindow(QMainWindow):
 
         self.view = self.create_view(self.scene)
 
-    def clear_window(self):
-        """Clear everything from the window"""
+    def clear_window(self, keep_side_panels=False):
+        """
+        Clear everything from the window, the side panels
+        are kept (but emptied) if `keep_side_panels` is set
+        """
         print("CLEAR WINDOW")
 
+        # Stop drawing the previous model if it is still being drawn
+        self.scene.stop_drawing_model()
+        self.draw_progress_bar.hide()
+        self.cancel_draw_button.hide()
+        self.pending_snapshot = None
+
         # Clear the scene (where the model is shown)
         self.scene.clear()
         # Remove the toolbar with actions and icons (above scene)
@@ -107,6 +161,12 @@ class MainWindow(QMainWindow):
         # Remove top dropdown menu bar ('File', 'Edit')
         self.menuBar().clear()
 
+        if keep_side_panels:
+            # Keep the asset type rows, only drop the assets
+            self.object_explorer_tree.clear_all_object_explorer_child_items()
+            self.show_selected_items([])
+            return
+
         # Remove the dock widgets (left menu)
         for dock_widget in self.dock_widgets:
             self.removeDockWidget(dock_widget)
@@ -114,20 +174,39 @@ class MainWindow(QMainWindow):
     def load_scene(
         self, lang_file_path: str, model: Model, scenario: Optional[Scenario] = None
     ):
-        """Load scene with given language and model"""
+        """
+        Load scene with given language and model. The asset factory
+        and side panels are only rebuilt if the language changed.
+        """
         print("LOADING SCENE!")
-        self.clear_window()
+        same_language = self.language_registry.same_language(
+            self.lang_file_path, lang_file_path
+        )
+        self.clear_window(keep_side_panels=same_language)
         self.lang_file_path = lang_file_path
-        lang_graph = LanguageGraph.load_from_file(lang_file_path)
-        self.asset_factory = self.create_asset_factory(lang_graph)
+
+        # The model is already bound to a graph of its language
+        lang_graph = model.lang_graph
+        self.language_registry.register(lang_file_path, lang_graph)
+
+        if not same_language:
+            self.asset_factory = self.create_asset_factory(lang_graph)
         self.scene = self.create_scene(lang_graph, self.asset_factory, model, scenario)
 
-        self.create_menu_bar()
         self.create_actions(self.scene)
+        self.create_menu_bar()
         self.toolbar = self.create_toolbar()
         self.addToolBar(self.toolbar)
-        self.dock_widgets = self.create_side_panels(self.asset_factory)
+
+        if same_language:
+            self.object_explorer_tree.set_scene(self.scene)
+        else:
+            self.dock_widgets = self.create_side_panels(self.asset_factory)
+
         self.view = self.create_view(self.scene)
+        if not self.scene.is_drawing_model():
+            # Otherwise updated when the model is drawn
+            self.update_explorer_docked_window()
 
     def create_asset_factory(self, lang_graph: LanguageGraph):
         """Create asset factory for language"""
@@ -173,10 +252,50 @@ class MainWindow(QMainWindow):
     ):
         """Create and initialize scene from language"""
 
-        model_scene = ModelScene(asset_factory, lang_graph, model, self, scenario)
+        # Large models are drawn in batches so the window stays responsive,
+        # for very large ones only the visible assets get items
+        virtualized = len(model.assets) >= ModelScene.VIRTUALIZE_MIN_ASSETS
+        draw_progressively = (
+            not virtualized
+            and len(model.assets) >= ModelScene.PROGRESSIVE_DRAW_MIN_ASSETS
+        )
+        model_scene = ModelScene(
+            asset_factory,
+            lang_graph,
+            model,
+            self,
+            scenario,
+            draw_progressively,
+            virtualized,
+        )
+        model_scene.draw_progress.connect(self.update_draw_progress)
+        model_scene.draw_finished.connect(self.model_drawn)
+        model_scene.layout_finished.connect(self.layout_finished)
 
         return model_scene
 
+    def update_draw_progress(self, steps_done, steps_total):
+        """Show progress of drawing a model in the status bar"""
+        self.draw_progress_bar.setMaximum(steps_total)
+        self.draw_progress_bar.setValue(steps_done)
+        self.draw_progress_bar.show()
+        self.cancel_draw_button.show()
+
+    def model_drawn(self, completed):
+        """Called when a progressively drawn model is done or cancelled"""
+        self.draw_progress_bar.hide()
+        self.cancel_draw_button.hide()
+        if not completed:
+            self.statusBar().showMessage(
+                "Drawing cancelled, the model is only partly shown", 5000
+            )
+        elif self.pending_snapshot is not None:
+            self.pending_snapshot.restore_scene_items(self.scene)
+        elif self.scenario_file_name is None:
+            self.write_workspace_snapshot()
+        self.pending_snapshot = None
+        self.update_explorer_docked_window()
+
     def create_view(self, scene: ModelScene):
         """Create and initialize view"""
         view = ModelView(scene, self)
@@ -187,9 +306,6 @@ class MainWindow(QMainWindow):
         # Set initial sizes of widgets in splitter
         splitter.setSizes([200, 100])
         self.setCentralWidget(splitter)
-        self.update_childs_in_object_explorer_signal.connect(
-            self.update_explorer_docked_window
-        )
         return view
 
     def create_side_panels(self, asset_factory: AssetFactory):
@@ -207,11 +323,13 @@ class MainWindow(QMainWindow):
             self.scene, eye_unhide_icon_image, eye_hide_icon_image, rgb_color_icon_image
         )
 
-        for _, values in asset_factory.asset_registry.items():
-            for value in values:
-                self.object_explorer_tree.set_parent_item_text(
-                    value.asset_type, value.asset_image
-                )
+        self.object_explorer_tree.set_asset_types(
+            [
+                (value.asset_type, QIcon(asset_factory.icon_pixmap(value.asset_type)))
+                for values in asset_factory.asset_registry.values()
+                for value in values
+            ]
+        )
 
         dock_object_explorer.setWidget(self.object_explorer_tree)
         self.addDockWidget(Qt.LeftDockWidgetArea, dock_object_explorer)
@@ -259,22 +377,68 @@ class MainWindow(QMainWindow):
         # Keep the properties Window highlighted and raised
         dock_properties.raise_()
 
+        # Panels showing the selected item, hidden ones are updated when shown
+        self.selection_panels = [
+            dock_item_details,
+            dock_properties,
+            dock_attack_steps,
+            dock_asset_relations,
+        ]
+        self.stale_selection_panels = set()
+        self.selected_items = []
+        for dock_widget in self.selection_panels:
+            dock_widget.visibilityChanged.connect(
+                partial(self.selection_panel_visibility_changed, dock_widget)
+            )
+
         return dock_widgets
 
+    def show_selected_items(self, items: list):
+        """
+        Show the selected `items` in the side panels. Only the properties
+        panel shows several items, the other panels show an item only if
+        it is selected alone. Only visible panels are updated right away.
+        """
+        self.selected_items = items
+        self.stale_selection_panels = set(self.selection_panels)
+        for dock_widget in self.selection_panels:
+            if dock_widget.isVisible():
+                self.update_selection_panel(dock_widget)
+
+    def selection_panel_visibility_changed(self, dock_widget, visible):
+        if visible and dock_widget in self.stale_selection_panels:
+            self.update_selection_panel(dock_widget)
+
+    def update_selection_panel(self, dock_widget):
+        """Show the selected items in one side panel"""
+        self.stale_selection_panels.discard(dock_widget)
+        items = self.selected_items
+        item = items[0] if len(items) == 1 else None
+        asset_item = item if isinstance(item, AssetItem) else None
+
+        panel = dock_widget.widget()
+        if panel is self.item_details_window:
+            self.item_details_window.update_item_details_window(item)
+        elif panel is self.properties_table:
+            self.update_properties_window(
+                [item for item in items if isinstance(item, AssetItem)]
+            )
+        elif panel is self.attack_steps_docked_window:
+            self.update_attack_steps_window(
+                item if isinstance(item, AttackerItem) else None
+            )
+        elif panel is self.asset_relations_docker_window:
+            self.update_asset_relations_window(asset_item)
+
     def show_association_checkbox_changed(self, checked):
         """Called on button click"""
         print("self.show_association_checkbox_changed clicked")
-        self.scene.set_show_assoc_checkbox_status(checked)
-        for connection in self.scene.items():
-            if isinstance(connection, AssociationConnectionItem):
-                connection.update_path()
+        self.scene.set_show_assoc_checkbox_status(bool(checked))
 
     def show_image_icon_checkbox_changed(self, checked):
         """Called on button click"""
         print("self.show_image_icon_checkbox_changed clicked")
-        for item in self.scene.items():
-            if isinstance(item, (AssetItem, AssetsContainer)):
-                item.toggle_icon_visibility()
+        self.scene.set_show_icons(bool(checked))
 
     def fit_to_view_button_clicked(self):
         """Called on button click"""
@@ -283,67 +447,8 @@ class MainWindow(QMainWindow):
         bounding_rect = self.scene.itemsBoundingRect()
         self.view.fitInView(bounding_rect, Qt.KeepAspectRatio)
 
-    def update_properties_window(self, asset_item: AssetItem):
-        # Clear the table
-        self.properties_table.setRowCount(0)
-
-        if asset_item is not None:
-            asset = asset_item.asset
-            properties = []
-            for attack_step_name, value in asset.defenses.items():
-                # Add defenses that are set in model
-                attack_step = asset.lg_asset.attack_steps[attack_step_name]
-                if attack_step.ttc and len(attack_step.ttc["arguments"]) > 0:
-                    default_value = attack_step.ttc["arguments"][0]
-                else:
-                    default_value = 0.0
-                properties.append((attack_step_name, str(value), str(default_value)))
-
-            for attack_step in asset.lg_asset.attack_steps.values():
-                # Add defenses that are not set in model
-                if attack_step.name in asset.defenses:
-                    continue
-                if attack_step.type == "defense":
-                    if attack_step.ttc and len(attack_step.ttc["arguments"]) > 0:
-                        default_value = attack_step.ttc["arguments"][0]
-                    else:
-                        default_value = 0.0
-                    properties.append((attack_step.name, "", str(default_value)))
-
-            # Insert new rows based on the data dictionary
-            num_rows = len(properties)
-            self.properties_table.setRowCount(num_rows)
-            self.properties_table.currentItem = asset_item
-
-            for row, (property_key, property_value, property_default) in enumerate(
-                properties
-            ):
-                col_property_name = QTableWidgetItem(property_key)
-                col_property_name.setFlags(
-                    Qt.ItemIsEnabled
-                )  # Make the property name read-only
-
-                col_value = QTableWidgetItem(property_value)
-                col_value.setFlags(
-                    Qt.ItemIsEditable | Qt.ItemIsEnabled
-                )  # Make the value editable
-
-                col_default_value = QTableWidgetItem(property_default)
-                col_default_value.setFlags(
-                    Qt.ItemIsEnabled
-                )  # Make the default value read-only
-
-                self.properties_table.setItem(row, 0, col_property_name)
-                self.properties_table.setItem(row, 1, col_value)
-                self.properties_table.setItem(row, 2, col_default_value)
-
-            # Set the item delegate and pass asset_item - based on Andrei's input
-            self.properties_table.setItemDelegateForColumn(
-                1, EditableDelegate(asset_item)
-            )
-
-        else:
-            self.properties_table.currentItem = None
+    def update_properties_window(self, asset_items: list[AssetItem]):
+        self.properties_docked_window.set_asset_items(asset_items)
 
     def update_attack_steps_window(self, attacker_asset_item: AttackerItem):
         if attacker_asset_item is not None:
@@ -428,11 +533,19 @@ class MainWindow(QMainWindow):
         self.file_menu_save_as_drawio = self.file_menu.addAction(
             "Export draw.io file.."
         )
+        self.file_menu_import_defenses_action = self.file_menu.addAction(
+            "Import Defenses.."
+        )
+        self.file_menu_export_defenses_action = self.file_menu.addAction(
+            "Export Defenses.."
+        )
         self.file_menu_quit_action = self.file_menu.addAction("Quit")
         self.file_menu_open_action.triggered.connect(self.load_model_or_scenario)
         self.file_menu_save_as_action.triggered.connect(self.save_as_model)
         self.file_menu_export_scenario_action.triggered.connect(self.save_as_scenario)
         self.file_menu_save_as_drawio.triggered.connect(self.save_as_drawio)
+        self.file_menu_import_defenses_action.triggered.connect(self.import_defenses)
+        self.file_menu_export_defenses_action.triggered.connect(self.export_defenses)
         self.file_menu_quit_action.triggered.connect(self.quitApp)
 
         self.edit_menu = menu_bar.addMenu("Edit")
@@ -443,8 +556,78 @@ class MainWindow(QMainWindow):
         self.edit_menu_paste_action = self.edit_menu.addAction(self.paste_action)
         self.edit_menu_delete_action = self.edit_menu.addAction(self.delete_action)
 
+        self.view_menu = menu_bar.addMenu("View")
+        self.view_menu_lod_action = self.view_menu.addAction(
+            "Simplify Items When Zoomed Out"
+        )
+        self.view_menu_lod_action.setCheckable(True)
+        self.view_menu_lod_action.setChecked(RENDER_SETTINGS.lod_enabled)
+        self.view_menu_lod_action.toggled.connect(self.level_of_detail_toggled)
+
+        self.view_menu_animations_action = self.view_menu.addAction(
+            "Animate Status Lights"
+        )
+        self.view_menu_animations_action.setCheckable(True)
+        self.view_menu_animations_action.setChecked(RENDER_SETTINGS.animations_enabled)
+        self.view_menu_animations_action.toggled.connect(self.animations_toggled)
+
+        self.layout_menu = menu_bar.addMenu("Layout")
+        self.layout_menu_selection_menu = self.layout_menu.addMenu("Layout Selection")
+        self.layout_menu_model_menu = self.layout_menu.addMenu("Layout Whole Model")
+        for strategy in LayoutStrategy:
+            self.layout_menu_selection_menu.addAction(strategy.value).triggered.connect(
+                lambda _=False, strategy=strategy: self.layout_selection(strategy)
+            )
+            self.layout_menu_model_menu.addAction(strategy.value).triggered.connect(
+                lambda _=False, strategy=strategy: self.layout_model(strategy)
+            )
+
         return menu_bar
 
+    def level_of_detail_toggled(self, checked):
+        """Turn level of detail rendering on/off and remember the choice"""
+        RENDER_SETTINGS.lod_enabled = checked
+        RENDER_SETTINGS.write_config()
+        self.scene.update()
+
+    def animations_toggled(self, checked):
+        """Turn status light animations on/off and remember the choice"""
+        RENDER_SETTINGS.animations_enabled = checked
+        RENDER_SETTINGS.write_config()
+        self.scene.update_animation_clock()
+
+    def layout_selection(self, strategy: LayoutStrategy):
+        """Lay out the selected assets"""
+        self.layout_assets(
+            [
+                item.asset.id
+                for item in self.scene.selectedItems()
+                if isinstance(item, AssetItem)
+            ],
+            strategy,
+        )
+
+    def layout_model(self, strategy: LayoutStrategy):
+        """Lay out all assets of the model"""
+        self.layout_assets(list(self.scene.model.assets), strategy)
+
+    def layout_assets(self, asset_ids: list[int], strategy: LayoutStrategy):
+        if self.scene.layout_worker is not None:
+            self.statusBar().showMessage("A layout is already being computed", 5000)
+            return
+        if len(asset_ids) >= WORKER_PROCESS_MIN_NODES:
+            self.statusBar().showMessage(
+                f"Computing {strategy.value.lower()} layout of {len(asset_ids)} assets.."
+            )
+        self.scene.layout_assets(asset_ids, strategy)
+
+    def layout_finished(self, completed):
+        """Called when a layout computed in the background is applied or failed"""
+        if completed:
+            self.statusBar().clearMessage()
+        else:
+            self.statusBar().showMessage("Computing the layout failed", 5000)
+
     def create_toolbar(self):
         """Create the toolbar and add to the GUI"""
 
@@ -563,40 +746,100 @@ class MainWindow(QMainWindow):
         )
 
         if open_project_user_confirmation == QMessageBox.Ok:
-            # clear scene so that canvas becomes blank
-            self.scene.clear()
+            start_time = time.perf_counter()
             try:
-                self.load_model(file_path)
-                print(f"Loaded model from {file_path}")
-            except ModelException:
-                self.load_scenario(file_path)
-                print(f"Loaded scenario from {file_path}")
+                # The file is parsed before the current scene is cleared,
+                # so a file that can not be loaded leaves the scene as it was
+                file_type = self.load_file(file_path)
+            except Exception as e:
+                self.show_error_popup(f"Could not load {file_path}: {e}")
+                return
+
+            load_time = time.perf_counter() - start_time
+            print(f"Loaded {file_type} from {file_path} in {load_time:.2f} s")
+            self.statusBar().showMessage(
+                f"Loaded {file_type} {os.path.basename(file_path)}"
+                f" in {load_time:.2f} s",
+                10000,
+            )
         else:
             print("User cancelled 'Load'")
             return
 
-    def load_scenario(self, file_path: str):
+    def load_file(self, file_path: str) -> str:
+        """Load a model or scenario file, returns what was loaded"""
+        if self.load_workspace_snapshot(file_path):
+            return "model snapshot"
+
+        # Parsed once, the content tells if it is a model or scenario
+        file_dict = read_dict_file(file_path)
+        if is_scenario_dict(file_dict):
+            self.load_scenario(file_path, file_dict)
+            return "scenario"
+        self.load_model(file_path, file_dict)
+        return "model"
+
+    def load_workspace_snapshot(self, file_path: str) -> bool:
+        """
+        Load a model from its workspace snapshot, False if
+        there is none that matches the file and language
+        """
+        snapshot = read_workspace_snapshot(
+            file_path, self.language_registry.language_key(self.lang_file_path)
+        )
+        if snapshot is None:
+            return False
+
+        self.load_scene(
+            self.lang_file_path, snapshot.create_model(self.scene.lang_graph), None
+        )
+        self.scenario_file_name = None
+        self.model_file_name = file_path
+        if self.scene.is_drawing_model():
+            # Attackers and containers need their assets drawn
+            self.pending_snapshot = snapshot
+        else:
+            snapshot.restore_scene_items(self.scene)
+        return True
+
+    def write_workspace_snapshot(self):
+        """Snapshot the model file shown for a faster reopen"""
+        if self.model_file_name and not self.scene.is_drawing_model():
+            write_workspace_snapshot(
+                self.scene,
+                self.model_file_name,
+                self.language_registry.language_key(self.lang_file_path),
+            )
+
+    def load_scenario(self, file_path: str, scenario_dict: Optional[dict] = None):
         """Load model and agents from a scenario"""
-        scenario = Scenario.load_from_file(file_path)
+        if scenario_dict is None:
+            scenario_dict = read_dict_file(file_path)
+        scenario = scenario_from_dict(scenario_dict, file_path, self.language_registry)
         # Reload in case language was changed
         self.load_scene(scenario._lang_file, scenario.model, scenario)
         self.scenario_file_name = file_path
-        self._lang_file = yaml.safe_load(open(file_path, "r"))["lang_file"]
+        # As written in the file, scenario._lang_file is an absolute path
+        self._lang_file = scenario_dict.get("lang_file", scenario._lang_file)
 
-    def load_model(self, file_path: str):
+    def load_model(self, file_path: str, model_dict: Optional[dict] = None):
         """Load a MAL model from a file"""
-
-        model = Model.load_from_file(file_path, self.scene.lang_graph)
+        if model_dict is None:
+            model_dict = read_dict_file(file_path)
+        model = model_from_dict(model_dict, self.scene.lang_graph)
         self.load_scene(self.lang_file_path, model, None)
         self.scenario_file_name = None
         self.model_file_name = file_path
+        self.write_workspace_snapshot()
 
     def add_positions_to_model(self):
         """Add x/y positions to asset extras of model"""
         for asset in self.scene.model.assets.values():
             print(f"ASSET NAME:{asset.name} ID:{asset.id} TYPE:{asset.type}")
-            item = self.scene._asset_id_to_item[int(asset.id)]
-            position = item.pos()
+            position = self.scene.asset_position(int(asset.id))
+            if position is None:
+                # Not drawn, drawing of the model was cancelled
+                continue
 
             extras_dict = asset.extras if asset.extras else {}
             extras_dict["position"] = {"x": position.x(), "y": position.y()}
@@ -607,6 +850,7 @@ class MainWindow(QMainWindow):
         if self.model_file_name:
             self.add_positions_to_model()
             self.scene.model.save_to_file(self.model_file_name)
+            self.write_workspace_snapshot()
         else:
             self.save_as_model()
 
@@ -631,6 +875,7 @@ class MainWindow(QMainWindow):
                 self.show_error_popup("Error saving model: " + str(e))
                 self.model_file_name = None
                 return
+            self.write_workspace_snapshot()
 
     def save_as_drawio(self):
         """`Save as`. Let user select target file and save .drawio file."""
@@ -746,6 +991,50 @@ class MainWindow(QMainWindow):
         message_box.setStandardButtons(QMessageBox.Ok)
         message_box.exec()
 
+    def import_defenses(self):
+        """Let user select a defense matrix and set the defenses in it"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            None, "Select defenses File", "", "CSV Files (*.csv)"
+        )
+
+        if not file_path:
+            print("No valid path detected for loading")
+            return
+        self.import_defense_matrix(file_path)
+
+    def import_defense_matrix(self, file_path: str) -> bool:
+        """
+        Set the defenses in a defense matrix as one undo command,
+        False if the file is invalid and nothing was set
+        """
+        try:
+            asset_names, defense_names, values = read_defense_matrix(file_path)
+            new_values = defense_matrix_changes(
+                self.scene.model, asset_names, defense_names, values
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error importing defenses: {e}")
+            self.show_error_popup("Error importing defenses: " + str(e))
+            return False
+        self.scene.set_defenses(new_values)
+        return True
+
+    def export_defenses(self):
+        """Let user select target file and save the defenses of all assets"""
+        file_dialog = QFileDialog()
+        file_dialog.setAcceptMode(QFileDialog.AcceptSave)
+        file_dialog.setDefaultSuffix(DEFENSE_MATRIX_SUFFIX)
+        file_path, _ = file_dialog.getSaveFileName()
+
+        if not file_path:
+            print("No valid path detected for saving")
+            return
+        try:
+            write_defense_matrix(file_path, self.scene.model)
+        except OSError as e:
+            print(f"Error exporting defenses: {e}")
+            self.show_error_popup("Error exporting defenses: " + str(e))
+
     def show_error_popup(self, message_text):
         """Show error popup with given message"""
         parent_widget = QWidget()  # To maintain object lifetim
@@ -758,25 +1047,12 @@ class MainWindow(QMainWindow):
 
     def update_explorer_docked_window(self):
         """
-        Clean the existing child and fill each items from scratch
-        TODO performance BAD - To be discussed/improved
+        Fill the object explorer with all assets of the model. Only
+        needed when a model is loaded, after that the explorer follows
+        the asset signals of the scene.
         """
-        self.object_explorer_tree.clear_all_object_explorer_child_items()
-
-        # Fill all the items from Scene one by one
-        for child_asset_item in self.scene.items():
-            if isinstance(child_asset_item, AssetItem):
-                # Check if parent exists before adding child
-                parent_item, parent_asset_type = (
-                    self.object_explorer_tree.check_and_get_if_parent_asset_type_exists(
-                        child_asset_item.asset_type
-                    )
-                )
-
-                if parent_asset_type:
-                    self.object_explorer_tree.add_child_item(
-                        parent_item, child_asset_item, str(child_asset_item.asset_name)
-                    )
+        self.object_explorer_tree.set_scene(self.scene)
+        self.object_explorer_tree.show_scene_assets()
 
     def on_theme_selection_change(self):
         """Set the selected theme"""
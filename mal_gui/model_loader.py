@@ -0,0 +1,141 @@
+"""
+Reading of model and scenario files. A file is parsed once, the parsed
+dict tells whether it is a model or a scenario and is handed on to
+maltoolbox/malsim, which otherwise read the file themselves.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+import yaml
+
+from maltoolbox.attackgraph import create_attack_graph
+from maltoolbox.exceptions import ModelException
+from maltoolbox.language import LanguageGraph
+from maltoolbox.model import Model
+from malsim.config.agent_settings import AttackerSettings, DefenderSettings
+from malsim.config.agent_settings_factories import agent_settings_from_dict
+from malsim.config.sim_settings import MalSimulatorSettings
+from malsim.scenario import Scenario
+
+try:
+    # Private malsim helpers, used to set up a scenario for an already
+    # loaded language the way Scenario.__init__ does it
+    from malsim.scenario.scenario import (
+        _validate_scenario_dict,
+        load_scenario_dict,
+        model_from_multiple_sources,
+    )
+except ImportError:
+    SCENARIO_INTERNALS_AVAILABLE = False
+else:
+    SCENARIO_INTERNALS_AVAILABLE = True
+
+if TYPE_CHECKING:
+    from .language_cache import LanguageRegistry
+
+# libyaml based loader if PyYAML was built with it, many times faster
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def read_dict_file(file_path: str) -> dict[str, Any]:
+    """Parse a json or yaml file"""
+    with open(file_path, encoding="utf-8") as file:
+        if file_path.endswith(".json"):
+            file_dict = json.load(file)
+        else:
+            file_dict = yaml.load(file, Loader=YAML_LOADER)
+
+    if not isinstance(file_dict, dict):
+        raise ValueError(f"{file_path} is not a model or scenario file")
+    return file_dict
+
+
+def is_scenario_dict(file_dict: dict[str, Any]) -> bool:
+    """Scenarios name their language, models don't"""
+    return "lang_file" in file_dict or "extends" in file_dict
+
+
+def model_from_dict(model_dict: dict[str, Any], lang_graph: LanguageGraph) -> Model:
+    """Create a model from a parsed model file"""
+    try:
+        return Model._from_dict(model_dict, lang_graph)
+    except Exception as e:
+        # Same as Model.load_from_file
+        raise ModelException(
+            "Could not load model. It might be of an older version. "
+            "Try to upgrade it with 'maltoolbox upgrade-model'"
+        ) from e
+
+
+def scenario_from_dict(
+    scenario_dict: dict[str, Any],
+    file_path: str,
+    language_registry: LanguageRegistry,
+) -> Scenario:
+    """
+    Create a scenario from a parsed scenario file at `file_path`,
+    paths in it are relative to the file like in Scenario.load_from_file.
+    The language is taken from `language_registry`, so a language that
+    is already loaded is not compiled again.
+    """
+    if not SCENARIO_INTERNALS_AVAILABLE:
+        # A malsim version without them compiles the language itself
+        return Scenario.load_from_file(file_path)
+
+    if "extends" in scenario_dict:
+        # Merged with the scenario it extends, paths are made absolute
+        scenario_dict = dict(load_scenario_dict(file_path))
+    else:
+        scenario_dict = dict(scenario_dict)
+        file_dir_path = os.path.dirname(os.path.realpath(file_path))
+        if not scenario_dict["lang_file"].startswith("git@"):
+            scenario_dict["lang_file"] = os.path.join(
+                file_dir_path, scenario_dict["lang_file"]
+            )
+        if "model_file" in scenario_dict:
+            scenario_dict["model_file"] = os.path.join(
+                file_dir_path, scenario_dict["model_file"]
+            )
+
+    lang_graph = language_registry.get_language_graph(scenario_dict["lang_file"])
+    return scenario_with_language(scenario_dict, lang_graph)
+
+
+def scenario_with_language(
+    scenario_dict: dict[str, Any], lang_graph: LanguageGraph
+) -> Scenario:
+    """
+    Same as Scenario.from_dict, but for an already loaded language.
+    Scenario.__init__ always compiles the language file of the scenario,
+    so the scenario is set up here the way it would set itself up.
+    """
+    _validate_scenario_dict(scenario_dict)
+    agents = [
+        agent_settings_from_dict(name, agent_settings_dict)
+        for name, agent_settings_dict in scenario_dict["agents"].items()
+        if agent_settings_dict is not None
+    ]
+    model_or_model_file = scenario_dict.get("model") or scenario_dict["model_file"]
+    sim_settings = scenario_dict.get("sim_settings", {})
+    if not isinstance(sim_settings, MalSimulatorSettings):
+        sim_settings = MalSimulatorSettings(**sim_settings)
+
+    scenario = Scenario.__new__(Scenario)
+    scenario._lang_file = scenario_dict["lang_file"]
+    scenario.lang_graph = lang_graph
+    scenario.model = model_from_multiple_sources(model_or_model_file, lang_graph)
+    scenario._model_file = (
+        model_or_model_file if isinstance(model_or_model_file, str) else None
+    )
+    scenario.attack_graph = create_attack_graph(lang_graph, scenario.model)
+    scenario.agent_settings = [
+        agent.convert_to_attack_graph_nodes(scenario.attack_graph)
+        for agent in agents
+        if isinstance(agent, AttackerSettings)
+    ] + [agent for agent in agents if isinstance(agent, DefenderSettings)]
+    scenario.sim_settings = sim_settings
+    return scenario
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import pickle
 import base64
+import time
 from typing import TYPE_CHECKING, Optional
 
+import numpy as np
+import shiboken6
 from PySide6.QtWidgets import (
     QGraphicsScene,
     QMenu,
@@ -11,12 +14,11 @@ from PySide6.QtWidgets import (
     QGraphicsLineItem,
     QDialog,
     QGraphicsRectItem,
-    QGraphicsTextItem,
 )
-from PySide6.QtGui import QTransform, QAction, QUndoStack, QPen
-from PySide6.QtCore import QLineF, Qt, QPointF, QRectF
+from PySide6.QtGui import QTransform, QAction, QUndoStack, QPen, QColor
+from PySide6.QtCore import QLineF, Qt, QPointF, QRectF, QTimer, Signal
 
-from maltoolbox.model import Model
+from maltoolbox.model import Model, ModelAsset
 from malsim.config.agent_settings import AttackerSettings
 
 from mal_gui.undo_redo_commands.create_goal_connection_command import (
@@ -36,6 +38,16 @@ from .connection_dialog import (
 )
 from .object_explorer import AssetItem, AttackerItem, EditableTextItem, ItemBase
 from .assets_container import AssetsContainer, AssetsContainerRectangleBox
+from .layout import (
+    LAYER_SPACING,
+    WORKER_PROCESS_MIN_NODES,
+    LayoutStrategy,
+    LayoutWorker,
+    compute_layout,
+    layered_layout,
+)
+from .render_settings import RENDER_SETTINGS
+from .spatial_index import AssetSpatialIndex
 
 from .undo_redo_commands import (
     CutCommand,
@@ -49,6 +61,8 @@ from .undo_redo_commands import (
     CreateEntrypointConnectionCommand,
     DeleteConnectionCommand,
     ContainerizeAssetsCommand,
+    LayoutCommand,
+    SetDefenseCommand,
 )
 
 if TYPE_CHECKING:
@@ -59,7 +73,59 @@ if TYPE_CHECKING:
     from malsim.scenario import Scenario
 
 
+def referenced_asset_ids(values) -> set[int]:
+    """
+    Ids of the assets whose items are in `values`, also
+    in collections and at the ends of connections
+    """
+    asset_ids = set()
+    for value in values:
+        if isinstance(value, AssetItem):
+            asset_ids.add(value.asset.id)
+        elif isinstance(value, AssociationConnectionItem):
+            asset_ids |= referenced_asset_ids([value.start_item, value.end_item])
+        elif isinstance(value, AttackerConnectionBase):
+            asset_ids.add(value.asset_item.asset.id)
+        elif isinstance(value, dict):
+            asset_ids |= referenced_asset_ids(value.keys())
+            asset_ids |= referenced_asset_ids(value.values())
+        elif isinstance(value, (list, tuple, set)):
+            asset_ids |= referenced_asset_ids(value)
+    return asset_ids
+
+
 class ModelScene(QGraphicsScene):
+    # Blink interval of attacker status lights in milliseconds
+    ANIMATION_INTERVAL = 500
+
+    # Models with at least this many assets are drawn progressively
+    PROGRESSIVE_DRAW_MIN_ASSETS = 2000
+    # Time in milliseconds spent drawing before returning to the event loop
+    DRAW_TIME_SLICE = 30
+
+    # Models with at least this many assets only get items near the view
+    VIRTUALIZE_MIN_ASSETS = 20000
+    # Distance around the visible area (scene units) that also gets items
+    VIRTUAL_MARGIN = 500
+    # With more assets than this in view they are painted as plain rects
+    VIRTUAL_MAX_ITEMS = 2000
+    # Number of unused asset items kept for reuse
+    VIRTUAL_POOL_SIZE = 500
+    # Milliseconds a selection has to stay before the side panels show it
+    DETAILS_DELAY = 50
+
+    # Steps done and total number of steps of a progressive draw
+    draw_progress = Signal(int, int)
+    # Emitted when progressive drawing ends, False if it was cancelled
+    draw_finished = Signal(bool)
+    # Emitted when a layout computed in the background ends, False if it failed
+    layout_finished = Signal(bool)
+    # Emitted with the ModelAsset when an asset is added to or removed from
+    # the model, or renamed, so views of the model only update that asset
+    asset_added = Signal(object)
+    asset_removed = Signal(object)
+    asset_renamed = Signal(object)
+
     def __init__(
         self,
         asset_factory: AssetFactory,
@@ -67,6 +133,8 @@ class ModelScene(QGraphicsScene):
         model: Model,
         main_window: MainWindow,
         scenario: Optional[Scenario] = None,
+        draw_progressively: bool = False,
+        virtualized: bool = False,
     ):
         super().__init__()
 
@@ -80,7 +148,17 @@ class ModelScene(QGraphicsScene):
         self.clipboard = QApplication.clipboard()
 
         self._asset_id_to_item = {}
+        # Assets hidden in the object explorer, also ones without items
+        self.hidden_asset_ids: set[int] = set()
         self.attacker_items: list[AttackerItem] = []
+        # Items by type, so bulk updates don't have to filter self.items().
+        # Kept up to date by addItem, removeItem and clear.
+        self.association_items: set[AssociationConnectionItem] = set()
+        self.entrypoint_items: set[EntrypointConnectionItem] = set()
+        self.goal_items: set[GoalConnectionItem] = set()
+        self.container_items: set[AssetsContainer] = set()
+        # Associations without field name labels, created when first shown
+        self.unlabeled_associations: set[AssociationConnectionItem] = set()
 
         self.copied_item = None
         self.cut_item_flag = False
@@ -96,15 +174,151 @@ class ModelScene(QGraphicsScene):
         self.dragged_items = []
         self.initial_positions = {}
 
+        # Connections of moved items, redrawn once per frame
+        self.dirty_connections: set[IConnectionItem] = set()
+        self.connection_flush_timer = QTimer(self)
+        self.connection_flush_timer.setSingleShot(True)
+        self.connection_flush_timer.timeout.connect(self.flush_dirty_connections)
+
         # Selection rectangle
         self.selection_rect = None
         self.origin = QPointF()
 
-        # Misc
+        # The side panels follow the selection, changes are coalesced
+        # and panels are only rebuilt if other items are selected
+        self.details_items = []
+        self.details_timer = QTimer(self)
+        self.details_timer.setSingleShot(True)
+        self.details_timer.setInterval(self.DETAILS_DELAY)
+        self.details_timer.timeout.connect(self.show_items_details)
+        self.selectionChanged.connect(self.details_timer.start)
+        # The selected items themselves may have changed
+        self.undo_stack.indexChanged.connect(self.refresh_items_details)
+        self.asset_renamed.connect(self.refresh_items_details)
+
+        # Render flags read by the items when they are painted,
+        # so toggling them only needs a repaint
         self.show_association_checkbox_status = False
+        self.show_icons = True
+
+        # Inline editor of the name being edited, one at a time
+        self.name_editor: Optional[EditableTextItem] = None
+
+        # Misc
         self.container_box = None
 
-        self.draw_model()
+        # One clock for all status light animations in the scene
+        self.status_light_on = True
+        self.animation_timer = QTimer(self)
+        self.animation_timer.setInterval(self.ANIMATION_INTERVAL)
+        self.animation_timer.timeout.connect(self.advance_animations)
+        QApplication.instance().applicationStateChanged.connect(
+            self.update_animation_clock
+        )
+
+        # In virtualized mode only assets near the visible area have items,
+        # the positions of all assets are kept in the index
+        self.virtual_index: Optional[AssetSpatialIndex] = (
+            AssetSpatialIndex() if virtualized else None
+        )
+        # Assets that keep their items, e.g. ones referenced by undo commands
+        self.pinned_asset_ids: set[int] = set()
+        self.asset_item_pool: list[AssetItem] = []
+        # Attacker connections of assets without items, as
+        # (add connection method, attack step name, attacker item)
+        self.released_attacker_connections: dict[int, list[tuple]] = {}
+        # Set when too many assets are in view to create items for them
+        self.virtual_overview = False
+        if virtualized:
+            self.selectionChanged.connect(self.update_pinned_assets)
+            # Commands are pushed and dropped
+            self.undo_stack.indexChanged.connect(self.update_pinned_assets)
+
+        # Progressive drawing of the model
+        self.draw_steps = None
+        self.draw_steps_done = 0
+        self.draw_steps_total = 0
+        self.draw_timer = QTimer(self)
+        self.draw_timer.timeout.connect(self.draw_next_batch)
+
+        # Layout computed in the background and the assets it is for
+        self.layout_worker: Optional[LayoutWorker] = None
+        self.layout_asset_ids: list[int] = []
+
+        if draw_progressively:
+            self.start_drawing_model()
+        else:
+            self.draw_model()
+        self.update_animation_clock()
+
+    # ------------------------------------------------------------------
+    # Connection updates
+    # ------------------------------------------------------------------
+
+    def mark_connections_dirty(self, connections: list[IConnectionItem]):
+        """
+        Schedule `connections` to be redrawn. All connections marked before
+        the event loop runs again are updated once, so an edge between two
+        moved items is not recomputed twice.
+        """
+        self.dirty_connections.update(connections)
+        if not self.connection_flush_timer.isActive():
+            self.connection_flush_timer.start(0)
+
+    def flush_dirty_connections(self):
+        """Update the paths of all connections marked dirty"""
+        self.connection_flush_timer.stop()
+        dirty_connections = self.dirty_connections
+        self.dirty_connections = set()
+        for connection in dirty_connections:
+            # Connections may have been deleted since they were marked
+            if connection.scene() is self:
+                connection.update_path()
+
+    # ------------------------------------------------------------------
+    # Animations
+    # ------------------------------------------------------------------
+
+    def update_animation_clock(self, *_):
+        """
+        Run the animation clock only if animations are enabled
+        and the application is active, otherwise show steady lights
+        """
+        application_active = (
+            QApplication.applicationState() == Qt.ApplicationState.ApplicationActive
+        )
+        if RENDER_SETTINGS.animations_enabled and application_active:
+            if not self.animation_timer.isActive():
+                self.animation_timer.start()
+        else:
+            self.animation_timer.stop()
+            if not RENDER_SETTINGS.animations_enabled:
+                self.status_light_on = True
+                for attacker_item in self.attacker_items:
+                    attacker_item.set_status_light(True)
+
+    def visible_scene_rects(self) -> list[QRectF]:
+        """The parts of the scene shown in views that are not hidden"""
+        return [
+            view.mapToScene(view.viewport().rect()).boundingRect()
+            for view in self.views()
+            if view.isVisible() and not view.window().isMinimized()
+        ]
+
+    def advance_animations(self):
+        """Blink the status lights of the attackers visible in a view"""
+        self.status_light_on = not self.status_light_on
+
+        visible_rects = self.visible_scene_rects()
+        if not visible_rects:
+            return
+
+        for attacker_item in self.attacker_items:
+            if attacker_item.scene() is not self:
+                continue
+            item_rect = attacker_item.sceneBoundingRect()
+            if any(rect.intersects(item_rect) for rect in visible_rects):
+                attacker_item.set_status_light(self.status_light_on)
 
     # ------------------------------------------------------------------
     # Drag & drop
@@ -167,7 +381,6 @@ class ModelScene(QGraphicsScene):
         elif self._is_right(event):
             self._handle_right_press(clicked_item)
 
-        self.show_items_details()
         super().mousePressEvent(event)
 
     def _start_connection(self, event, item):
@@ -255,7 +468,6 @@ class ModelScene(QGraphicsScene):
         elif self._is_left(event):
             self._finalize_drag_or_selection()
 
-        self.show_items_details()
         super().mouseReleaseEvent(event)
 
     def _finalize_drag_or_selection(self):
@@ -313,6 +525,10 @@ class ModelScene(QGraphicsScene):
         self._reset_connection_state()
 
     def _create_asset_connection(self):
+        # Kept while the dialog is open, afterwards by the undo command
+        self.pinned_asset_ids.add(self.start_item.asset.id)
+        self.pinned_asset_ids.add(self.end_item.asset.id)
+
         dialog = AssociationConnectionDialog(
             self.start_item,
             self.end_item,
@@ -436,17 +652,6 @@ class ModelScene(QGraphicsScene):
                 print("Found Connection Item", item)
                 self.show_connection_item_context_menu(event.screenPos(), item)
 
-            elif isinstance(item, (QGraphicsTextItem)):
-                # Let user right click text box belonging to assoc/entrypoint item
-                print("Found text box", item)
-                item = item.parentItem()
-                item = item.parentItem() if item else None
-                if isinstance(
-                    item, (AssociationConnectionItem, AttackerConnectionBase)
-                ):
-                    print("Found parent of text box, a connection item")
-                    self.show_connection_item_context_menu(event.screenPos(), item)
-
             elif isinstance(item, AssetsContainer):
                 print("Found Assets Container item", item)
                 self.show_assets_container_context_menu(event.screenPos(), item)
@@ -460,24 +665,114 @@ class ModelScene(QGraphicsScene):
     def assign_position_to_assets_without_positions(
         self, assets_without_position, x_max, y_max
     ):
-        """Assign position to assets that don't have any"""
-
-        distance_between_two_assets_vertically = 200
+        """Lay out assets that don't have a position next to the others"""
+        positions = self.unpositioned_asset_layout(
+            [item.asset for item in assets_without_position], x_max, y_max
+        )
+        for item, (x_pos, y_pos) in zip(assets_without_position, positions):
+            item.setPos(QPointF(x_pos, y_pos))
 
-        for i, asset in enumerate(assets_without_position):
-            x_pos = x_max
-            y_pos = y_max + (i * distance_between_two_assets_vertically)
-            print("In x_pos= " + str(x_pos))
-            print("In y_pos= " + str(y_pos))
-            asset.setPos(QPointF(x_pos, y_pos))
+    def unpositioned_asset_layout(self, assets, x_max, y_max) -> np.ndarray:
+        """
+        Positions for assets without one, laid out in layers by their
+        associations below the positioned assets (which end at x_max, y_max)
+        """
+        positions = layered_layout(len(assets), self.association_edges(assets))
+        positions[:, 0] += x_max
+        positions[:, 1] += y_max
+        if len(assets) < len(self.model.assets):
+            positions[:, 1] += LAYER_SPACING
+        return positions
 
     def draw_model(self):
         """Draw all assets in the model"""
+        for _ in self.draw_model_steps():
+            pass
+
+    def start_drawing_model(self):
+        """
+        Draw the model in batches from the event loop so the view can be
+        used while items are added. Progress is reported by `draw_progress`
+        and the end by `draw_finished`.
+        """
+        self.draw_steps = self.draw_model_steps()
+        self.draw_steps_done = 0
+        self.draw_steps_total = 2 * len(self.model.assets)
+        if self.scenario:
+            self.draw_steps_total += len(self.scenario.agent_settings)
+        self.draw_timer.start(0)
+
+    def is_drawing_model(self) -> bool:
+        """True while a progressive draw is running"""
+        return self.draw_steps is not None
+
+    def draw_next_batch(self):
+        """Draw items until the time slice is used up"""
+        deadline = time.perf_counter() + self.DRAW_TIME_SLICE / 1000
+        try:
+            while time.perf_counter() < deadline:
+                next(self.draw_steps)
+                self.draw_steps_done += 1
+        except StopIteration:
+            self.stop_drawing_model()
+            self.draw_progress.emit(self.draw_steps_total, self.draw_steps_total)
+            self.draw_finished.emit(True)
+            return
+        except Exception as e:
+            # Called from the event loop, nobody else would see the error
+            print(f"Error drawing model: {e}")
+            self.stop_drawing_model()
+            self.draw_finished.emit(False)
+            return
+
+        self.draw_progress.emit(self.draw_steps_done, self.draw_steps_total)
+
+    def stop_drawing_model(self):
+        """Stop a progressive draw, items drawn so far are kept"""
+        self.draw_timer.stop()
+        self.draw_steps = None
+
+    def cancel_drawing_model(self):
+        """Stop a progressive draw on user request"""
+        if self.is_drawing_model():
+            self.stop_drawing_model()
+            self.draw_finished.emit(False)
+
+    def draw_model_steps(self):
+        """
+        Generator drawing the model, yields after each asset and after
+        the associations of each asset and each attacker. Assets are all
+        drawn before any connection so connections always have endpoints.
+        """
+        if self.virtual_index is not None:
+            # Items are created when the view shows them
+            self.build_virtual_index()
+        else:
+            yield from self.draw_assets_steps()
+        yield from self.draw_attackers_steps()
+
+    def draw_assets_steps(self):
+        """Generator drawing the assets of the model and their associations"""
+        # The model can be edited while it is drawn progressively. Only what
+        # it held when drawing started is drawn here, edits add their items.
+        assets = list(self.model.assets.values())
+        associations = [
+            [
+                (fieldname, list(associated_assets))
+                for fieldname, associated_assets in asset.associated_assets.items()
+            ]
+            for asset in assets
+        ]
 
         assets_without_position = []
         x_max = 0
         y_max = 0
-        for asset in self.model.assets.values():
+        for asset in assets:
+            if asset.id not in self.model.assets:
+                # Removed before it was drawn
+                yield
+                continue
+
             if "position" in asset.extras:
                 pos = QPointF(
                     asset.extras["position"]["x"], asset.extras["position"]["y"]
@@ -503,23 +798,38 @@ class ModelScene(QGraphicsScene):
             if "position" not in asset.extras:
                 assets_without_position.append(new_item)
 
+            yield
+
         self.assign_position_to_assets_without_positions(
             assets_without_position, x_max, y_max
         )
 
-        # Draw associations between assets
-        for asset in self.model.assets.values():
-            for fieldname, assets in asset.associated_assets.items():
-                for associated_asset in assets:
-                    self.add_association_connection(
-                        self._asset_id_to_item[asset.id],
-                        self._asset_id_to_item[associated_asset.id],
-                        fieldname,
+        # Draw associations between assets. The model stores each association
+        # from both ends, so only draw it from the first end seen.
+        drawn_associations = set()
+        for asset, asset_associations in zip(assets, associations):
+            for fieldname, associated_assets in asset_associations:
+                for associated_asset in associated_assets:
+                    association_key = self.association_key(
+                        asset, fieldname, associated_asset
                     )
+                    if association_key in drawn_associations:
+                        continue
+                    drawn_associations.add(association_key)
+
+                    # Either end may have been removed while drawing
+                    start_item = self._asset_id_to_item.get(asset.id)
+                    end_item = self._asset_id_to_item.get(associated_asset.id)
+                    if start_item is None or end_item is None:
+                        continue
+                    self.add_association_connection(start_item, end_item, fieldname)
 
-        # Draw attackers if they exists in scenario
+            yield
+
+    def draw_attackers_steps(self):
+        """Generator drawing the attackers of the scenario"""
         if self.scenario:
-            agents = self.scenario.agent_settings
+            agents = list(self.scenario.agent_settings)
             for agent_setting in agents:
                 if isinstance(agent_setting, AttackerSettings):
                     if isinstance(agent_setting.entry_points, (tuple)):
@@ -547,10 +857,10 @@ class ModelScene(QGraphicsScene):
                         asset_name = entrypoint_full_name.removesuffix(
                             ":" + attack_step
                         )
-                        asset = self.model.get_asset_by_name(asset_name)
-                        assert asset, "Asset does not exist"
+                        asset_item = self.asset_item_by_name(asset_name)
+                        assert asset_item, "Asset does not exist"
                         self.add_entrypoint_connection(
-                            attack_step, attacker_item, self._asset_id_to_item[asset.id]
+                            attack_step, attacker_item, asset_item
                         )
 
                     for goal in agent_setting.goals:
@@ -559,11 +869,465 @@ class ModelScene(QGraphicsScene):
                         )
                         attack_step = goal_full_name.split(":")[-1]
                         asset_name = goal_full_name.removesuffix(":" + attack_step)
-                        asset = self.model.get_asset_by_name(asset_name)
-                        assert asset, "Asset does not exist"
-                        self.add_goal_connection(
-                            attack_step, attacker_item, self._asset_id_to_item[asset.id]
-                        )
+                        asset_item = self.asset_item_by_name(asset_name)
+                        assert asset_item, "Asset does not exist"
+                        self.add_goal_connection(attack_step, attacker_item, asset_item)
+
+                yield
+
+    @staticmethod
+    def association_key(asset, fieldname, associated_asset) -> frozenset:
+        """
+        Identifies an association independent of which end it is seen from,
+        the model stores each association from both of its ends
+        """
+        opposite_fieldname = asset.lg_asset.associations[
+            fieldname
+        ].get_opposite_fieldname(fieldname)
+        return frozenset(
+            ((asset.id, opposite_fieldname), (associated_asset.id, fieldname))
+        )
+
+    @property
+    def asset_items(self):
+        """Items of the assets, also cut and containerized ones"""
+        return self._asset_id_to_item.values()
+
+    def item_registry(self, item) -> Optional[set]:
+        """Registry that `item` is kept in, None if it has none"""
+        if isinstance(item, AssociationConnectionItem):
+            return self.association_items
+        if isinstance(item, EntrypointConnectionItem):
+            return self.entrypoint_items
+        if isinstance(item, GoalConnectionItem):
+            return self.goal_items
+        if isinstance(item, AssetsContainer):
+            return self.container_items
+        return None
+
+    def addItem(self, item):
+        """Overrides base method, registers the item by type"""
+        super().addItem(item)
+        registry = self.item_registry(item)
+        if registry is not None:
+            registry.add(item)
+
+    def removeItem(self, item):
+        """Overrides base method, unregisters the item"""
+        editor = self.name_editor
+        if editor is not None and item in (editor, editor.parentItem()):
+            self.reset_name_edit()
+        super().removeItem(item)
+        registry = self.item_registry(item)
+        if registry is not None:
+            registry.discard(item)
+        self.unlabeled_associations.discard(item)
+
+    def clear(self):
+        """
+        Overrides base method, empties the registries and lookups.
+        The items are deleted, so nothing may refer to them afterwards.
+        """
+        # The editor is deleted with the items, the name is kept
+        self.reset_name_edit()
+        # Marked connections are deleted with the items
+        self.connection_flush_timer.stop()
+        self.dirty_connections.clear()
+        super().clear()
+        self.association_items.clear()
+        self.entrypoint_items.clear()
+        self.goal_items.clear()
+        self.container_items.clear()
+        self.unlabeled_associations.clear()
+
+        self._asset_id_to_item.clear()
+        self.hidden_asset_ids.clear()
+        self.attacker_items.clear()
+        self.pinned_asset_ids.clear()
+        self.released_attacker_connections.clear()
+        if self.virtual_index is not None:
+            self.virtual_index = AssetSpatialIndex()
+        self.details_items = []
+        # Commands refer to the deleted items
+        self.undo_stack.clear()
+
+    def finish_name_edit(self):
+        """Use the name that is being edited, if any"""
+        editor = self.name_editor
+        self.name_editor = None
+        # The editor may have been deleted with its item
+        if editor is not None and shiboken6.isValid(editor):
+            editor.finish()
+
+    def reset_name_edit(self):
+        """Stop editing a name and keep the name it had"""
+        editor = self.name_editor
+        self.name_editor = None
+        if editor is not None and shiboken6.isValid(editor):
+            editor.cancel()
+
+    def set_asset_visible(self, asset: ModelAsset, visible: bool):
+        """Show or hide an asset, kept if its item is recycled"""
+        if visible:
+            self.hidden_asset_ids.discard(asset.id)
+        else:
+            self.hidden_asset_ids.add(asset.id)
+        asset_item = self._asset_id_to_item.get(asset.id)
+        if asset_item is not None:
+            self.update_item_visibility(asset_item)
+
+    def update_item_visibility(self, asset_item: AssetItem):
+        visible = asset_item.asset.id not in self.hidden_asset_ids
+        # Connections are hidden and unhidden with the asset item
+        for connection in asset_item.connections:
+            connection.setVisible(visible)
+        asset_item.setVisible(visible)
+
+    def asset_item(self, asset) -> AssetItem:
+        """Item showing `asset`, created if the scene is virtualized"""
+        if self.virtual_index is not None and asset.id not in self._asset_id_to_item:
+            self.materialize_asset(asset.id)
+        return self._asset_id_to_item[asset.id]
+
+    def asset_item_by_name(self, asset_name: str) -> Optional[AssetItem]:
+        """Item showing the asset named `asset_name`, None if there is none"""
+        asset = self.model.get_asset_by_name(asset_name)
+        return self.asset_item(asset) if asset else None
+
+    def rename_asset(self, asset: ModelAsset, new_name: str) -> bool:
+        """
+        Rename an asset and keep lookups by name and the entrypoints and
+        goals referring to it up to date. Returns False if the name is taken.
+        """
+        if new_name == asset.name:
+            return True
+        if self.model.get_asset_by_name(new_name) is not None:
+            print(f"Can not rename {asset.name}, name {new_name} is already in use")
+            return False
+
+        # The model has no rename, so its name lookup is updated here
+        old_name = asset.name
+        del self.model._name_to_asset[old_name]
+        self.model._name_to_asset[new_name] = asset
+        asset.name = new_name
+
+        # Entrypoints and goals of attackers are stored as 'asset:step'
+        asset_item = self._asset_id_to_item.get(asset.id)
+        for connection in asset_item.connections if asset_item else []:
+            if isinstance(connection, EntrypointConnectionItem):
+                attack_steps = connection.attacker_item.entry_points
+            elif isinstance(connection, GoalConnectionItem):
+                attack_steps = connection.attacker_item.goals
+            else:
+                continue
+            old_full_name = old_name + ":" + connection.attack_step_name
+            if old_full_name in attack_steps:
+                attack_steps[attack_steps.index(old_full_name)] = (
+                    new_name + ":" + connection.attack_step_name
+                )
+        self.asset_renamed.emit(asset)
+        return True
+
+    def asset_position(self, asset_id) -> Optional[QPointF]:
+        """Position of an asset, also for assets without items"""
+        item = self._asset_id_to_item.get(asset_id)
+        if item is not None:
+            return item.pos()
+        if self.virtual_index is not None and asset_id in self.virtual_index:
+            return QPointF(*self.virtual_index.position(asset_id))
+        return None
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def association_edges(assets: list[ModelAsset]) -> np.ndarray:
+        """Associations between `assets` as (E, 2) indices into `assets`"""
+        index_of_asset = {asset.id: i for i, asset in enumerate(assets)}
+        edges = set()
+        for i, asset in enumerate(assets):
+            for associated_assets in asset.associated_assets.values():
+                for associated_asset in associated_assets:
+                    j = index_of_asset.get(associated_asset.id)
+                    if j is not None and i < j:
+                        edges.add((i, j))
+        return np.array(sorted(edges), dtype=np.int64).reshape(-1, 2)
+
+    def layout_assets(self, asset_ids: list[int], strategy: LayoutStrategy):
+        """
+        Move the assets to positions computed by `strategy`, as one undo
+        command. Large layouts are computed in the background and applied
+        when `layout_finished` is emitted.
+        """
+        if not asset_ids or self.layout_worker is not None:
+            return
+
+        assets = [self.model.assets[asset_id] for asset_id in asset_ids]
+        edges = self.association_edges(assets)
+        if len(assets) < WORKER_PROCESS_MIN_NODES:
+            self.apply_layout(asset_ids, compute_layout(strategy, len(assets), edges))
+            return
+
+        self.layout_asset_ids = asset_ids
+        # Owned by the application so it can finish if the scene is closed
+        self.layout_worker = LayoutWorker(
+            strategy, len(assets), edges, QApplication.instance()
+        )
+        self.layout_worker.finished.connect(self.layout_worker.deleteLater)
+        self.layout_worker.computed.connect(self.layout_computed)
+        self.layout_worker.failed.connect(self.layout_failed)
+        self.layout_worker.start()
+
+    def layout_computed(self, positions: np.ndarray):
+        """A layout computed in the background is ready"""
+        self.apply_layout(self.layout_asset_ids, positions)
+        self.layout_worker = None
+        self.layout_finished.emit(True)
+
+    def layout_failed(self, error: str):
+        print(f"Layout failed: {error}")
+        self.layout_worker = None
+        self.layout_finished.emit(False)
+
+    def apply_layout(self, asset_ids: list[int], positions: np.ndarray):
+        """
+        Push a command moving the assets to the layout positions,
+        placed where the top left of the assets was before
+        """
+        start_positions = {}
+        for asset_id in asset_ids:
+            position = self.asset_position(asset_id)
+            if position is not None:  # Removed while computing the layout
+                start_positions[asset_id] = position
+        if not start_positions:
+            return
+
+        left = min(position.x() for position in start_positions.values())
+        top = min(position.y() for position in start_positions.values())
+        end_positions = {
+            asset_id: QPointF(left + x, top + y)
+            for asset_id, (x, y) in zip(asset_ids, positions)
+            if asset_id in start_positions
+        }
+        self.undo_stack.push(LayoutCommand(self, start_positions, end_positions))
+
+    def set_asset_positions(self, positions: dict[int, QPointF]):
+        """Move assets, also those without items"""
+        for asset_id, position in positions.items():
+            item = self._asset_id_to_item.get(asset_id)
+            if item is not None:
+                item.setPos(position)
+            if self.virtual_index is not None and asset_id in self.virtual_index:
+                self.virtual_index.move(asset_id, position.x(), position.y())
+
+        if self.virtual_index is not None:
+            self.update_virtual_scene_rect()
+            for view in self.views():
+                view.schedule_visible_rect_changed()
+
+    # ------------------------------------------------------------------
+    # Virtualized mode
+    # ------------------------------------------------------------------
+
+    def build_virtual_index(self):
+        """Store the positions of all assets instead of creating items"""
+        assets_without_position = []
+        x_max = 0
+        y_max = 0
+        for asset in self.model.assets.values():
+            if "position" in asset.extras:
+                x = asset.extras["position"]["x"]
+                y = asset.extras["position"]["y"]
+                self.virtual_index.add(asset.id, x, y)
+                x_max = max(x_max, x)
+                y_max = max(y_max, y)
+            else:
+                assets_without_position.append(asset)
+
+        positions = self.unpositioned_asset_layout(
+            assets_without_position, x_max, y_max
+        )
+        for asset, (x, y) in zip(assets_without_position, positions):
+            self.virtual_index.add(asset.id, x, y)
+
+        self.update_virtual_scene_rect()
+
+    def update_virtual_scene_rect(self):
+        """Let the scene cover all assets, also those without items"""
+        bounds = self.virtual_index.bounds()
+        if bounds is None:
+            return
+        left, top, right, bottom = bounds
+        margin = self.VIRTUAL_MARGIN
+        rect = QRectF(left, top, right - left, bottom - top).adjusted(
+            -margin, -margin, margin, margin
+        )
+        self.setSceneRect(rect.united(self.itemsBoundingRect()))
+
+    def update_virtual_items(self, visible_rect: QRectF):
+        """
+        Create items for the assets in (or near) `visible_rect` and
+        recycle the items of assets that moved out of it
+        """
+        if self.virtual_index is None:
+            return
+
+        # Items may have been moved by the user
+        for asset_id, item in self._asset_id_to_item.items():
+            self.virtual_index.move(asset_id, item.pos().x(), item.pos().y())
+
+        margin = self.VIRTUAL_MARGIN
+        area = visible_rect.adjusted(-margin, -margin, margin, margin)
+        wanted_asset_ids = set(
+            self.virtual_index.query(
+                area.left(), area.top(), area.right(), area.bottom()
+            )
+        )
+        self.virtual_overview = len(wanted_asset_ids) > self.VIRTUAL_MAX_ITEMS
+        if self.virtual_overview:
+            wanted_asset_ids = set()
+
+        for asset_id in list(self._asset_id_to_item):
+            if (
+                asset_id not in wanted_asset_ids
+                and asset_id not in self.pinned_asset_ids
+            ):
+                self.release_asset_item(asset_id)
+
+        for asset_id in wanted_asset_ids:
+            if asset_id not in self._asset_id_to_item:
+                self.materialize_asset(asset_id)
+
+        self.update_virtual_scene_rect()
+        self.update()
+
+    def materialize_asset(self, asset_id) -> AssetItem:
+        """Create (or reuse) the item of an asset and connect it"""
+        asset = self.model.assets[asset_id]
+        pos = QPointF(*self.virtual_index.position(asset_id))
+        if self.asset_item_pool:
+            item = self.asset_factory.recycle_asset_item(
+                self.asset_item_pool.pop(), asset, pos
+            )
+        else:
+            item = self.asset_factory.create_asset_item(asset, pos)
+        self._asset_id_to_item[asset_id] = item
+        self.addItem(item)
+
+        # Associations to assets without items are painted in the background
+        connected = set()
+        for fieldname, associated_assets in asset.associated_assets.items():
+            for associated_asset in associated_assets:
+                other_item = self._asset_id_to_item.get(associated_asset.id)
+                if other_item is None:
+                    continue
+                association_key = self.association_key(
+                    asset, fieldname, associated_asset
+                )
+                if association_key not in connected:
+                    connected.add(association_key)
+                    self.add_association_connection(item, other_item, fieldname)
+
+        attacker_connections = self.released_attacker_connections.pop(asset_id, [])
+        for add_connection, attack_step_name, attacker_item in attacker_connections:
+            # The attacker may have been deleted since
+            if attacker_item in self.attacker_items:
+                add_connection(attack_step_name, attacker_item, item)
+
+        if asset_id in self.hidden_asset_ids:
+            self.update_item_visibility(item)
+        return item
+
+    def release_asset_item(self, asset_id):
+        """Remove the item of an asset from the scene and keep it for reuse"""
+        item = self._asset_id_to_item.pop(asset_id)
+        self.virtual_index.move(asset_id, item.pos().x(), item.pos().y())
+
+        # Attackers are connected again when the asset gets an item
+        attacker_connections = [
+            (
+                (
+                    self.add_goal_connection
+                    if isinstance(connection, GoalConnectionItem)
+                    else self.add_entrypoint_connection
+                ),
+                connection.attack_step_name,
+                connection.attacker_item,
+            )
+            for connection in item.connections
+            if isinstance(connection, AttackerConnectionBase)
+        ]
+        if attacker_connections:
+            self.released_attacker_connections[asset_id] = attacker_connections
+
+        for connection in list(item.connections):
+            if isinstance(connection, AttackerConnectionBase):
+                connection.attacker_item.remove_connection(connection)
+                connection.asset_item.remove_connection(connection)
+            else:
+                connection.start_item.remove_connection(connection)
+                connection.end_item.remove_connection(connection)
+            connection.delete()
+
+        item.setSelected(False)
+        self.removeItem(item)
+        if len(self.asset_item_pool) < self.VIRTUAL_POOL_SIZE:
+            self.asset_item_pool.append(item)
+
+    def update_pinned_assets(self):
+        """
+        Pin the assets of items that are selected, referenced by commands
+        on the undo stack or held by containers, so these items are not
+        recycled for other assets. Other items can be recycled again.
+        """
+        referenced = self.selectedItems()
+        for index in range(self.undo_stack.count()):
+            referenced.extend(vars(self.undo_stack.command(index)).values())
+        for container in self.container_items:
+            referenced.extend(
+                entry["item"] for entry in container.containerized_assets_list
+            )
+        self.pinned_asset_ids = referenced_asset_ids(referenced)
+
+    def drawBackground(self, painter, rect):
+        """Overrides base method, paints assets and associations without items"""
+        super().drawBackground(painter, rect)
+        if self.virtual_index is None:
+            return
+
+        if self.virtual_overview:
+            # Too many assets in view for items, paint them as plain rects
+            width, height = 240, 70  # Size of an asset item
+            positions = self.virtual_index.query_positions(
+                rect.left() - width / 2,
+                rect.top() - height / 2,
+                rect.right() + width / 2,
+                rect.bottom() + height / 2,
+            )
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(0, 200, 0))
+            painter.drawRects(
+                [
+                    QRectF(x - width / 2, y - height / 2, width, height)
+                    for x, y in positions
+                ]
+            )
+            return
+
+        # Associations from assets with items to assets without
+        lines = []
+        for item in self._asset_id_to_item.values():
+            for associated_assets in item.asset.associated_assets.values():
+                for associated_asset in associated_assets:
+                    if associated_asset.id in self._asset_id_to_item:
+                        continue
+                    position = self.virtual_index.position(associated_asset.id)
+                    if position is not None:
+                        lines.append(QLineF(item.pos(), QPointF(*position)))
+        if lines:
+            painter.setPen(QPen(QColor(0, 255, 0), 2))
+            painter.drawLines(lines)
 
     # based on connectionType use attacker or
     # add_association_connection
@@ -574,7 +1338,6 @@ class ModelScene(QGraphicsScene):
         connection = AssociationConnectionItem(fieldname, start_item, end_item, self)
 
         self.addItem(connection)
-        connection.restore_labels()
         connection.update_path()
         return connection
 
@@ -586,7 +1349,6 @@ class ModelScene(QGraphicsScene):
         )
 
         self.addItem(connection)
-        connection.restore_labels()
         connection.update_path()
         return connection
 
@@ -598,7 +1360,6 @@ class ModelScene(QGraphicsScene):
         )
 
         self.addItem(connection)
-        connection.restore_labels()
         connection.update_path()
         return connection
 
@@ -616,6 +1377,9 @@ class ModelScene(QGraphicsScene):
         asset_item.setPos(position)
         self.addItem(asset_item)
         self._asset_id_to_item[asset_item.asset.id] = asset_item
+        if self.virtual_index is not None:
+            self.virtual_index.add(asset_item.asset.id, position.x(), position.y())
+        self.asset_added.emit(asset_item.asset)
         return asset_item
 
     def create_asset(
@@ -629,6 +1393,9 @@ class ModelScene(QGraphicsScene):
         self.addItem(new_asset_item)
         print("Added asset item", new_asset_item, "to scene", self)
         self._asset_id_to_item[new_asset.id] = new_asset_item
+        if self.virtual_index is not None:
+            self.virtual_index.add(new_asset.id, position.x(), position.y())
+        self.asset_added.emit(new_asset)
         return new_asset_item
 
     def remove_asset(self, asset_item: AssetItem):
@@ -636,6 +1403,9 @@ class ModelScene(QGraphicsScene):
         self.model.remove_asset(asset_item.asset)
         self.removeItem(asset_item)
         del self._asset_id_to_item[asset_item.asset.id]
+        if self.virtual_index is not None:
+            self.virtual_index.remove(asset_item.asset.id)
+        self.asset_removed.emit(asset_item.asset)
 
     def remove_association(self, association_item: AssociationConnectionItem):
         """Remove all traces of an association"""
@@ -710,6 +1480,11 @@ class ModelScene(QGraphicsScene):
         command = ContainerizeAssetsCommand(self, selected_assets)
         self.undo_stack.push(command)
 
+    def set_defenses(self, new_values: dict[int, dict[str, Optional[float]]]):
+        print("Setting of defenses requested..")
+        command = SetDefenseCommand(self, new_values)
+        self.undo_stack.push(command)
+
     def decontainerize_assets(self, currently_selected_container: AssetsContainer):
         # Add items back to the scene
         current_position_of_container = currently_selected_container.scenePos()
@@ -729,7 +1504,6 @@ class ModelScene(QGraphicsScene):
         # Restore connections
         for connection in available_connections_in_item:
             self.addItem(connection)
-            connection.restore_labels()
             connection.update_path()
 
         self.removeItem(currently_selected_container)
@@ -973,33 +1747,35 @@ class ModelScene(QGraphicsScene):
             self.paste_assets(scene_pos)
 
     def set_show_assoc_checkbox_status(self, is_enabled):
+        """Show or hide the field names of all associations"""
         self.show_association_checkbox_status = is_enabled
+        if is_enabled:
+            for connection in self.unlabeled_associations:
+                connection.create_field_labels()
+                connection.update_path()
+            self.unlabeled_associations.clear()
+        self.update()
+
+    def set_show_icons(self, is_enabled):
+        """Show or hide the icons of all items"""
+        self.show_icons = is_enabled
+        self.update()
 
     def get_show_assoc_checkbox_status(self):
         return self.show_association_checkbox_status
 
     def show_items_details(self):
+        """Show the selected items in the side panels if the selection changed"""
         selected_items = self.selectedItems()
-        if len(selected_items) == 1:
-            # self.main_window is a reference to main window
-            item = selected_items[0]
-            self.main_window.item_details_window.update_item_details_window(item)
-            if isinstance(item, AssetItem):
-                print("Asset selected")
-                self.main_window.update_properties_window(item)
-                self.main_window.update_attack_steps_window(None)
-                self.main_window.update_asset_relations_window(item)
-            elif isinstance(item, AttackerItem):
-                print("Attacker Selected")
-                self.main_window.update_attack_steps_window(item)
-                self.main_window.update_properties_window(None)
-                self.main_window.update_asset_relations_window(None)
+        if set(selected_items) == set(self.details_items):
+            return
+        self.details_items = selected_items
+        self.main_window.show_selected_items(selected_items)
 
-        else:
-            self.main_window.item_details_window.update_item_details_window(None)
-            self.main_window.update_properties_window(None)
-            self.main_window.update_attack_steps_window(None)
-            self.main_window.update_asset_relations_window(None)
+    def refresh_items_details(self):
+        """Show the selected items again, they may have changed"""
+        self.details_items = []
+        self.details_timer.start()
 
     def calc_surrounding_rect_for_grouped_assets_in_container(
         self, contained_item_for_bounding_rect_calc
@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QGraphicsView
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, QTimer
 from PySide6.QtGui import QPainter
 
 
@@ -14,6 +14,30 @@ class ModelView(QGraphicsView):
         self.zoom_factor = 1.0
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 
+        # Tells a virtualized scene what is visible, once per event loop pass
+        self.visible_rect_timer = QTimer(self)
+        self.visible_rect_timer.setSingleShot(True)
+        self.visible_rect_timer.timeout.connect(self.visible_rect_changed)
+
+    def visible_rect_changed(self):
+        """Let the scene create items for the part of it that is shown"""
+        visible_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        self.scene().update_virtual_items(visible_rect)
+
+    def schedule_visible_rect_changed(self):
+        if not self.visible_rect_timer.isActive():
+            self.visible_rect_timer.start(0)
+
+    def scrollContentsBy(self, dx, dy):
+        """Overrides base"""
+        super().scrollContentsBy(dx, dy)
+        self.schedule_visible_rect_changed()
+
+    def resizeEvent(self, event):
+        """Overrides base"""
+        super().resizeEvent(event)
+        self.schedule_visible_rect_changed()
+
     def zoomIn(self):
         """Overrides base"""
         self.zoom(1.5)  # Akash: This value need to discuss with Andrei
@@ -34,6 +58,7 @@ class ModelView(QGraphicsView):
         self.zoom_factor *= factor
         self.scale(factor, factor)
         self.zoom_changed.emit(self.zoom_factor)
+        self.schedule_visible_rect_changed()
 
     def set_zoom(self, zoom_percentage):
         """Set zoom to certain value"""
@@ -41,6 +66,7 @@ class ModelView(QGraphicsView):
         self.scale(factor / self.zoom_factor, factor / self.zoom_factor)
         self.zoom_factor = factor
         self.zoom_changed.emit(self.zoom_factor)
+        self.schedule_visible_rect_changed()
 
     # Handling all the mouse press/move/release event to QGraphicsScene ( ModelScene) derived class to avoid
     # collision of functionality in 2 different places( ModelView vs ModelScene).
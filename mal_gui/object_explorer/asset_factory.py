@@ -2,10 +2,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from collections import namedtuple
 
-from PySide6.QtCore import QPointF
+from PySide6.QtCore import QPointF, QSize
+from PySide6.QtGui import QPixmap
 
 from .asset_item import AssetItem
 from .attacker_item import AttackerItem
+from .icon_cache import ICON_SIZE, icon_pixmap
 
 if TYPE_CHECKING:
     from maltoolbox.model import ModelAsset
@@ -32,24 +34,39 @@ class AssetFactory:
             asset_name, AssetInfo(asset_name, asset_name, image_path)
         )
 
+    def icon_pixmap(self, asset_type: str, size: QSize = ICON_SIZE) -> QPixmap:
+        """
+        Icon of a registered asset type, scaled to `size`.
+        The pixmap is cached process-wide and shared by all items.
+        """
+        asset_info: AssetInfo = self.asset_registry[asset_type][0]
+        return icon_pixmap(asset_info.asset_image, size)
+
     def create_asset_item(self, asset: ModelAsset, pos: QPointF):
         asset_type = asset.lg_asset.name
         asset_info: AssetInfo = self.asset_registry[asset_type][0]
         requested_item = AssetItem(asset, asset_info.asset_image)
 
         requested_item.setPos(pos)
-        requested_item.type_text_item.setPlainText(asset.name)
+        requested_item.set_name_text(asset.name)
 
         requested_item.build()
         return requested_item
 
+    def recycle_asset_item(self, item: AssetItem, asset: ModelAsset, pos: QPointF):
+        """Reuse an asset item that is no longer shown for another asset"""
+        asset_info: AssetInfo = self.asset_registry[asset.lg_asset.name][0]
+        item.set_asset(asset, asset_info.asset_image)
+        item.setPos(pos)
+        return item
+
     def create_attacker_item(self, name: str, pos: QPointF, entry_points=None):
         asset_type = "Attacker"
         asset_info: AssetInfo = self.asset_registry[asset_type][0]
         requested_item = AttackerItem(name, asset_info.asset_image, entry_points)
 
         requested_item.setPos(pos)
-        requested_item.type_text_item.setPlainText(name or "Unnamed Attacker")
+        requested_item.set_name_text(name or "Unnamed Attacker")
 
         requested_item.build()
         return requested_item
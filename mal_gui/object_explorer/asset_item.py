@@ -1,7 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from PySide6.QtGui import QColor
 
+from .icon_cache import icon_pixmap
 from .item_base import ItemBase
 
 if TYPE_CHECKING:
@@ -24,9 +26,33 @@ class AssetItem(ItemBase):
 
         super().__init__(asset.lg_asset.name, image_path, parent)
 
+    def set_asset(self, asset: ModelAsset, image_path: str):
+        """Show another asset with this item, used to recycle items"""
+        if self.name_editor is not None:
+            self.name_editor.cancel()
+        # Nothing set for the previous asset is kept
+        self.setVisible(True)
+        self.setZValue(self.DEFAULT_Z_VALUE)
+        self._asset_type_background_color = QColor(self.DEFAULT_TYPE_BACKGROUND_COLOR)
+        self._asset_name_background_color = QColor(self.DEFAULT_NAME_BACKGROUND_COLOR)
+
+        self.asset = asset
+        self.asset_type = asset.lg_asset
+        self.title = asset.lg_asset.name
+        self.image_path = image_path
+        self.image = icon_pixmap(image_path)
+        self.set_name_text(asset.name)
+        self.build()
+
     def update_name(self):
         super().update_name()
-        self.asset.name = self.title
+        associated_scene = self.scene()
+        if associated_scene is None:
+            self.asset.name = self.title
+        elif not associated_scene.rename_asset(self.asset, self.title):
+            # Name already taken, show the current name again
+            self.title = self.asset.name
+            self.set_name_text(self.asset.name)
 
     def get_item_attribute_values(self) -> dict[str, dict[str, Any]]:
         return {
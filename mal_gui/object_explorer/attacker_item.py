@@ -1,7 +1,4 @@
 from PySide6.QtGui import QColor
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QGraphicsItem
-from shiboken6 import isValid
 
 from malsim import policies
 
@@ -28,22 +25,18 @@ class AttackerItem(ItemBase):
         parent=None,
     ):
 
-        self.entry_points: list[str] = entry_points or []
+        self.entry_points: list[str] = list(entry_points or [])
         self.policy = policies.PassiveAgent
         self.goals: list[str] = goals or []
         self.name = name
-        self.attacker_toggle_state = False
 
-        self.timer = QTimer()
+        # Blinked by the animation clock of the scene
         self.status_color = QColor(0, 255, 0)
-        self.attacker_toggle_state = False
-        self.timer.timeout.connect(self.update_status_color)
-        self.timer.start(500)
 
         super().__init__("Attacker", image_path, parent)
 
-    def update_type_text_item_position(self):
-        super().update_type_text_item_position()
+    def update_name_position(self):
+        super().update_name_position()
         # For Attacker make the background of type As Red
         self.asset_type_background_color = QColor(255, 0, 0)  # Red
 
@@ -75,30 +68,12 @@ class AttackerItem(ItemBase):
             return
         raise AttributeError(f"{attr_name} is not editable")
 
-    def update_status_color(self):
-        # Object may already be deleted on C++ side
-        if not isValid(self):
-            return
-
-        # Still check if removed from scene
-        if self.scene() is None:
-            if self.timer.isActive():
-                self.timer.stop()
-            return
-
-        self.attacker_toggle_state = not self.attacker_toggle_state
-        if self.attacker_toggle_state:
-            self.status_color = QColor(0, 255, 0)  # Green
-        else:
-            self.status_color = QColor(255, 0, 0)  # Red
-        self.update()
-
-    def itemChange(self, change, value):
-        """Override to stop timer when item is removed from scene"""
-        if change == QGraphicsItem.ItemSceneChange:
-            if value is None and self.timer.isActive():
-                self.timer.stop()
-        return super().itemChange(change, value)
+    def set_status_light(self, on: bool):
+        """Show the status light as green (on) or red (off)"""
+        status_color = QColor(0, 255, 0) if on else QColor(255, 0, 0)
+        if status_color != self.status_color:
+            self.status_color = status_color
+            self.update()
 
     def serialize(self):
         return {
@@ -1,21 +1,92 @@
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont, QTextCursor
-from PySide6.QtWidgets import QGraphicsTextItem
+from __future__ import annotations
+from typing import Callable
+
+from PySide6.QtCore import Qt, QPointF, Signal
+from PySide6.QtGui import QFont, QFontMetricsF, QStaticText, QTextCursor
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsTextItem
+
+NAME_FONT = QFont("Arial", pointSize=12)
+# Space between the position of a text item and its text
+TEXT_MARGIN = 4
+
+
+def name_static_text(text: str) -> QStaticText:
+    """Laid out name of an item, painted without a text document"""
+    static_text = QStaticText(text)
+    static_text.setTextFormat(Qt.PlainText)
+    static_text.prepare(font=NAME_FONT)
+    return static_text
+
+
+def name_position(text: str, item_height: float, vertical_margin: float) -> QPointF:
+    """Where the name of an item goes, centered in the lower half of the item"""
+    name_x = -QFontMetricsF(NAME_FONT).horizontalAdvance(text) / 2
+    name_y = -item_height / 2 + QFontMetricsF(NAME_FONT).height() + 2 * vertical_margin
+    return QPointF(name_x, name_y)
 
 
 class EditableTextItem(QGraphicsTextItem):
+    """
+    Inline editor for the name of an item. Items paint their names
+    themselves, an editor only exists while a name is edited.
+    """
+
     lostFocus = Signal()
 
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
-        #  Disable editing initially
-        self.setTextInteractionFlags(Qt.NoTextInteraction)
-        self.setFont(QFont("Arial", 12 * 1.2, QFont.Bold))
+        self.setFont(NAME_FONT)
+        self.setDefaultTextColor(Qt.white)
+        self.setTextInteractionFlags(Qt.TextEditorInteraction)
+        self.original_text = text
+        self.finished = False
+
+    @classmethod
+    def edit(
+        cls,
+        item: QGraphicsItem,
+        text: str,
+        pos: QPointF,
+        name_edited: Callable[[str], None],
+    ) -> EditableTextItem:
+        """
+        Start editing `text` at `pos` on `item`, `name_edited` is called
+        with the new text when the editor loses focus. Only one name
+        is edited at a time in the scene of `item`.
+        """
+        scene = item.scene()
+        scene.finish_name_edit()
+
+        editor = cls(text, item)
+        editor.setPos(pos)
+        editor.lostFocus.connect(lambda: name_edited(editor.toPlainText()))
+        editor.setFocus()
+        # Select all text when activated
+        editor.select_all_text()
+        scene.name_editor = editor
+        return editor
+
+    def finish(self):
+        """Stop editing, the editor is removed"""
+        if self.finished:
+            return
+        self.finished = True
+        scene = self.scene()
+        if scene is not None and scene.name_editor is self:
+            scene.name_editor = None
+        self.lostFocus.emit()
+        self.hide()
+        self.deleteLater()
+
+    def cancel(self):
+        """Stop editing and keep the name the editor started with"""
+        self.setPlainText(self.original_text)
+        self.finish()
 
     def focusOutEvent(self, event):
         """Overrides base method"""
-        self.lostFocus.emit()
         super().focusOutEvent(event)
+        self.finish()
 
     def keyPressEvent(self, event):
         """Overrides base method"""
@@ -28,10 +99,3 @@ class EditableTextItem(QGraphicsTextItem):
         cursor = self.textCursor()
         cursor.select(QTextCursor.Document)
         self.setTextCursor(cursor)
-
-    def deselect_text(self):
-        cursor = self.textCursor()
-
-        # Set cursor position to the start of the document
-        cursor.setPosition(0)
-        self.setTextCursor(cursor)
@@ -0,0 +1,52 @@
+"""Process-wide cache of icon pixmaps, pre-scaled to the size they are drawn at"""
+
+from typing import Optional
+
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
+
+# Size (in scene units) of the asset icon drawn in the title of an item
+ICON_SIZE = QSize(24, 24)
+
+# Size of small symbols, e.g. the plus/minus of asset containers
+SYMBOL_SIZE = QSize(12, 12)
+
+_icon_pixmaps: dict[tuple[str, int, int, float], QPixmap] = {}
+
+
+def device_pixel_ratio() -> float:
+    """Pixel ratio of the screen the GUI is shown on"""
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app else 1.0
+
+
+def icon_pixmap(
+    path: str, size: QSize = ICON_SIZE, pixel_ratio: Optional[float] = None
+) -> QPixmap:
+    """
+    Return the image at `path` scaled to `size` for the given device
+    pixel ratio. Pixmaps are shared between all items using them.
+    """
+    pixel_ratio = pixel_ratio or device_pixel_ratio()
+    key = (path, size.width(), size.height(), pixel_ratio)
+
+    if key not in _icon_pixmaps:
+        image = QImage(path)
+        if image.isNull():
+            pixmap = QPixmap()
+        else:
+            pixmap = QPixmap.fromImage(
+                image.scaled(
+                    size * pixel_ratio, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                )
+            )
+            # Keep the logical size so the pixmap is drawn without scaling
+            pixmap.setDevicePixelRatio(pixel_ratio)
+        _icon_pixmaps[key] = pixmap
+
+    return _icon_pixmaps[key]
+
+
+def clear_icon_cache():
+    """Drop all cached pixmaps, e.g. after the screen pixel ratio changed"""
+    _icon_pixmaps.clear()
@@ -1,28 +1,31 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from abc import abstractmethod
 
-from PySide6.QtCore import QRectF, Qt, QPointF, QSize, QSizeF
-from PySide6.QtGui import (
-    QPixmap,
-    QFont,
-    QColor,
-    QBrush,
-    QPen,
-    QPainterPath,
-    QFontMetrics,
-    QLinearGradient,
-    QImage,
-)
+from PySide6.QtCore import QRectF, Qt, QPointF, QSizeF
+from PySide6.QtGui import QPixmap, QColor
 from PySide6.QtWidgets import QGraphicsItem
 
-from .editable_text_item import EditableTextItem
+from ..render_settings import RENDER_SETTINGS, DetailLevel
+from .editable_text_item import (
+    NAME_FONT,
+    TEXT_MARGIN,
+    EditableTextItem,
+    name_position,
+    name_static_text,
+)
+from .icon_cache import ICON_SIZE, icon_pixmap
+from .item_style import ItemStyle, item_style
 
 if TYPE_CHECKING:
     from ..connection_item import IConnectionItem
 
 
 class ItemBase(QGraphicsItem):
+    DEFAULT_TYPE_BACKGROUND_COLOR = QColor(0, 200, 0)  # Green
+    DEFAULT_NAME_BACKGROUND_COLOR = QColor(20, 20, 20, 200)  # Gray
+    DEFAULT_Z_VALUE = 1
+
     def __init__(
         self,
         title: str,
@@ -31,12 +34,14 @@ class ItemBase(QGraphicsItem):
     ):
         super().__init__(parent)
 
-        self.setZValue(1)  # rect items are on top
+        self.setZValue(self.DEFAULT_Z_VALUE)  # rect items are on top
 
         self.title = title
+        self.title_text = title
         self.image_path = image_path
 
-        self.image = self.load_image_with_quality(self.image_path, QSize(512, 512))
+        # Shared with all items of the same type, already at drawing size
+        self.image = icon_pixmap(self.image_path)
 
         self.setFlags(
             QGraphicsItem.ItemIsSelectable
@@ -44,9 +49,12 @@ class ItemBase(QGraphicsItem):
             | QGraphicsItem.ItemSendsGeometryChanges
         )
 
-        # Create the editable text item for block type
-        self.type_text_item = EditableTextItem(self.title, self)
-        self.type_text_item.lostFocus.connect(self.update_name)
+        # Name painted in the lower half, see set_name_text
+        self.name_text = self.title
+        self.name_static_text = name_static_text(self.name_text)
+        self.name_pos = QPointF()
+        # Only set while the name is edited
+        self.name_editor: Optional[EditableTextItem] = None
 
         self.connections: list[IConnectionItem] = []
         self.initial_position = QPointF()
@@ -56,60 +64,104 @@ class ItemBase(QGraphicsItem):
         self.height = 70
         self.size = QRectF(-self.width / 2, -self.height / 2, self.width, self.height)
 
-        self.asset_type_background_color = QColor(0, 200, 0)  # Green
-        self.asset_name_background_color = QColor(20, 20, 20, 200)  # Gray
+        self._asset_type_background_color = QColor(self.DEFAULT_TYPE_BACKGROUND_COLOR)
+        self._asset_name_background_color = QColor(self.DEFAULT_NAME_BACKGROUND_COLOR)
+
+        # Paths, brushes and pens shared with items of the same type
+        self.style: ItemStyle = None
 
         self.icon_path = None
-        self.icon_visible = True
         self.icon_pixmap = QPixmap()
 
-        self.title_path = QPainterPath()  # The path for the title
-        self.type_path = QPainterPath()  # The path for the type
-        self.status_path = QPainterPath()  # A path showing the status of the node
-
         self.horizontal_margin = 15  # Horizontal margin
         self.vertical_margin = 15  # Vertical margin
         self.status_color = QColor(0, 255, 0)
 
         self.build()
 
+    @property
+    def asset_type_background_color(self) -> QColor:
+        return self._asset_type_background_color
+
+    @asset_type_background_color.setter
+    def asset_type_background_color(self, color: QColor):
+        if color != self._asset_type_background_color:
+            self._asset_type_background_color = QColor(color)
+            self.update_style()
+
+    @property
+    def asset_name_background_color(self) -> QColor:
+        return self._asset_name_background_color
+
+    @asset_name_background_color.setter
+    def asset_name_background_color(self, color: QColor):
+        if color != self._asset_name_background_color:
+            self._asset_name_background_color = QColor(color)
+            self.update_style()
+
+    def update_style(self):
+        """Look up the shared style for the current title, colours and size"""
+        self.style = item_style(
+            self.title_text,
+            self._asset_type_background_color,
+            self._asset_name_background_color,
+            self.width,
+            self.height,
+        )
+        self.update()
+
     def boundingRect(self):
         """Overrides base method"""
         return self.size
 
     def paint(self, painter, option, widget=None):
         """Overrides base method"""
-        painter.setPen(self.asset_name_background_color.lighter())
-        painter.setBrush(self.asset_name_background_color)
-        painter.drawPath(self.path)
-
-        gradient = QLinearGradient()
-        gradient.setStart(0, -90)
-        gradient.setFinalStop(0, 0)
-        gradient.setColorAt(0, self.asset_type_background_color)  # Start color
-        gradient.setColorAt(1, self.asset_type_background_color.darker())  # End color
+        detail = RENDER_SETTINGS.detail_level(
+            option.levelOfDetailFromTransform(painter.worldTransform())
+        )
 
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(self.asset_type_background_color)
-        painter.drawPath(self.title_bg_path.simplified())
+        style = self.style
+
+        if detail == DetailLevel.OUTLINE:
+            # Too small to read anything, a filled rect is enough
+            if self.isSelected():
+                painter.setPen(style.highlight_pen)
+            else:
+                painter.setPen(Qt.NoPen)
+            painter.setBrush(style.type_brush)
+            painter.drawRect(self.size)
+            return
+
+        painter.setPen(style.name_pen)
+        painter.setBrush(style.name_brush)
+        painter.drawPath(style.path)
+
+        if detail == DetailLevel.FULL:
+            painter.setBrush(style.title_bg_gradient)
+            painter.setPen(style.type_pen)
+            painter.drawPath(style.title_bg_path_simplified)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(style.type_brush)
+            painter.drawPath(style.title_bg_path)
 
         painter.setPen(Qt.NoPen)
         painter.setBrush(Qt.white)
-        painter.drawPath(self.title_path)
-        painter.drawPath(self.type_path)
+        painter.drawPath(style.title_path)
 
-        # Draw the status path
-        painter.setBrush(self.status_color)
-        painter.setPen(self.status_color.darker())
-        painter.drawPath(self.status_path.simplified())
+        if detail == DetailLevel.FULL:
+            # Draw the status path
+            painter.setBrush(self.status_color)
+            painter.setPen(self.status_color.darker())
+            painter.drawPath(style.status_path)
 
         # Draw the icon if it's visible
-        if self.icon_visible and not self.image.isNull():
-            targetIconSize = QSize(24, 24)  # Desired size for the icon
-
-            # Resize the icon using smooth transformation
-            # resizedImageIcon = self.image.scaled(targetIconSize, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            resizedImageIcon = self.image
+        if (
+            detail == DetailLevel.FULL
+            and self.icons_shown()
+            and not self.image.isNull()
+        ):
+            targetIconSize = ICON_SIZE  # Size the cached icon is scaled to
 
             # Calculate the position and size for the icon background
             iconRect = QRectF(
@@ -133,112 +185,76 @@ class ItemBase(QGraphicsItem):
                 backgroundRect.toRect()
             )  # Convert QRectF to QRect and draw the white background rectangle
 
-            # Draw the resized icon on top of the white background
+            # Draw the pre-scaled icon on top of the white background
+            icon_size = self.image.deviceIndependentSize()
             painter.drawPixmap(
-                iconRect.toRect(), resizedImageIcon
-            )  # Convert QRectF to QRect and draw the resized icon
+                iconRect.center()
+                - QPointF(icon_size.width() / 2, icon_size.height() / 2),
+                self.image,
+            )
+
+        # Names are unreadable when zoomed out, the editor paints it when edited
+        if detail == DetailLevel.FULL and self.name_editor is None:
+            painter.setPen(Qt.white)
+            painter.setFont(NAME_FONT)
+            painter.drawStaticText(
+                self.name_pos + QPointF(TEXT_MARGIN, TEXT_MARGIN),
+                self.name_static_text,
+            )
 
         # Draw the highlight if selected
         if self.isSelected():
-            painter.setPen(QPen(self.asset_type_background_color.lighter(), 2))
+            painter.setPen(style.highlight_pen)
             painter.setBrush(Qt.NoBrush)
-            painter.drawPath(self.path)
+            painter.drawPath(style.path)
 
     def itemChange(self, change, value):
         """Overrides base method"""
-        if change == QGraphicsItem.ItemPositionChange:
-            if self.pos() != self.initial_position:
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            associated_scene = self.scene()
+            if associated_scene:
+                # Connections are redrawn once per frame by the scene
+                associated_scene.mark_connections_dirty(self.connections)
+            else:
                 for connection in self.connections:
                     connection.update_path()
-                self.initial_position = self.pos()
-            if self.scene():
-                self.scene().update()  # Ensure the scene is updated - this fixed trailing borders issue
         return super().itemChange(change, value)
 
     def mouseDoubleClickEvent(self, event):
         if event.button() == Qt.LeftButton:
-            self.type_text_item.setTextInteractionFlags(Qt.TextEditorInteraction)
-            self.type_text_item.setFocus()
-            # Select all text when activated
-            self.type_text_item.select_all_text()
+            self.start_name_edit()
             event.accept()
         else:
             event.ignore()
 
-    def focusOutEvent(self, event):
-        """Overrides base method"""
-        self.type_text_item.clearFocus()
-        super().focusOutEvent(event)
-
     def mousePressEvent(self, event):
         """Overrides base method"""
         self.initial_position = self.pos()
 
-        if self.type_text_item.hasFocus() and not self.type_text_item.contains(
-            event.pos()
-        ):
-            self.type_text_item.clearFocus()
-        elif not self.type_text_item.contains(event.pos()):
-            self.type_text_item.deselect_text()
-        else:
-            super().mousePressEvent(event)
+        if self.name_editor is not None:
+            # Clicked next to the name that is edited
+            self.name_editor.finish()
 
-    def build(self):
-        self.title_text = self.title
-        self.title_path = QPainterPath()
-        self.type_path = QPainterPath()
-        self.status_path = QPainterPath()
-
-        # Set the font for title and category
-        title_font = QFont("Arial", pointSize=12)
-        type_font = QFont("Arial", pointSize=12)
-
-        # Use fixed width and height
-        fixed_width = self.width
-        fixed_height = self.height
-
-        # Draw the background of the node
-        self.path = QPainterPath()
-        self.path.addRoundedRect(
-            -fixed_width / 2, -fixed_height / 2, fixed_width, fixed_height, 6, 6
-        )
-
-        self.title_bg_path = QPainterPath()
-        self.title_bg_path.addRoundedRect(
-            -fixed_width / 2,
-            -fixed_height / 2,
-            fixed_width,
-            title_font.pointSize() + 2 * self.vertical_margin,
-            6,
-            6,
-        )
-
-        # Draw status path
-        self.status_path.setFillRule(Qt.WindingFill)
-        self.status_path.addRoundedRect(
-            fixed_width / 2 - 12, -fixed_height / 2 + 2, 10, 10, 2, 2
+    def start_name_edit(self):
+        """Edit the name with the shared inline editor"""
+        self.name_editor = EditableTextItem.edit(
+            self, self.name_text, self.name_pos, self.name_edited
         )
+        self.update()
 
-        # Center title in the upper half
-        title_font_metrics = QFontMetrics(title_font)
-        self.title_path.addText(
-            # Center horizontally
-            -title_font_metrics.horizontalAdvance(self.title_text) / 2,
-            # Center vertically within its section
-            -fixed_height / 2 + self.vertical_margin + title_font_metrics.ascent(),
-            title_font,
-            self.title_text,
-        )
+    def name_edited(self, text: str):
+        self.name_editor = None
+        self.set_name_text(text)
+        self.update_name()
 
-        # Set the font and default color for type_text_item
-        self.type_text_item.setFont(type_font)
-        self.type_text_item.setDefaultTextColor(Qt.white)
+    def build(self):
+        self.title_text = self.title
 
-        # Initial position of type_text_item
-        self.update_type_text_item_position()
+        # Paths for background, title and status are shared per type
+        self.update_style()
 
-        # Connect lostFocus signal to update position when text loses focus
-        self.type_text_item.lostFocus.connect(self.update_type_text_item_position)
+        # Initial position of the name
+        self.update_name_position()
 
         # self.widget.move(-self.widget.size().width() / 2,
         # fixed_height / 2 - self.widget.size().height() + 5)
@@ -250,36 +266,20 @@ class ItemBase(QGraphicsItem):
         if connection in self.connections:
             self.connections.remove(connection)
 
-    def update_type_text_item_position(self):
-        # to update the position of the type_text_item so that it
-        # remains centered within the lower half of the node
-        # whenever the text changes.
-
-        type_font_metrics = QFontMetrics(self.type_text_item.font())
-        fixed_height = self.height
-        title_font_metrics = QFontMetrics(QFont("Arial", pointSize=12))
-
-        # Calculate the new position for type_text_item
-        type_text_item_pos_x = (
-            -type_font_metrics.horizontalAdvance(self.type_text_item.toPlainText()) / 2
-        )
-        type_text_item_pos_y = (
-            -fixed_height / 2 + title_font_metrics.height() + 2 * self.vertical_margin
-        )
+    def set_name_text(self, text: str):
+        """Set the name painted on the item"""
+        if text != self.name_text:
+            self.name_text = text
+            self.name_static_text = name_static_text(text)
+        self.update_name_position()
+        self.update()
 
-        # Update position
-        self.type_text_item.setPos(type_text_item_pos_x, type_text_item_pos_y)
+    def update_name_position(self):
+        # Keep the name centered within the lower half of the node
+        self.name_pos = name_position(self.name_text, self.height, self.vertical_margin)
 
     def update_name(self):
-        self.title = self.type_text_item.toPlainText()
-        self.type_text_item.setTextInteractionFlags(Qt.NoTextInteraction)
-        self.type_text_item.deselect_text()
-        self.update_type_text_item_position()
-
-        associated_scene = self.type_text_item.scene()
-        if associated_scene:
-            print("Asset Name Changed by user")
-            associated_scene.main_window.update_childs_in_object_explorer_signal.emit()
+        self.title = self.name_text
 
     def setIcon(self, icon_path=None):
         """Overrides base method"""
@@ -289,17 +289,10 @@ class ItemBase(QGraphicsItem):
         else:
             self.icon_pixmap = QPixmap()
 
-    def toggle_icon_visibility(self):
-        self.icon_visible = not self.icon_visible
-        self.update()
-
-    def load_image_with_quality(self, path, size):
-        image = QImage(path)
-        if not image.isNull():
-            return QPixmap.fromImage(
-                image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
-        return QPixmap()
+    def icons_shown(self) -> bool:
+        """Icons are shown or hidden for the whole scene"""
+        scene = self.scene()
+        return scene is None or scene.show_icons
 
     @abstractmethod
     def get_item_attribute_values(self) -> dict:
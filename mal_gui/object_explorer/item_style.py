@@ -0,0 +1,103 @@
+"""
+Paint resources shared by all items of the same type. Items of a type
+have identical geometry, title and colours, so the paths, gradients and
+pens are built once and reused by every item and every frame.
+"""
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontMetrics,
+    QLinearGradient,
+    QPainterPath,
+    QPen,
+)
+
+TITLE_FONT = QFont("Arial", pointSize=12)
+VERTICAL_MARGIN = 15
+
+
+class ItemStyle:
+    """Prebuilt paths, brushes and pens for one (title, colours, size)"""
+
+    def __init__(
+        self,
+        title: str,
+        type_color: QColor,
+        name_color: QColor,
+        width: float,
+        height: float,
+    ):
+        self.title = title
+        self.type_color = QColor(type_color)
+        self.name_color = QColor(name_color)
+
+        # Background of the whole item
+        self.path = QPainterPath()
+        self.path.addRoundedRect(-width / 2, -height / 2, width, height, 6, 6)
+
+        # Background of the title
+        self.title_bg_path = QPainterPath()
+        self.title_bg_path.addRoundedRect(
+            -width / 2,
+            -height / 2,
+            width,
+            TITLE_FONT.pointSize() + 2 * VERTICAL_MARGIN,
+            6,
+            6,
+        )
+        self.title_bg_path_simplified = self.title_bg_path.simplified()
+
+        # Status light in the top right corner
+        status_path = QPainterPath()
+        status_path.setFillRule(Qt.WindingFill)
+        status_path.addRoundedRect(width / 2 - 12, -height / 2 + 2, 10, 10, 2, 2)
+        self.status_path = status_path.simplified()
+
+        # Glyph outlines of the title, centered in the upper half
+        title_font_metrics = QFontMetrics(TITLE_FONT)
+        self.title_path = QPainterPath()
+        self.title_path.addText(
+            -title_font_metrics.horizontalAdvance(title) / 2,
+            -height / 2 + VERTICAL_MARGIN + title_font_metrics.ascent(),
+            TITLE_FONT,
+            title,
+        )
+
+        gradient = QLinearGradient()
+        gradient.setStart(0, -90)
+        gradient.setFinalStop(0, 0)
+        gradient.setColorAt(0, self.type_color)  # Start color
+        gradient.setColorAt(1, self.type_color.darker())  # End color
+        self.title_bg_gradient = QBrush(gradient)
+
+        self.type_brush = QBrush(self.type_color)
+        self.type_pen = QPen(self.type_color)
+        self.name_brush = QBrush(self.name_color)
+        self.name_pen = QPen(self.name_color.lighter())
+        self.highlight_pen = QPen(self.type_color.lighter(), 2)
+
+
+_item_styles: dict[tuple[str, int, int, float, float], ItemStyle] = {}
+
+
+def item_style(
+    title: str, type_color: QColor, name_color: QColor, width: float, height: float
+) -> ItemStyle:
+    """Return the shared style for the given title, colours and size"""
+    key = (title, type_color.rgba(), name_color.rgba(), width, height)
+    if key not in _item_styles:
+        _item_styles[key] = ItemStyle(title, type_color, name_color, width, height)
+    return _item_styles[key]
+
+
+def invalidate_item_styles(title: str = None):
+    """
+    Drop cached styles for items titled `title` (all styles if None),
+    e.g. when the style of an asset type was changed. Items keep the
+    style they hold until they look it up again.
+    """
+    for key in [key for key in _item_styles if title is None or key[0] == title]:
+        del _item_styles[key]
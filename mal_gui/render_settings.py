@@ -0,0 +1,89 @@
+"""Rendering settings shared by all items in the scene"""
+
+import configparser
+import os
+from enum import IntEnum
+
+from .file_utils import CONFIG_FILE_PATH
+
+
+class DetailLevel(IntEnum):
+    """How much of an item is painted, from least to most"""
+
+    OUTLINE = 1  # A plain filled rectangle
+    TITLE = 2  # Background and title, no gradients, icons or status
+    FULL = 3  # Everything
+
+
+class RenderSettings:
+    """
+    Level of detail thresholds. The level of detail is the scale
+    an item is painted at (1.0 means 100% zoom), items painted below
+    `outline_below` are drawn as outlines and below `title_below`
+    with title only. `animations_enabled` turns blinking status
+    lights on/off.
+    """
+
+    SECTION = "Rendering"
+
+    def __init__(
+        self,
+        lod_enabled=True,
+        outline_below=0.25,
+        title_below=0.5,
+        animations_enabled=True,
+    ):
+        self.lod_enabled = lod_enabled
+        self.outline_below = outline_below
+        self.title_below = title_below
+        self.animations_enabled = animations_enabled
+
+    def detail_level(self, level_of_detail: float) -> DetailLevel:
+        """Map a level of detail from a painter transform to a tier"""
+        if not self.lod_enabled:
+            return DetailLevel.FULL
+        if level_of_detail < self.outline_below:
+            return DetailLevel.OUTLINE
+        if level_of_detail < self.title_below:
+            return DetailLevel.TITLE
+        return DetailLevel.FULL
+
+    def read_config(self, config_file_path=CONFIG_FILE_PATH):
+        """Read thresholds from the user config file, keep defaults if not set"""
+        config = configparser.ConfigParser()
+        config.read(config_file_path)
+        try:
+            self.lod_enabled = config.getboolean(
+                self.SECTION, "lodEnabled", fallback=self.lod_enabled
+            )
+            self.outline_below = config.getfloat(
+                self.SECTION, "lodOutlineBelow", fallback=self.outline_below
+            )
+            self.title_below = config.getfloat(
+                self.SECTION, "lodTitleBelow", fallback=self.title_below
+            )
+            self.animations_enabled = config.getboolean(
+                self.SECTION, "animationsEnabled", fallback=self.animations_enabled
+            )
+        except ValueError as e:
+            print(f"Invalid rendering settings in {config_file_path}: {e}")
+
+    def write_config(self, config_file_path=CONFIG_FILE_PATH):
+        """Store thresholds in the user config file"""
+        config = configparser.ConfigParser()
+        config.read(config_file_path)
+        if not config.has_section(self.SECTION):
+            config.add_section(self.SECTION)
+
+        config.set(self.SECTION, "lodEnabled", str(self.lod_enabled))
+        config.set(self.SECTION, "lodOutlineBelow", str(self.outline_below))
+        config.set(self.SECTION, "lodTitleBelow", str(self.title_below))
+        config.set(self.SECTION, "animationsEnabled", str(self.animations_enabled))
+
+        os.makedirs(os.path.dirname(config_file_path), exist_ok=True)
+        with open(config_file_path, "w", encoding="utf-8") as conf_file:
+            config.write(conf_file)
+
+
+# Read by items when they are painted
+RENDER_SETTINGS = RenderSettings()
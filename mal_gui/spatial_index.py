@@ -0,0 +1,139 @@
+"""Compact positions of model assets with a grid index for area queries"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class AssetSpatialIndex:
+    """
+    Positions of assets stored in a numpy array and bucketed in a uniform
+    grid, so the assets inside a rectangle can be found without looking at
+    every asset. Used to only create scene items for what is visible.
+    """
+
+    def __init__(self, cell_size: float = 1000.0):
+        self.cell_size = cell_size
+
+        # One row per asset, rows of removed assets are reused
+        self.positions = np.zeros((0, 2), dtype=np.float64)
+        self.asset_ids = np.zeros(0, dtype=np.int64)
+        self._free_rows: list[int] = []
+        self._row_of_asset: dict[int, int] = {}
+
+        # Grid cell -> rows of the assets in that cell
+        self._cells: dict[tuple[int, int], set[int]] = {}
+
+    def __len__(self):
+        return len(self._row_of_asset)
+
+    def __contains__(self, asset_id):
+        return asset_id in self._row_of_asset
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def _grow(self, min_rows: int):
+        """Make room for at least `min_rows` rows"""
+        num_rows = len(self.asset_ids)
+        if min_rows <= num_rows:
+            return
+        new_num_rows = max(min_rows, 2 * num_rows, 64)
+        self.positions = np.resize(self.positions, (new_num_rows, 2))
+        self.asset_ids = np.resize(self.asset_ids, new_num_rows)
+        self._free_rows.extend(range(new_num_rows - 1, num_rows - 1, -1))
+
+    def add(self, asset_id: int, x: float, y: float):
+        """Add an asset at position x, y"""
+        if asset_id in self._row_of_asset:
+            self.move(asset_id, x, y)
+            return
+
+        if not self._free_rows:
+            self._grow(len(self.asset_ids) + 1)
+        row = self._free_rows.pop()
+
+        self.positions[row] = (x, y)
+        self.asset_ids[row] = asset_id
+        self._row_of_asset[asset_id] = row
+        self._cells.setdefault(self._cell(x, y), set()).add(row)
+
+    def remove(self, asset_id: int):
+        """Remove an asset, does nothing if it is not in the index"""
+        row = self._row_of_asset.pop(asset_id, None)
+        if row is None:
+            return
+
+        cell = self._cell(*self.positions[row])
+        self._cells[cell].discard(row)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self._free_rows.append(row)
+
+    def move(self, asset_id: int, x: float, y: float):
+        """Update the position of an asset"""
+        row = self._row_of_asset[asset_id]
+        old_x, old_y = self.positions[row]
+        if old_x == x and old_y == y:
+            return
+
+        old_cell = self._cell(old_x, old_y)
+        new_cell = self._cell(x, y)
+        if old_cell != new_cell:
+            self._cells[old_cell].discard(row)
+            if not self._cells[old_cell]:
+                del self._cells[old_cell]
+            self._cells.setdefault(new_cell, set()).add(row)
+        self.positions[row] = (x, y)
+
+    def position(self, asset_id: int) -> Optional[tuple[float, float]]:
+        """Position of an asset or None if it is not in the index"""
+        row = self._row_of_asset.get(asset_id)
+        if row is None:
+            return None
+        x, y = self.positions[row]
+        return float(x), float(y)
+
+    def _query_rows(self, left, top, right, bottom) -> np.ndarray:
+        """Rows of all assets positioned inside the given rectangle"""
+        min_cell_x, min_cell_y = self._cell(left, top)
+        max_cell_x, max_cell_y = self._cell(right, bottom)
+
+        rows = []
+        num_cells = (max_cell_x - min_cell_x + 1) * (max_cell_y - min_cell_y + 1)
+        if num_cells > len(self._cells):
+            # Large area, cheaper to go through the cells that are in use
+            for (cell_x, cell_y), cell_rows in self._cells.items():
+                if (
+                    min_cell_x <= cell_x <= max_cell_x
+                    and min_cell_y <= cell_y <= max_cell_y
+                ):
+                    rows.extend(cell_rows)
+        else:
+            for cell_x in range(min_cell_x, max_cell_x + 1):
+                for cell_y in range(min_cell_y, max_cell_y + 1):
+                    rows.extend(self._cells.get((cell_x, cell_y), ()))
+
+        rows = np.fromiter(rows, dtype=np.int64, count=len(rows))
+        x, y = self.positions[rows, 0], self.positions[rows, 1]
+        inside = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+        return rows[inside]
+
+    def query(self, left: float, top: float, right: float, bottom: float) -> list[int]:
+        """Ids of all assets positioned inside the given rectangle"""
+        return self.asset_ids[self._query_rows(left, top, right, bottom)].tolist()
+
+    def query_positions(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> np.ndarray:
+        """Positions (one x, y row per asset) inside the given rectangle"""
+        return self.positions[self._query_rows(left, top, right, bottom)]
+
+    def bounds(self) -> Optional[tuple[float, float, float, float]]:
+        """Left, top, right and bottom of all positions, None if empty"""
+        if not self._row_of_asset:
+            return None
+        rows = np.fromiter(self._row_of_asset.values(), dtype=np.int64)
+        min_x, min_y = self.positions[rows].min(axis=0)
+        max_x, max_y = self.positions[rows].max(axis=0)
+        return float(min_x), float(min_y), float(max_x), float(max_y)
@@ -6,8 +6,10 @@ from .cut_command import CutCommand
 from .delete_command import DeleteCommand
 from .delete_connection_command import DeleteConnectionCommand
 from .drag_drop_command import DragDropAssetCommand, DragDropAttackerCommand
+from .layout_command import LayoutCommand
 from .move_command import MoveCommand
 from .paste_command import PasteCommand
+from .set_defense_command import SetDefenseCommand
 
 __all__ = [
     "ContainerizeAssetsCommand",
@@ -19,6 +21,8 @@ __all__ = [
     "DeleteConnectionCommand",
     "DragDropAssetCommand",
     "DragDropAttackerCommand",
+    "LayoutCommand",
     "MoveCommand",
     "PasteCommand",
+    "SetDefenseCommand",
 ]
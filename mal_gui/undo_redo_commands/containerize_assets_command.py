@@ -72,7 +72,6 @@ class ContainerizeAssetsCommand(QUndoCommand):
         # Restore connections
         for connection in self.connections:
             self.scene.addItem(connection)
-            connection.restore_labels()
             connection.update_path()
 
         self.scene.removeItem(self.new_assets_container)
@@ -35,7 +35,6 @@ class CreateAssociationConnectionCommand(QUndoCommand):
 
     def undo(self):
         """Undo create association connection"""
-        self.connection.remove_labels()
         self.scene.removeItem(self.connection)
         self.start_item.asset.remove_associated_assets(
             self.fieldname, {self.end_item.asset}
@@ -36,7 +36,6 @@ class CreateEntrypointConnectionCommand(QUndoCommand):
     def undo(self):
         """Undo entrypoint creation"""
         if self.connection:
-            self.connection.remove_labels()
             self.scene.removeItem(self.connection)
 
         self.attacker_item.entry_points.remove(
@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING
 
 from PySide6.QtGui import QUndoCommand
 
+from ..object_explorer import AssetItem
+
 if TYPE_CHECKING:
     from ..model_scene import ModelScene
     from ..connection_item import IConnectionItem
@@ -32,28 +34,25 @@ class CutCommand(QUndoCommand):
 
         # Remove connections before removing the items
         for connection in self.connections:
-            connection.remove_labels()
             self.scene.removeItem(connection)
 
         for item in self.items:
             self.scene.removeItem(item)
-
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
+            if isinstance(item, AssetItem):
+                # Cut assets stay in the model, only the explorer drops them
+                self.scene.asset_removed.emit(item.asset)
 
     def undo(self):
         """Undo cut command"""
         # Add items back to the scene
         for item in self.items:
             self.scene.addItem(item)
+            if isinstance(item, AssetItem):
+                self.scene.asset_added.emit(item.asset)
 
         # Restore connections
         for connection in self.connections:
             self.scene.addItem(connection)
-            connection.restore_labels()
             connection.update_path()
 
         self.clipboard.clear()
-
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
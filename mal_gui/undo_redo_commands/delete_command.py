@@ -30,7 +30,6 @@ class DeleteCommand(QUndoCommand):
         print("REDO delete")
         # Store the connections before removing the items
         for connection in self.connections:
-            connection.remove_labels()
             self.scene.removeItem(connection)
 
             if isinstance(connection, EntrypointConnectionItem):
@@ -62,9 +61,6 @@ class DeleteCommand(QUndoCommand):
             if isinstance(item, AttackerItem):
                 self.scene.remove_attacker(item)
 
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
-
     def undo(self):
         """Undo delete"""
         print("UNDO delete")
@@ -108,6 +104,3 @@ class DeleteCommand(QUndoCommand):
                 connection.start_item.asset.add_associated_assets(
                     connection.right_fieldname, {connection.end_item.asset}
                 )
-
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
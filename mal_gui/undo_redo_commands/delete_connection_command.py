@@ -21,7 +21,6 @@ class DeleteConnectionCommand(QUndoCommand):
     def redo(self):
         """Perform delete connection"""
         self.connection.delete()
-        self.connection.remove_labels()
 
         if isinstance(self.connection, AssociationConnectionItem):
             self.scene.remove_association(self.connection)
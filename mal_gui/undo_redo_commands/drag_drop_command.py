@@ -43,9 +43,6 @@ class DragDropAssetCommand(QUndoCommand):
                 self.asset_type, self.position, self.name
             )
 
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
-
     def undo(self):
         """Undo drag and drop"""
 
@@ -55,9 +52,6 @@ class DragDropAssetCommand(QUndoCommand):
             print("Removing asset item")
             self.scene.remove_asset(self.item)
 
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
-
 
 class DragDropAttackerCommand(QUndoCommand):
     def __init__(self, scene: ModelScene, position: QPointF, parent=None):
@@ -82,14 +76,8 @@ class DragDropAttackerCommand(QUndoCommand):
             # Create attacker from scratch
             self.item = self.scene.create_attacker(self.position, "Attacker")
 
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
-
     def undo(self):
         """Undo drag and drop"""
 
         if self.item is not None:
             self.scene.remove_attacker(self.item)
-
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from PySide6.QtGui import QUndoCommand
+
+if TYPE_CHECKING:
+    from PySide6.QtCore import QPointF
+    from ..model_scene import ModelScene
+
+
+class LayoutCommand(QUndoCommand):
+    def __init__(
+        self,
+        scene: ModelScene,
+        start_positions: dict[int, QPointF],
+        end_positions: dict[int, QPointF],
+        parent=None,
+    ):
+        """
+        Positions are stored per asset id, in a virtualized
+        scene the items of the assets can change
+        """
+        super().__init__(parent)
+        self.scene = scene
+        self.start_positions = start_positions
+        self.end_positions = end_positions
+
+    def redo(self):
+        """Perform layout"""
+        print("Layout Redo")
+        self.scene.set_asset_positions(self.end_positions)
+
+    def undo(self):
+        """Undo layout"""
+        print("Layout Undo")
+        self.scene.set_asset_positions(self.start_positions)
@@ -120,9 +120,7 @@ class PasteCommand(QUndoCommand):
                         new_asset_item.asset, label
                     )
 
-        # Update the Object Explorer when number of items change
         self.has_performed_undo = False
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
 
     def undo(self):
         """Undo paste command"""
@@ -132,11 +130,9 @@ class PasteCommand(QUndoCommand):
             print("Undo - Pasted Asset found")
 
             for conn in self.pasted_connections:
-                conn.remove_labels()
                 self.scene.removeItem(conn)
 
             for conn in self.pasted_entrypoints:
-                conn.remove_labels()
                 self.scene.removeItem(conn)
 
             for item in self.original_id_to_item.values():
@@ -148,6 +144,3 @@ class PasteCommand(QUndoCommand):
         self.has_performed_undo = True
         self.pasted_connections = []
         self.pasted_entrypoints = []
-
-        # Update the Object Explorer when number of items change
-        self.scene.main_window.update_childs_in_object_explorer_signal.emit()
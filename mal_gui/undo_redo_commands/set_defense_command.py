@@ -0,0 +1,50 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+from PySide6.QtGui import QUndoCommand
+
+if TYPE_CHECKING:
+    from ..model_scene import ModelScene
+
+
+class SetDefenseCommand(QUndoCommand):
+    def __init__(
+        self,
+        scene: ModelScene,
+        new_values: dict[int, dict[str, Optional[float]]],
+        parent=None,
+    ):
+        """
+        Set defenses of one or many assets, `new_values` holds the new
+        values per asset id, None for defenses that are unset. Assets are
+        stored by id, undoing a deletion recreates them as new objects.
+        """
+        super().__init__(parent)
+        self.scene = scene
+        self.new_values = new_values
+        # Previous values, None for defenses that were not set
+        self.old_values = {
+            asset_id: {
+                defense_name: scene.model.assets[asset_id].defenses.get(defense_name)
+                for defense_name in defenses
+            }
+            for asset_id, defenses in new_values.items()
+        }
+
+    def redo(self):
+        """Perform set defense"""
+        print("Set Defense Redo")
+        self.set_defenses(self.new_values)
+
+    def undo(self):
+        """Undo set defense"""
+        print("Set Defense Undo")
+        self.set_defenses(self.old_values)
+
+    def set_defenses(self, values: dict[int, dict[str, Optional[float]]]):
+        for asset_id, defense_values in values.items():
+            defenses = self.scene.model.assets[asset_id].defenses
+            for defense_name, value in defense_values.items():
+                if value is None:
+                    defenses.pop(defense_name, None)
+                else:
+                    defenses[defense_name] = value
@@ -0,0 +1,404 @@
+"""
+Binary workspace snapshots. A `.malgui` file next to a model holds the
+model and what the scene adds to it (positions, attackers, containers)
+as packed arrays, tagged with content hashes of the model file and the
+language. Reopening a model with a matching snapshot skips parsing it.
+
+File layout: magic, header length (8 bytes little endian), json header,
+then the arrays the header describes, each aligned to ARRAY_ALIGNMENT.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from functools import partial
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+from PySide6.QtCore import QPointF
+
+from maltoolbox.language import LanguageGraph
+from maltoolbox.model import Model
+
+from .assets_container.assets_container import AssetsContainer
+from .file_utils import image_path
+from .object_explorer.attacker_item import ALLOWED_POLICIES
+
+if TYPE_CHECKING:
+    from .model_scene import ModelScene
+
+SNAPSHOT_SUFFIX = ".malgui"
+SNAPSHOT_MAGIC = b"MALGUI\x00\x01"
+SNAPSHOT_VERSION = 1
+ARRAY_ALIGNMENT = 64
+
+_HEADER_LENGTH = struct.Struct("<Q")
+
+
+def snapshot_path(model_file_path: str) -> str:
+    """Path of the snapshot belonging to a model file"""
+    return model_file_path + SNAPSHOT_SUFFIX
+
+
+def file_content_hash(file_path: str) -> str:
+    """Hash of the content of a file"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pack_strings(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Strings as one utf-8 byte array and the offsets where each starts"""
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    data = data.tobytes()
+    offsets = offsets.tolist()
+    return [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+
+class WorkspaceSnapshot:
+    """Contents of a snapshot"""
+
+    def __init__(self, header: dict[str, Any], arrays: dict[str, np.ndarray]):
+        self.header = header
+        self.arrays = arrays
+
+    def matches(self, model_hash: str, lang_hash: Optional[str]) -> bool:
+        """True if taken from the given model file and language"""
+        return (
+            self.header.get("version") == SNAPSHOT_VERSION
+            and self.header.get("model_hash") == model_hash
+            and self.header.get("lang_hash") == lang_hash
+        )
+
+    @classmethod
+    def from_scene(
+        cls, scene: ModelScene, model_hash: str, lang_hash: str
+    ) -> WorkspaceSnapshot:
+        """Snapshot of the model shown in `scene`"""
+        model = scene.model
+        assets = list(model.assets.values())
+        row_of_asset = {asset.id: row for row, asset in enumerate(assets)}
+
+        type_names = sorted({asset.type for asset in assets})
+        code_of_type = {type_name: i for i, type_name in enumerate(type_names)}
+        names, name_offsets = _pack_strings([asset.name for asset in assets])
+
+        positions = np.zeros((len(assets), 2), dtype=np.float64)
+        extras = {}
+        for row, asset in enumerate(assets):
+            position = scene.asset_position(asset.id)
+            positions[row] = (position.x(), position.y())
+            asset_extras = {
+                key: value for key, value in asset.extras.items() if key != "position"
+            }
+            if asset_extras:
+                extras[row] = asset_extras
+
+        # Each association once, as seen from its first end
+        fieldnames: dict[str, int] = {}
+        edges = []
+        seen_associations = set()
+        for row, asset in enumerate(assets):
+            for fieldname, associated_assets in asset.associated_assets.items():
+                for associated_asset in associated_assets:
+                    association_key = scene.association_key(
+                        asset, fieldname, associated_asset
+                    )
+                    if association_key in seen_associations:
+                        continue
+                    seen_associations.add(association_key)
+                    field_code = fieldnames.setdefault(fieldname, len(fieldnames))
+                    edges.append((row, field_code, row_of_asset[associated_asset.id]))
+
+        defense_names: dict[str, int] = {}
+        defenses = []
+        for row, asset in enumerate(assets):
+            for defense, value in asset.defenses.items():
+                defense_code = defense_names.setdefault(defense, len(defense_names))
+                defenses.append((row, defense_code, value))
+
+        attackers = [
+            {
+                "name": attacker_item.name,
+                "x": attacker_item.pos().x(),
+                "y": attacker_item.pos().y(),
+                "entry_points": list(attacker_item.entry_points),
+                "goals": list(attacker_item.goals),
+                "policy": attacker_item.policy.__name__,
+            }
+            for attacker_item in scene.attacker_items
+        ]
+
+        containers = []
+        container_members = []
+        member_offsets = []
+        container_member_counts = []
+        for item in scene.container_items:
+            containers.append(
+                {"name": item.container_name, "x": item.pos().x(), "y": item.pos().y()}
+            )
+            for item_entry in item.containerized_assets_list:
+                container_members.append(row_of_asset[item_entry["item"].asset.id])
+                member_offsets.append(
+                    (item_entry["offset"].x(), item_entry["offset"].y())
+                )
+            container_member_counts.append(len(item.containerized_assets_list))
+
+        header = {
+            "version": SNAPSHOT_VERSION,
+            "model_hash": model_hash,
+            "lang_hash": lang_hash,
+            "model_name": model.name,
+            "maltoolbox_version": model.maltoolbox_version,
+            "asset_types": type_names,
+            "fieldnames": list(fieldnames),
+            "defense_names": list(defense_names),
+            "extras": {str(row): value for row, value in extras.items()},
+            "attackers": attackers,
+            "containers": containers,
+        }
+        edges = np.array(edges, dtype=np.int64).reshape(-1, 3)
+        defenses = np.array(defenses, dtype=np.float64).reshape(-1, 3)
+        arrays = {
+            "asset_ids": np.fromiter(
+                (asset.id for asset in assets), dtype=np.int64, count=len(assets)
+            ),
+            "asset_types": np.fromiter(
+                (code_of_type[asset.type] for asset in assets),
+                dtype=np.int32,
+                count=len(assets),
+            ),
+            "names": names,
+            "name_offsets": name_offsets,
+            "positions": positions,
+            "edges": edges,
+            "defense_rows": defenses[:, :2].astype(np.int64),
+            "defense_values": defenses[:, 2].copy(),
+            "container_members": np.array(container_members, dtype=np.int64),
+            "container_member_counts": np.array(
+                container_member_counts, dtype=np.int64
+            ),
+            "member_offsets": np.array(member_offsets, dtype=np.float64).reshape(-1, 2),
+        }
+        return cls(header, arrays)
+
+    def write(self, file_path: str):
+        """Write to `file_path`, replacing it at once when done"""
+        header = dict(self.header, arrays={})
+        offset = 0
+        for name, array in self.arrays.items():
+            header["arrays"][name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            offset += -(-array.nbytes // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+        header_data = json.dumps(header).encode()
+        data_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size + len(header_data)
+        padding = -data_start % ARRAY_ALIGNMENT
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=directory, suffix=SNAPSHOT_SUFFIX, delete=False
+        ) as tmp:
+            tmp.write(SNAPSHOT_MAGIC)
+            tmp.write(_HEADER_LENGTH.pack(len(header_data) + padding))
+            tmp.write(header_data + b" " * padding)
+            for name, array in self.arrays.items():
+                data = np.ascontiguousarray(array).tobytes()
+                tmp.write(data + b"\0" * (-len(data) % ARRAY_ALIGNMENT))
+        os.replace(tmp.name, file_path)
+
+    @classmethod
+    def read(cls, file_path: str) -> WorkspaceSnapshot:
+        """
+        Read a snapshot file. The arrays are copied out of a mapping
+        of the file, which is closed before returning.
+        """
+        with (
+            open(file_path, "rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            if mapped[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"{file_path} is not a workspace snapshot")
+            header_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+            (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(SNAPSHOT_MAGIC))
+            header = json.loads(mapped[header_start : header_start + header_length])
+            data_start = header_start + header_length
+
+            arrays = {}
+            for name, layout in header.pop("arrays").items():
+                dtype = np.dtype(layout["dtype"])
+                count = int(np.prod(layout["shape"]))
+                # A copy, views would keep the mapping from being closed
+                arrays[name] = (
+                    np.frombuffer(mapped, dtype, count, data_start + layout["offset"])
+                    .reshape(layout["shape"])
+                    .copy()
+                )
+        return cls(header, arrays)
+
+    def create_model(self, lang_graph: LanguageGraph) -> Model:
+        """Rebuild the model, positions are stored in the asset extras"""
+        header, arrays = self.header, self.arrays
+        model = Model(
+            header["model_name"],
+            lang_graph,
+            mt_version=header["maltoolbox_version"],
+        )
+
+        defenses: dict[int, dict[str, float]] = {}
+        defense_names = header["defense_names"]
+        for (row, defense_code), value in zip(
+            arrays["defense_rows"].tolist(), arrays["defense_values"].tolist()
+        ):
+            defenses.setdefault(row, {})[defense_names[defense_code]] = value
+
+        asset_types = header["asset_types"]
+        extras = header["extras"]
+        names = _unpack_strings(arrays["names"], arrays["name_offsets"])
+        assets = []
+        for row, (asset_id, type_code, name, (x, y)) in enumerate(
+            zip(
+                arrays["asset_ids"].tolist(),
+                arrays["asset_types"].tolist(),
+                names,
+                arrays["positions"].tolist(),
+            )
+        ):
+            asset_extras = dict(extras.get(str(row), {}))
+            asset_extras["position"] = {"x": x, "y": y}
+            assets.append(
+                model.add_asset(
+                    asset_type=asset_types[type_code],
+                    name=name,
+                    asset_id=asset_id,
+                    defenses=defenses.get(row),
+                    extras=asset_extras,
+                )
+            )
+
+        # One call per asset and fieldname, each adds both ends
+        associated_rows: dict[tuple[int, int], list[int]] = {}
+        for row, field_code, other_row in arrays["edges"].tolist():
+            associated_rows.setdefault((row, field_code), []).append(other_row)
+        fieldnames = header["fieldnames"]
+        for (row, field_code), other_rows in associated_rows.items():
+            assets[row].add_associated_assets(
+                fieldnames[field_code], {assets[other_row] for other_row in other_rows}
+            )
+
+        return model
+
+    def restore_scene_items(self, scene: ModelScene):
+        """Add the attackers and containers of the snapshot to `scene`"""
+        policies = {policy.__name__: policy for policy in ALLOWED_POLICIES}
+        for attacker in self.header["attackers"]:
+            attacker_item = scene.create_attacker(
+                QPointF(attacker["x"], attacker["y"]),
+                attacker["name"],
+                attacker["entry_points"],
+            )
+            attacker_item.goals = list(attacker["goals"])
+            attacker_item.policy = policies.get(
+                attacker["policy"], attacker_item.policy
+            )
+            for full_names, add_connection in (
+                (attacker_item.entry_points, scene.add_entrypoint_connection),
+                (attacker_item.goals, scene.add_goal_connection),
+            ):
+                for full_name in full_names:
+                    asset_name, attack_step = full_name.rsplit(":", 1)
+                    asset_item = scene.asset_item_by_name(asset_name)
+                    if asset_item is not None:
+                        add_connection(attack_step, attacker_item, asset_item)
+
+        asset_ids = self.arrays["asset_ids"].tolist()
+        members = self.arrays["container_members"].tolist()
+        offsets = self.arrays["member_offsets"].tolist()
+        first_member = 0
+        for container, member_count in zip(
+            self.header["containers"],
+            self.arrays["container_member_counts"].tolist(),
+        ):
+            position = QPointF(container["x"], container["y"])
+            assets_container = AssetsContainer(
+                "AssetContainer",
+                container["name"],
+                image_path("assetContainer.png"),
+                image_path("assetContainerPlusSymbol.png"),
+                image_path("assetContainerMinusSymbol.png"),
+            )
+            scene.addItem(assets_container)
+            assets_container.setPos(position)
+
+            for row, (x, y) in zip(
+                members[first_member : first_member + member_count],
+                offsets[first_member : first_member + member_count],
+            ):
+                item = scene.asset_item(scene.model.assets[asset_ids[row]])
+                item.setPos(position)
+                assets_container.containerized_assets_list.append(
+                    {"item": item, "offset": QPointF(x, y)}
+                )
+            first_member += member_count
+
+            # Contained items follow the container, as after containerizing
+            assets_container.item_moved = partial(
+                _move_contained_items, assets_container
+            )
+
+
+def _move_contained_items(assets_container: AssetsContainer):
+    for item_entry in assets_container.containerized_assets_list:
+        item_entry["item"].setPos(assets_container.pos())
+
+
+def read_workspace_snapshot(
+    model_file_path: str, lang_hash: Optional[str]
+) -> Optional[WorkspaceSnapshot]:
+    """
+    The snapshot of a model file if there is one taken from the
+    file's current content with the same language, otherwise None
+    """
+    file_path = snapshot_path(model_file_path)
+    if not os.path.exists(file_path):
+        return None
+    try:
+        snapshot = WorkspaceSnapshot.read(file_path)
+    except Exception as e:
+        print(f"Ignoring unreadable workspace snapshot {file_path}: {e}")
+        return None
+    if not snapshot.matches(file_content_hash(model_file_path), lang_hash):
+        print(f"Workspace snapshot {file_path} is outdated")
+        return None
+    return snapshot
+
+
+def write_workspace_snapshot(
+    scene: ModelScene, model_file_path: str, lang_hash: Optional[str]
+):
+    """Take a snapshot of `scene` showing the model saved in `model_file_path`"""
+    if lang_hash is None:
+        return
+    try:
+        WorkspaceSnapshot.from_scene(
+            scene, file_content_hash(model_file_path), lang_hash
+        ).write(snapshot_path(model_file_path))
+    except Exception as e:
+        # Only makes reopening faster, the model file is what counts
+        print(f"Could not write workspace snapshot for {model_file_path}: {e}")
@@ -1,6 +1,8 @@
 import pytest
 from PySide6.QtWidgets import QApplication
 
+from mal_gui.main_window import MainWindow
+
 
 @pytest.fixture
 def lang_file_path():
@@ -17,3 +19,11 @@ def app():
     if app is None:
         app = QApplication([])
     return app
+
+
+@pytest.fixture
+def main_window(app, lang_file_path):
+    """Create a MainWindow instance."""
+    window = MainWindow(app, lang_file_path)
+    yield window
+    window.close()
@@ -0,0 +1,50 @@
+from maltoolbox.language import LanguageGraph
+
+from mal_gui.app import FileSelectionDialog, LanguageLoader
+
+
+def test_language_loader_emits_graph(app, qtbot, lang_file_path):
+    loader = LanguageLoader(lang_file_path)
+    with qtbot.waitSignal(loader.loaded, timeout=60000) as blocker:
+        loader.start()
+    loader.wait()
+    assert isinstance(blocker.args[0], LanguageGraph)
+
+
+def test_language_loader_reports_failure(app, qtbot, tmp_path):
+    loader = LanguageLoader(str(tmp_path / "missing.mar"))
+    with qtbot.waitSignal(loader.failed, timeout=60000):
+        loader.start()
+    loader.wait()
+
+
+def test_dialog_cancel_keeps_dialog_open(app, qtbot, lang_file_path):
+    dialog = FileSelectionDialog()
+    qtbot.addWidget(dialog)
+    dialog.selected_lang_file = lang_file_path
+
+    dialog.start_loading_language()
+    assert dialog.progress_bar.isVisibleTo(dialog)
+    assert not dialog.load_button.isEnabled()
+
+    dialog.quit_or_cancel_loading()
+    assert dialog.language_loader is None
+    assert dialog.load_button.isEnabled()
+    assert dialog.get_lang_graph() is None
+
+    dialog.done(FileSelectionDialog.Rejected)
+    assert all(loader.isFinished() for loader in dialog.cancelled_loaders)
+
+
+def test_dialog_waits_for_loader_before_dropping_it(app, qtbot, lang_file_path):
+    dialog = FileSelectionDialog()
+    qtbot.addWidget(dialog)
+    dialog.selected_lang_file = lang_file_path
+
+    dialog.start_loading_language()
+    loader = dialog.language_loader
+    with qtbot.waitSignal(dialog.accepted, timeout=60000):
+        pass
+    assert dialog.language_loader is None
+    assert loader.isFinished()
+    assert isinstance(dialog.get_lang_graph(), LanguageGraph)
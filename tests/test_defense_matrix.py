@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from PySide6.QtCore import QPointF
+
+from mal_gui.defense_matrix import (
+    ASSET_COLUMN,
+    defense_matrix_changes,
+    read_defense_matrix,
+    write_defense_matrix,
+)
+
+
+def test_defense_matrix_round_trip(main_window, tmp_path):
+    scene = main_window.scene
+    apps = [
+        scene.create_asset("Application", QPointF(100 * i, 0), name=f"App{i}").asset
+        for i in range(3)
+    ]
+    apps[0].defenses["notPresent"] = 1.0
+    matrix_path = str(tmp_path / "defenses.csv")
+    write_defense_matrix(matrix_path, scene.model)
+
+    asset_names, defense_names, values = read_defense_matrix(matrix_path)
+    assert asset_names == ["App0", "App1", "App2"]
+    column = defense_names.index("notPresent")
+    assert values[0, column] == 1.0
+    assert np.isnan(values[1:]).all()
+
+    # Set a defense of all assets, one undo command restores them
+    with open(matrix_path, "w") as matrix_file:
+        matrix_file.write(f"{ASSET_COLUMN},notPresent\n")
+        matrix_file.writelines(f"App{i},0.25\n" for i in range(3))
+    undo_index = scene.undo_stack.index()
+    assert main_window.import_defense_matrix(matrix_path)
+    assert scene.undo_stack.index() == undo_index + 1
+    assert [app.defenses["notPresent"] for app in apps] == [0.25] * 3
+
+    scene.undo_stack.undo()
+    assert apps[0].defenses == {"notPresent": 1.0}
+    assert apps[1].defenses == {}
+
+
+@pytest.mark.parametrize("value", ["1.5", "-0.1", "nan", "high"])
+def test_defense_matrix_rejects_invalid_values(tmp_path, value):
+    matrix_path = tmp_path / "defenses.csv"
+    matrix_path.write_text(f"{ASSET_COLUMN},notPresent\nApp0,0.5\nApp1,{value}\n")
+    with pytest.raises(ValueError, match="App1.notPresent"):
+        read_defense_matrix(str(matrix_path))
+
+
+def test_defense_matrix_rejects_duplicate_assets(main_window, tmp_path):
+    scene = main_window.scene
+    scene.create_asset("Application", QPointF(0, 0), name="App0")
+    matrix_path = tmp_path / "defenses.csv"
+    matrix_path.write_text(f"{ASSET_COLUMN},notPresent\nApp0,0.5\nApp0,1.0\n")
+    with pytest.raises(ValueError, match="App0"):
+        defense_matrix_changes(scene.model, *read_defense_matrix(str(matrix_path)))
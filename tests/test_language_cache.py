@@ -0,0 +1,96 @@
+import os
+import shutil
+
+from maltoolbox.language import LanguageGraph
+
+from mal_gui.language_cache import (
+    LanguageRegistry,
+    CACHE_FILE_SUFFIX,
+    evict_old_languages,
+    language_cache_key,
+    load_language_graph,
+)
+
+
+def test_cache_miss_then_hit(tmp_path, lang_file_path, monkeypatch):
+    lang_graph = load_language_graph(lang_file_path, cache_dir=tmp_path)
+    assert isinstance(lang_graph, LanguageGraph)
+    assert len(list(tmp_path.glob("*" + CACHE_FILE_SUFFIX))) == 1
+
+    # A hit must not compile the language again
+    def fail_load(_):
+        raise AssertionError("language was recompiled")
+
+    monkeypatch.setattr(LanguageGraph, "load_from_file", fail_load)
+    cached_graph = load_language_graph(lang_file_path, cache_dir=tmp_path)
+    assert set(cached_graph.assets) == set(lang_graph.assets)
+
+
+def test_cache_key_follows_content(tmp_path, lang_file_path):
+    copied_lang_file = tmp_path / "copy.mar"
+    shutil.copy(lang_file_path, copied_lang_file)
+    assert language_cache_key(lang_file_path) == language_cache_key(
+        str(copied_lang_file)
+    )
+
+    with open(copied_lang_file, "ab") as lang_file:
+        lang_file.write(b"\0")
+    assert language_cache_key(lang_file_path) != language_cache_key(
+        str(copied_lang_file)
+    )
+
+
+def test_mal_cache_key_follows_includes(tmp_path):
+    (tmp_path / "lib").mkdir()
+    main_spec = tmp_path / "main.mal"
+    main_spec.write_text('#id: "test"\ninclude "lib/base.mal"\n')
+    (tmp_path / "lib" / "base.mal").write_text('include "extra.mal"\n')
+    (tmp_path / "lib" / "extra.mal").write_text("category A {}\n")
+    (tmp_path / "unrelated.mal").write_text("category B {}\n")
+
+    key = language_cache_key(str(main_spec))
+    (tmp_path / "unrelated.mal").write_text("category C {}\n")
+    assert language_cache_key(str(main_spec)) == key
+
+    # Included transitively, relative to the including file
+    language_registry = LanguageRegistry()
+    registry_key = language_registry.language_key(str(main_spec))
+    assert registry_key == key
+    (tmp_path / "lib" / "extra.mal").write_text("category D {}\n")
+    os.utime(tmp_path / "lib" / "extra.mal", ns=(1, 1))
+    assert language_cache_key(str(main_spec)) != key
+    assert language_registry.language_key(str(main_spec)) != registry_key
+
+
+def test_mal_cache_key_frames_each_file(tmp_path):
+    main_spec = tmp_path / "main.mal"
+    main_spec.write_text('include "a.mal"\ninclude "b.mal"\n')
+    (tmp_path / "a.mal").write_text("category AB {}")
+    (tmp_path / "b.mal").write_text("")
+    key = language_cache_key(str(main_spec))
+
+    # Same bytes in total, split differently between the files
+    (tmp_path / "a.mal").write_text("category A")
+    (tmp_path / "b.mal").write_text("B {}")
+    assert language_cache_key(str(main_spec)) != key
+
+
+def test_corrupt_cache_entry_is_rebuilt(tmp_path, lang_file_path):
+    cache_file = tmp_path / (language_cache_key(lang_file_path) + CACHE_FILE_SUFFIX)
+    cache_file.write_bytes(b"not a pickle")
+
+    lang_graph = load_language_graph(lang_file_path, cache_dir=tmp_path)
+    assert isinstance(lang_graph, LanguageGraph)
+    assert cache_file.read_bytes() != b"not a pickle"
+
+
+def test_eviction_keeps_most_recent(tmp_path):
+    for i in range(4):
+        cache_file = tmp_path / (f"lang{i}" + CACHE_FILE_SUFFIX)
+        cache_file.write_bytes(b"")
+        os.utime(cache_file, (i, i))
+
+    evict_old_languages(tmp_path, max_entries=2)
+
+    remaining = sorted(path.name for path in tmp_path.iterdir())
+    assert remaining == ["lang2" + CACHE_FILE_SUFFIX, "lang3" + CACHE_FILE_SUFFIX]
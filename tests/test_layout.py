@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from mal_gui.layout import (
+    LAYER_SPACING,
+    force_directed_layout,
+    grid_layout,
+    layered_layout,
+)
+
+
+def test_grid_layout_is_square():
+    positions = grid_layout(9)
+    assert positions.shape == (9, 2)
+    assert len(np.unique(positions[:, 0])) == 3
+    assert len(np.unique(positions[:, 1])) == 3
+
+
+def test_layered_layout_puts_neighbours_in_next_layer():
+    # 0 is the most connected node, so it becomes the root
+    positions = layered_layout(5, [(0, 1), (0, 2), (1, 3)])
+    assert positions[0, 1] == 0
+    assert positions[1, 1] == positions[2, 1] == LAYER_SPACING
+    assert positions[3, 1] == 2 * LAYER_SPACING
+    # The unconnected node goes below the connected ones
+    assert positions[4, 1] > positions[3, 1]
+
+
+def test_force_directed_layout_pulls_connected_nodes_together():
+    edges = [(i, i + 1) for i in range(19)]
+    positions = force_directed_layout(40, edges)
+    assert np.isfinite(positions).all()
+
+    def mean_distance(pairs):
+        pairs = np.array(pairs)
+        return np.linalg.norm(
+            positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=1
+        ).mean()
+
+    assert mean_distance(edges) < mean_distance([(i, i + 20) for i in range(20)])
+
+
+def test_layout_rejects_unknown_nodes():
+    with pytest.raises(ValueError):
+        layered_layout(2, [(0, 2)])
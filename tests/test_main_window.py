@@ -1,23 +1,14 @@
-import pytest
-
-from PySide6.QtWidgets import QMainWindow, QToolBar
+from PySide6.QtWidgets import QFileDialog, QMainWindow, QMessageBox, QToolBar
 from PySide6.QtCore import QPointF
 
 from maltoolbox.language import LanguageGraph
 from maltoolbox.model import Model
 
+from mal_gui.docked_windows.object_explorer_model import VISIBLE_ROLE
 from mal_gui.main_window import MainWindow
 from mal_gui.model_scene import ModelScene
 
 
-@pytest.fixture
-def main_window(app, lang_file_path):
-    """Create a MainWindow instance."""
-    window = MainWindow(app, lang_file_path)
-    yield window
-    window.close()
-
-
 # -------------------------------------------------------------------
 # Initialization
 # -------------------------------------------------------------------
@@ -123,13 +114,155 @@ def test_load_scene_recreates_components(app, lang_file_path):
 
 
 # -------------------------------------------------------------------
-# Object explorer update signal
+# Object explorer updates
 # -------------------------------------------------------------------
 
 
-def test_update_explorer_signal(main_window):
-    # Should not raise
-    main_window.update_childs_in_object_explorer_signal.emit()
+def test_object_explorer_follows_scene_assets(main_window):
+    scene = main_window.scene
+    explorer_model = main_window.object_explorer_tree.model()
+    type_index = explorer_model.index(
+        explorer_model.asset_types.index("Application"), 0
+    )
+    reset_count = []
+    explorer_model.modelReset.connect(lambda: reset_count.append(1))
+
+    asset_item = scene.create_asset("Application", QPointF(0, 0), name="App1")
+    assert explorer_model.rowCount(type_index) == 1
+    assert explorer_model.index(0, 0, type_index).data() == "App1"
+
+    scene.rename_asset(asset_item.asset, "App2")
+    assert explorer_model.index(0, 0, type_index).data() == "App2"
+
+    scene.remove_asset(asset_item)
+    assert explorer_model.rowCount(type_index) == 0
+
+    # Rows are ordered by asset id, also when undo recreates an asset
+    asset_items = [
+        scene.create_asset("Application", QPointF(100 * i, 0), name=f"App{i}")
+        for i in range(3)
+    ]
+    scene.delete_assets([asset_items[1]])
+    assert explorer_model.asset_index(asset_items[2].asset).row() == 1
+    scene.undo_stack.undo()
+    assert [explorer_model.index(row, 0, type_index).data() for row in range(3)] == [
+        "App0",
+        "App1",
+        "App2",
+    ]
+
+    # Only the affected rows were updated
+    assert not reset_count
+
+
+def test_object_explorer_visibility_button(main_window):
+    scene = main_window.scene
+    explorer_tree = main_window.object_explorer_tree
+    explorer_model = explorer_tree.model()
+    asset_item = scene.create_asset("Application", QPointF(0, 0), name="App1")
+
+    index = explorer_model.asset_index(asset_item.asset).siblingAtColumn(1)
+    explorer_tree.button_clicked(index)
+    assert not asset_item.isVisible()
+    assert index.data(VISIBLE_ROLE) is False
+
+    explorer_tree.button_clicked(index)
+    assert asset_item.isVisible()
+
+
+def test_side_panels_follow_selection(main_window, qtbot, monkeypatch):
+    main_window.show()
+    shown_items = []
+    monkeypatch.setattr(main_window, "update_properties_window", shown_items.append)
+    scene = main_window.scene
+    asset_item = scene.create_asset("Application", QPointF(0, 0), name="App1")
+
+    # Selection changes are coalesced
+    asset_item.setSelected(True)
+    asset_item.setSelected(False)
+    asset_item.setSelected(True)
+    qtbot.waitUntil(lambda: len(shown_items) == 1)
+    qtbot.wait(2 * scene.DETAILS_DELAY)
+    assert shown_items == [[asset_item]]
+
+    # Nothing to rebuild if the same item is selected again
+    scene.clearSelection()
+    asset_item.setSelected(True)
+    qtbot.wait(2 * scene.DETAILS_DELAY)
+    assert shown_items == [[asset_item]]
+
+    # Unless the item itself changed
+    scene.rename_asset(asset_item.asset, "App2")
+    qtbot.waitUntil(lambda: len(shown_items) == 2)
+
+
+def test_properties_follow_selected_asset(main_window):
+    scene = main_window.scene
+    properties_model = main_window.properties_docked_window.properties_model
+    app1 = scene.create_asset("Application", QPointF(0, 0), name="App1")
+    app2 = scene.create_asset("Application", QPointF(100, 0), name="App2")
+
+    main_window.update_properties_window([app1])
+    defenses = properties_model.defenses
+    assert properties_model.rowCount() > 0
+    index = properties_model.index(0, 1)
+    assert properties_model.setData(index, "0.5")
+    defense_name = properties_model.index(0, 0).data()
+    assert app1.asset.defenses[defense_name] == 0.5
+
+    # Assets of the same type share their defense table
+    main_window.update_properties_window([app2])
+    assert properties_model.defenses is defenses
+    assert index.data() == ""
+
+    main_window.update_properties_window([])
+    assert properties_model.rowCount() == 0
+
+
+def test_properties_edit_several_assets(main_window):
+    scene = main_window.scene
+    properties_model = main_window.properties_docked_window.properties_model
+    apps = [
+        scene.create_asset("Application", QPointF(100 * i, 0), name=f"App{i}")
+        for i in range(3)
+    ]
+    main_window.update_properties_window(apps[:1])
+    index = properties_model.index(0, 1)
+    defense_name = properties_model.index(0, 0).data()
+    properties_model.setData(index, "0.5")
+
+    main_window.update_properties_window(apps)
+    assert index.data() == properties_model.MIXED_VALUE
+
+    undo_index = scene.undo_stack.index()
+    properties_model.setData(index, "1.0")
+    assert scene.undo_stack.index() == undo_index + 1
+    assert [app.asset.defenses[defense_name] for app in apps] == [1.0] * 3
+    assert index.data() == "1.0"
+
+    scene.undo_stack.undo()
+    assert apps[0].asset.defenses[defense_name] == 0.5
+    assert defense_name not in apps[1].asset.defenses
+
+
+def test_failed_load_keeps_scene(main_window, tmp_path, monkeypatch):
+    scene = main_window.scene
+    asset_item = scene.create_asset("Application", QPointF(0, 0), name="App1")
+    broken_file = tmp_path / "broken.yml"
+    broken_file.write_text("assets: [")
+
+    errors = []
+    monkeypatch.setattr(
+        QFileDialog, "getOpenFileName", lambda *args: (str(broken_file), "")
+    )
+    monkeypatch.setattr(QMessageBox, "question", lambda *args: QMessageBox.Ok)
+    monkeypatch.setattr(main_window, "show_error_popup", errors.append)
+    main_window.load_model_or_scenario()
+
+    assert len(errors) == 1
+    assert main_window.scene is scene
+    assert asset_item.scene() is scene
+    main_window.add_positions_to_model()
 
 
 # -------------------------------------------------------------------
@@ -172,3 +305,19 @@ def test_quit_app_calls_app_quit(monkeypatch, main_window):
     main_window.quitApp()
 
     assert called["quit"] is True
+
+
+def test_load_scene_same_language_reuses_factory(app, lang_file_path):
+    window = MainWindow(app, lang_file_path)
+
+    asset_factory = window.asset_factory
+    object_explorer_tree = window.object_explorer_tree
+    type_row_count = object_explorer_tree.model().rowCount()
+
+    model = Model("ReloadedModel", window.scene.lang_graph)
+    window.load_scene(lang_file_path, model)
+
+    assert window.asset_factory is asset_factory
+    assert window.object_explorer_tree is object_explorer_tree
+    assert object_explorer_tree.model().rowCount() == type_row_count
+    assert object_explorer_tree.scene is window.scene
@@ -0,0 +1,109 @@
+import os
+import shutil
+
+import yaml
+from maltoolbox.language import LanguageGraph
+from maltoolbox.model import Model
+from malsim.scenario import Scenario
+
+from mal_gui import model_loader
+
+from mal_gui.language_cache import LanguageRegistry
+from mal_gui.model_loader import (
+    is_scenario_dict,
+    model_from_dict,
+    read_dict_file,
+    scenario_from_dict,
+)
+
+
+def _model(lang_file_path):
+    lang_graph = LanguageGraph.load_from_file(lang_file_path)
+    model = Model("TestModel", lang_graph)
+    app = model.add_asset("Application", "App")
+    network = model.add_asset("Network", "Network")
+    app.add_associated_assets("networks", {network})
+    return model
+
+
+def test_model_files(tmp_path, lang_file_path):
+    model = _model(lang_file_path)
+    for file_name in ("model.yml", "model.json"):
+        file_path = str(tmp_path / file_name)
+        model.save_to_file(file_path)
+
+        model_dict = read_dict_file(file_path)
+        assert not is_scenario_dict(model_dict)
+        loaded_model = model_from_dict(model_dict, model.lang_graph)
+        assert {asset.name for asset in loaded_model.assets.values()} == {
+            "App",
+            "Network",
+        }
+
+
+def test_scenario_paths_are_relative_to_file(tmp_path, lang_file_path, monkeypatch):
+    shutil.copy(lang_file_path, tmp_path / "lang.mar")
+    file_path = str(tmp_path / "scenario.yml")
+    with open(file_path, "w", encoding="utf-8") as scenario_file:
+        yaml.safe_dump(
+            {
+                "lang_file": "lang.mar",
+                "model": _model(lang_file_path).to_dict(),
+                "agents": {},
+            },
+            scenario_file,
+        )
+
+    scenario_dict = read_dict_file(file_path)
+    assert is_scenario_dict(scenario_dict)
+
+    # A language that is already loaded is not compiled again
+    lang_graph = LanguageGraph.load_from_file(lang_file_path)
+    language_registry = LanguageRegistry()
+    language_registry.register(str(tmp_path / "lang.mar"), lang_graph)
+
+    def fail_load(_):
+        raise AssertionError("language was recompiled")
+
+    monkeypatch.setattr(LanguageGraph, "load_from_file", fail_load)
+    scenario = scenario_from_dict(scenario_dict, file_path, language_registry)
+    assert scenario.lang_graph is lang_graph
+    assert scenario._lang_file == os.path.join(os.path.realpath(tmp_path), "lang.mar")
+    assert scenario.model.get_asset_by_name("App") is not None
+    # The parsed file is left as it was
+    assert scenario_dict["lang_file"] == "lang.mar"
+
+
+def test_scenario_matches_malsim_scenario(tmp_path, lang_file_path, monkeypatch):
+    shutil.copy(lang_file_path, tmp_path / "lang.mar")
+    file_path = str(tmp_path / "scenario.yml")
+    with open(file_path, "w", encoding="utf-8") as scenario_file:
+        yaml.safe_dump(
+            {
+                "lang_file": "lang.mar",
+                "model": _model(lang_file_path).to_dict(),
+                "agents": {
+                    "Attacker": {
+                        "type": "attacker",
+                        "entry_points": ["App:fullAccess"],
+                        "goals": ["App:read"],
+                    }
+                },
+            },
+            scenario_file,
+        )
+    scenario_dict = read_dict_file(file_path)
+    malsim_scenario = Scenario.load_from_file(file_path)
+
+    # Set up like Scenario.__init__ does, a new attribute there shows up here
+    scenario = scenario_from_dict(scenario_dict, file_path, LanguageRegistry())
+    assert set(vars(scenario)) == set(vars(malsim_scenario))
+    assert scenario._lang_file == malsim_scenario._lang_file
+    assert scenario._model_file == malsim_scenario._model_file
+    assert scenario.sim_settings == malsim_scenario.sim_settings
+    assert repr(scenario.agent_settings) == repr(malsim_scenario.agent_settings)
+
+    # Without the malsim internals the scenario is left to malsim
+    monkeypatch.setattr(model_loader, "SCENARIO_INTERNALS_AVAILABLE", False)
+    scenario = scenario_from_dict(scenario_dict, file_path, LanguageRegistry())
+    assert set(vars(scenario)) == set(vars(malsim_scenario))
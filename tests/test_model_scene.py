@@ -1,22 +1,26 @@
 import pytest
-from PySide6.QtWidgets import QGraphicsScene
-from PySide6.QtCore import QPointF
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsView
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QColor
 
-from maltoolbox.language import LanguageGraph
 from maltoolbox.model import Model
-from mal_gui.main_window import MainWindow
+from mal_gui.layout import LayoutStrategy
 from mal_gui.model_scene import ModelScene
+from mal_gui.connection_item import AssociationConnectionItem
 from mal_gui.object_explorer import AssetItem, AttackerItem
+from mal_gui.object_explorer.icon_cache import ICON_SIZE
+from mal_gui.undo_redo_commands import MoveCommand
 
 
 @pytest.fixture
-def model_scene(app):
-    lang_file_path = "tests/testdata/org.mal-lang.coreLang-1.0.0.mar"
-    lang_graph = LanguageGraph.load_from_file(str(lang_file_path))
-    main_window = MainWindow(app, str(lang_file_path))
-    asset_factory = main_window.asset_factory
+def lang_graph(main_window):
+    return main_window.scene.lang_graph
+
+
+@pytest.fixture
+def model_scene(main_window, lang_graph):
     model = Model("TestModel", lang_graph)
-    return ModelScene(asset_factory, lang_graph, model, main_window)
+    return ModelScene(main_window.asset_factory, lang_graph, model, main_window)
 
 
 def test_scene_initialization(model_scene):
@@ -72,3 +76,444 @@ def test_serialize_deserialize(model_scene):
     deserialized = model_scene.deserialize_graphics_items(serialized)
     assert isinstance(deserialized, list)
     assert deserialized[0]["title"] == asset_item.title
+
+
+def test_asset_icons_are_shared_and_prescaled(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0))
+    item2 = model_scene.create_asset("Application", QPointF(100, 0))
+
+    assert item1.image.cacheKey() == item2.image.cacheKey()
+    icon_size = item1.image.deviceIndependentSize().toSize()
+    assert icon_size.boundedTo(ICON_SIZE) == icon_size
+    assert ICON_SIZE.width() in (icon_size.width(), icon_size.height())
+
+
+def test_asset_styles_are_shared_per_type(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0))
+    item2 = model_scene.create_asset("Application", QPointF(100, 0))
+    item3 = model_scene.create_asset("Network", QPointF(200, 0))
+
+    assert item1.style is item2.style
+    assert item1.style is not item3.style
+
+    # Changing the colour of one item gives it its own style
+    item1.asset_type_background_color = QColor(255, 255, 0)
+    assert item1.style is not item2.style
+    assert item1.style.type_color == QColor(255, 255, 0)
+
+
+def test_animation_clock_blinks_visible_attackers(model_scene):
+    view = QGraphicsView(model_scene)
+    view.resize(400, 400)
+    view.show()
+    view.centerOn(0, 0)
+
+    visible_attacker = model_scene.create_attacker(QPointF(0, 0), "Visible")
+    hidden_attacker = model_scene.create_attacker(QPointF(100000, 0), "Hidden")
+
+    model_scene.status_light_on = True
+    model_scene.advance_animations()
+    assert visible_attacker.status_color == QColor(255, 0, 0)
+    assert hidden_attacker.status_color == QColor(0, 255, 0)
+
+
+def test_moved_connections_are_updated_once_per_frame(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0))
+    item2 = model_scene.create_asset("Application", QPointF(300, 0))
+    connection = model_scene.add_association_connection(item1, item2, "appExecutedApps")
+
+    item1.setPos(QPointF(0, 100))
+    item2.setPos(QPointF(300, 100))
+    assert model_scene.dirty_connections == {connection}
+
+    model_scene.flush_dirty_connections()
+    assert not model_scene.dirty_connections
+    assert connection.line().p1() == item1.sceneBoundingRect().center()
+    assert connection.line().p2() == item2.sceneBoundingRect().center()
+
+    # Clearing the scene drops pending updates of the deleted connections
+    item1.setPos(QPointF(0, 200))
+    assert model_scene.connection_flush_timer.isActive()
+    model_scene.clear()
+    assert not model_scene.dirty_connections
+    assert not model_scene.connection_flush_timer.isActive()
+    model_scene.flush_dirty_connections()
+
+
+def test_connection_is_a_single_scene_item(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0))
+    item2 = model_scene.create_asset("Application", QPointF(300, 0))
+    num_items = len(model_scene.items())
+
+    connection = model_scene.add_association_connection(item1, item2, "appExecutedApps")
+    assert len(model_scene.items()) == num_items + 1
+    assert not connection.childItems()
+
+    # The label in the middle is part of the connection
+    assert connection.boundingRect().contains(connection.label_rects[0])
+
+
+def test_association_field_labels_are_created_when_first_shown(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0))
+    item2 = model_scene.create_asset("Application", QPointF(300, 0))
+    connection = model_scene.add_association_connection(item1, item2, "appExecutedApps")
+    assert len(connection.labels) == 1
+
+    model_scene.set_show_assoc_checkbox_status(True)
+    assert len(connection.labels) == 3
+    assert connection.is_label_visible(1)
+    assert not model_scene.unlabeled_associations
+
+    model_scene.set_show_assoc_checkbox_status(False)
+    assert len(connection.labels) == 3
+    assert not connection.is_label_visible(1)
+
+    model_scene.set_show_icons(False)
+    assert not item1.icons_shown()
+
+
+def test_item_registries_follow_scene(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0))
+    item2 = model_scene.create_asset("Application", QPointF(300, 0))
+    connection = model_scene.add_association_connection(item1, item2, "appExecutedApps")
+    assert model_scene.association_items == {connection}
+
+    model_scene.delete_assets([item1])
+    assert not model_scene.association_items
+    assert list(model_scene.asset_items) == [item2]
+
+    model_scene.undo_stack.undo()
+    # Undo adds a new connection item
+    (connection,) = model_scene.association_items
+    assert connection.scene() is model_scene
+
+    model_scene.containerize_assets([item1, item2])
+    (container,) = model_scene.container_items
+    model_scene.undo_stack.undo()
+    assert not model_scene.container_items
+    assert container.scene() is None
+
+
+def test_clear_drops_deleted_items(main_window):
+    scene = main_window.scene
+    item1 = scene.create_asset("Application", QPointF(0, 0))
+    scene.create_asset("Application", QPointF(300, 0))
+    scene.create_attacker(QPointF(0, 300), "Attacker")
+    scene.delete_assets([item1])
+
+    scene.clear()
+    assert not list(scene.asset_items)
+    assert not scene.attacker_items
+    assert not scene.undo_stack.canUndo()
+    # Saving reads the positions of the assets
+    main_window.add_positions_to_model()
+
+
+def test_draw_model_draws_each_association_once(main_window, lang_graph):
+    model = Model("TestModel", lang_graph)
+    app1 = model.add_asset("Application", "App1")
+    app2 = model.add_asset("Application", "App2")
+    network = model.add_asset("Network", "Network")
+    app1.add_associated_assets("appExecutedApps", {app2})
+    app1.add_associated_assets("networks", {network})
+    app2.add_associated_assets("networks", {network})
+
+    # Each association is stored from both ends
+    num_associations = (
+        sum(
+            len(associated_assets)
+            for asset in model.assets.values()
+            for associated_assets in asset.associated_assets.values()
+        )
+        // 2
+    )
+    assert num_associations == 3
+
+    scene = ModelScene(main_window.asset_factory, lang_graph, model, main_window)
+    connections = [
+        item for item in scene.items() if isinstance(item, AssociationConnectionItem)
+    ]
+    assert len(connections) == num_associations
+
+    # Assets without positions are laid out in layers by their associations
+    # instead of in one column, App1 is first of the most connected assets
+    positions = {
+        asset.name: scene.asset_position(asset.id) for asset in model.assets.values()
+    }
+    assert positions["App2"].y() == positions["Network"].y() > positions["App1"].y()
+    assert positions["App2"].x() != positions["Network"].x()
+
+
+def _model_with_assets(lang_graph, num_assets):
+    model = Model("TestModel", lang_graph)
+    for i in range(num_assets):
+        model.add_asset("Application", f"App{i}")
+    return model
+
+
+def test_progressive_draw(main_window, lang_graph, qtbot):
+    model = _model_with_assets(lang_graph, 10)
+
+    scene = ModelScene(
+        main_window.asset_factory,
+        lang_graph,
+        model,
+        main_window,
+        draw_progressively=True,
+    )
+    assert scene.is_drawing_model()
+    assert not scene._asset_id_to_item
+
+    with qtbot.waitSignal(scene.draw_finished) as blocker:
+        pass
+    assert blocker.args == [True]
+    assert not scene.is_drawing_model()
+    assert len(scene._asset_id_to_item) == 10
+
+
+def test_progressive_draw_cancel(main_window, lang_graph, qtbot):
+    model = _model_with_assets(lang_graph, 10)
+
+    scene = ModelScene(
+        main_window.asset_factory,
+        lang_graph,
+        model,
+        main_window,
+        draw_progressively=True,
+    )
+    with qtbot.waitSignal(scene.draw_finished) as blocker:
+        scene.cancel_drawing_model()
+    assert blocker.args == [False]
+    assert not scene._asset_id_to_item
+
+
+def test_model_can_be_edited_while_drawn(main_window, lang_graph, qtbot):
+    model = _model_with_assets(lang_graph, 10)
+    apps = list(model.assets.values())
+    apps[8].add_associated_assets("appExecutedApps", {apps[9]})
+
+    scene = ModelScene(
+        main_window.asset_factory,
+        lang_graph,
+        model,
+        main_window,
+        draw_progressively=True,
+    )
+    # Draw a few assets, then edit the model before the rest is drawn
+    scene.draw_timer.stop()
+    for _ in range(3):
+        next(scene.draw_steps)
+    new_item = scene.create_asset("Application", QPointF(0, 0), name="New")
+    scene.remove_asset(scene.asset_item(apps[0]))
+    model.remove_asset(apps[9])
+
+    with qtbot.waitSignal(scene.draw_finished) as blocker:
+        scene.draw_timer.start(0)
+    assert blocker.args == [True]
+    assert set(scene._asset_id_to_item) == {
+        *(app.id for app in apps[1:9]),
+        new_item.asset.id,
+    }
+    assert not scene.association_items
+
+    # Errors end the draw instead of escaping the timer
+    def failing_steps():
+        raise RuntimeError("broken draw")
+        yield
+
+    scene.draw_steps = failing_steps()
+    with qtbot.waitSignal(scene.draw_finished) as blocker:
+        scene.draw_timer.start(0)
+    assert blocker.args == [False]
+    assert not scene.is_drawing_model()
+
+
+def test_virtualized_scene_only_creates_visible_items(main_window, lang_graph):
+    # 20 x 20 assets, 1000 units apart
+    model = Model("TestModel", lang_graph)
+    assets = []
+    for i in range(400):
+        asset = model.add_asset("Application", f"App{i}")
+        asset.extras = {"position": {"x": (i % 20) * 1000, "y": (i // 20) * 1000}}
+        assets.append(asset)
+    assets[0].add_associated_assets("appExecutedApps", {assets[1]})
+
+    scene = ModelScene(
+        main_window.asset_factory, lang_graph, model, main_window, virtualized=True
+    )
+    assert not scene._asset_id_to_item
+
+    # Only the corner assets are in view (with margin)
+    scene.update_virtual_items(QRectF(-100, -100, 600, 600))
+    assert set(scene._asset_id_to_item) == {
+        assets[0].id,
+        assets[1].id,
+        assets[20].id,
+        assets[21].id,
+    }
+    connections = [
+        item for item in scene.items() if isinstance(item, AssociationConnectionItem)
+    ]
+    assert len(connections) == 1
+
+    # What is set for an asset is not shown for the next one of its item
+    scene.set_asset_visible(assets[0], False)
+    for asset in assets[:2] + assets[20:22]:
+        item = scene._asset_id_to_item[asset.id]
+        item.setZValue(5)
+        item.asset_type_background_color = QColor(255, 0, 0)
+    scene._asset_id_to_item[assets[1].id].start_name_edit()
+
+    # Panning away recycles the items
+    pooled_items = set(scene._asset_id_to_item.values())
+    scene.update_virtual_items(QRectF(9900, 9900, 200, 200))
+    assert set(scene._asset_id_to_item) == {assets[210].id}
+    recycled_item = scene._asset_id_to_item[assets[210].id]
+    assert recycled_item in pooled_items
+    assert recycled_item.isVisible()
+    assert recycled_item.zValue() == 1
+    assert recycled_item.asset_type_background_color == QColor(0, 200, 0)
+    assert recycled_item.name_editor is None
+    assert scene.name_editor is None
+    assert assets[1].name == "App1"
+    assert scene.asset_position(assets[0].id) == QPointF(0, 0)
+    assert not [
+        item for item in scene.items() if isinstance(item, AssociationConnectionItem)
+    ]
+
+    # Hidden assets stay hidden when they get an item again
+    scene.update_virtual_items(QRectF(-100, -100, 600, 600))
+    assert not scene._asset_id_to_item[assets[0].id].isVisible()
+    assert scene._asset_id_to_item[assets[1].id].isVisible()
+
+
+def test_virtualized_scene_unpins_items(main_window, lang_graph):
+    model = Model("TestModel", lang_graph)
+    near_asset = model.add_asset("Application", "Near")
+    near_asset.extras = {"position": {"x": 0, "y": 0}}
+    far_asset = model.add_asset("Application", "Far")
+    far_asset.extras = {"position": {"x": 5000, "y": 0}}
+    scene = ModelScene(
+        main_window.asset_factory, lang_graph, model, main_window, virtualized=True
+    )
+    near_view = QRectF(-100, -100, 200, 200)
+    far_view = QRectF(4900, -100, 200, 200)
+
+    # Looking an item up does not keep it
+    far_item = scene.asset_item(far_asset)
+    attacker_item = scene.create_attacker(QPointF(0, 200), "Attacker")
+    scene.add_entrypoint_connection("fullAccess", attacker_item, far_item)
+    scene.update_virtual_items(near_view)
+    assert set(scene._asset_id_to_item) == {near_asset.id}
+
+    # Attackers are connected again when the asset gets an item
+    scene.update_virtual_items(far_view)
+    far_item = scene._asset_id_to_item[far_asset.id]
+    assert [connection.attacker_item for connection in far_item.connections] == [
+        attacker_item
+    ]
+
+    # Selected items are kept until the selection is cleared
+    far_item.setSelected(True)
+    scene.update_virtual_items(near_view)
+    assert far_asset.id in scene._asset_id_to_item
+    scene.clearSelection()
+    scene.update_virtual_items(near_view)
+    assert far_asset.id not in scene._asset_id_to_item
+
+    # Items of undo commands are kept until the command is dropped
+    far_item = scene.asset_item(far_asset)
+    scene.undo_stack.push(
+        MoveCommand(
+            scene, [far_item], {far_item: far_item.pos()}, {far_item: QPointF(5000, 0)}
+        )
+    )
+    scene.update_virtual_items(near_view)
+    assert scene._asset_id_to_item[far_asset.id] is far_item
+    scene.undo_stack.clear()
+    scene.update_virtual_items(near_view)
+    assert far_asset.id not in scene._asset_id_to_item
+
+
+def test_rename_asset_keeps_name_lookups_current(model_scene):
+    asset_item = model_scene.create_asset("Application", QPointF(0, 0), name="App1")
+    attacker_item = model_scene.create_attacker(QPointF(0, 200), "Attacker1")
+    attacker_item.entry_points.append("App1:fullAccess")
+    model_scene.add_entrypoint_connection("fullAccess", attacker_item, asset_item)
+
+    assert model_scene.rename_asset(asset_item.asset, "App2")
+    assert model_scene.asset_item_by_name("App2") is asset_item
+    assert model_scene.asset_item_by_name("App1") is None
+    assert attacker_item.entry_points == ["App2:fullAccess"]
+
+    # Names are unique
+    other_item = model_scene.create_asset("Application", QPointF(0, 0), name="App3")
+    assert not model_scene.rename_asset(other_item.asset, "App2")
+
+    model_scene.remove_asset(asset_item)
+    assert model_scene.asset_item_by_name("App2") is None
+
+
+def test_names_are_edited_with_one_shared_editor(model_scene):
+    item1 = model_scene.create_asset("Application", QPointF(0, 0), name="App1")
+    item2 = model_scene.create_asset("Application", QPointF(300, 0), name="App2")
+    # Names are painted, not child items
+    assert not item1.childItems()
+
+    item1.start_name_edit()
+    editor = item1.name_editor
+    assert model_scene.name_editor is editor
+    editor.setPlainText("App3")
+
+    # Starting another edit finishes the first one
+    item2.start_name_edit()
+    assert item1.name_editor is None
+    assert item1.asset.name == "App3"
+    assert item1.name_text == "App3"
+    assert model_scene.name_editor is item2.name_editor
+
+    # Taken names are not used
+    item2.name_editor.setPlainText("App3")
+    item2.name_editor.finish()
+    assert item2.asset.name == "App2"
+    assert item2.name_text == "App2"
+    assert model_scene.name_editor is None
+
+
+def test_clearing_scene_resets_name_edit(model_scene):
+    item = model_scene.create_asset("Application", QPointF(0, 0), name="App1")
+    item.start_name_edit()
+    editor = item.name_editor
+    editor.setPlainText("App2")
+
+    # Removing the item stops the edit, the name is not changed
+    model_scene.removeItem(item)
+    assert model_scene.name_editor is None
+    assert item.name_editor is None
+    assert item.asset.name == "App1"
+
+    model_scene.addItem(item)
+    item.start_name_edit()
+    model_scene.clear()
+    assert model_scene.name_editor is None
+
+    # Another edit does not touch the deleted editor
+    other_item = model_scene.create_asset("Application", QPointF(0, 0), name="App3")
+    other_item.start_name_edit()
+    assert model_scene.name_editor is other_item.name_editor
+
+
+def test_layout_assets_is_one_undo_command(model_scene):
+    items = [
+        model_scene.create_asset("Application", QPointF(0, 0), name=f"App{i}")
+        for i in range(4)
+    ]
+    asset_ids = [item.asset.id for item in items]
+    model_scene.layout_assets(asset_ids, LayoutStrategy.GRID)
+
+    assert model_scene.undo_stack.count() == 1
+    positions = {(item.pos().x(), item.pos().y()) for item in items}
+    assert len(positions) == 4
+
+    model_scene.undo_stack.undo()
+    assert all(item.pos() == QPointF(0, 0) for item in items)
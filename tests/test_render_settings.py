@@ -0,0 +1,31 @@
+from mal_gui.render_settings import DetailLevel, RenderSettings
+
+
+def test_detail_levels():
+    settings = RenderSettings(outline_below=0.25, title_below=0.5)
+    assert settings.detail_level(0.1) == DetailLevel.OUTLINE
+    assert settings.detail_level(0.3) == DetailLevel.TITLE
+    assert settings.detail_level(1.0) == DetailLevel.FULL
+
+    settings.lod_enabled = False
+    assert settings.detail_level(0.1) == DetailLevel.FULL
+
+
+def test_config_round_trip(tmp_path):
+    config_file_path = str(tmp_path / "config.ini")
+    with open(config_file_path, "w", encoding="utf-8") as conf_file:
+        conf_file.write("[Settings]\nlangFilePath = some.mar\n")
+
+    RenderSettings(lod_enabled=False, outline_below=0.1, title_below=0.2).write_config(
+        config_file_path
+    )
+
+    settings = RenderSettings()
+    settings.read_config(config_file_path)
+    assert not settings.lod_enabled
+    assert settings.outline_below == 0.1
+    assert settings.title_below == 0.2
+
+    # Other settings in the file are kept
+    with open(config_file_path, encoding="utf-8") as conf_file:
+        assert "langfilepath = some.mar" in conf_file.read()
@@ -0,0 +1,81 @@
+from PySide6.QtCore import QPointF
+
+from maltoolbox.language import LanguageGraph
+from maltoolbox.model import Model
+
+from mal_gui.main_window import MainWindow
+from mal_gui.model_scene import ModelScene
+from mal_gui.workspace_snapshot import (
+    WorkspaceSnapshot,
+    read_workspace_snapshot,
+    snapshot_path,
+    write_workspace_snapshot,
+)
+
+
+def _scene(app, lang_file_path, model=None):
+    lang_graph = LanguageGraph.load_from_file(lang_file_path)
+    main_window = MainWindow(app, lang_file_path)
+    model = model or Model("TestModel", lang_graph)
+    return ModelScene(main_window.asset_factory, lang_graph, model, main_window)
+
+
+def test_snapshot_round_trip(app, tmp_path, lang_file_path):
+    scene = _scene(app, lang_file_path)
+    application = scene.create_asset("Application", QPointF(10, 20), "App").asset
+    network = scene.create_asset("Network", QPointF(300, 20), "Net").asset
+    application.add_associated_assets("networks", {network})
+    application.defenses["notPresent"] = 1.0
+    application.extras["note"] = "kept"
+    attacker_item = scene.create_attacker(
+        QPointF(0, -200), "Attacker", ["App:fullAccess"]
+    )
+    attacker_item.goals = ["Net:access"]
+
+    file_path = str(tmp_path / "snapshot.malgui")
+    WorkspaceSnapshot.from_scene(scene, "model-hash", "lang-hash").write(file_path)
+    snapshot = WorkspaceSnapshot.read(file_path)
+    # Nothing refers to the file once it is read
+    assert all(array.base is None for array in snapshot.arrays.values())
+    assert snapshot.matches("model-hash", "lang-hash")
+    assert not snapshot.matches("other-hash", "lang-hash")
+
+    model = snapshot.create_model(scene.lang_graph)
+    restored_application = model.get_asset_by_name("App")
+    assert restored_application.id == application.id
+    assert restored_application.defenses == {"notPresent": 1.0}
+    assert restored_application.extras == {
+        "note": "kept",
+        "position": {"x": 10.0, "y": 20.0},
+    }
+    assert restored_application.associated_assets["networks"] == {
+        model.get_asset_by_name("Net")
+    }
+
+    restored_scene = _scene(app, lang_file_path, model)
+    snapshot.restore_scene_items(restored_scene)
+    (restored_attacker,) = restored_scene.attacker_items
+    assert restored_attacker.pos() == QPointF(0, -200)
+    assert restored_attacker.entry_points == ["App:fullAccess"]
+    assert restored_attacker.goals == ["Net:access"]
+    assert len(restored_attacker.connections) == 2
+
+
+def test_snapshot_follows_model_file(app, tmp_path, lang_file_path):
+    scene = _scene(app, lang_file_path)
+    scene.create_asset("Application", QPointF(0, 0), "App")
+    model_file_path = str(tmp_path / "model.yml")
+    scene.model.save_to_file(model_file_path)
+
+    write_workspace_snapshot(scene, model_file_path, "lang-hash")
+    assert read_workspace_snapshot(model_file_path, "lang-hash") is not None
+    assert read_workspace_snapshot(model_file_path, "other-lang-hash") is None
+
+    # A changed model file makes the snapshot outdated
+    with open(model_file_path, "a", encoding="utf-8") as model_file:
+        model_file.write("\n")
+    assert read_workspace_snapshot(model_file_path, "lang-hash") is None
+
+    with open(snapshot_path(model_file_path), "wb") as snapshot_file:
+        snapshot_file.write(b"garbage")
+    assert read_workspace_snapshot(model_file_path, "lang-hash") is None